@@ -0,0 +1,46 @@
+# benchmarks/bench_frontier.py
+# Run from src: python3 -m benchmarks.bench_frontier [size ...]
+#
+# UCS corner-to-corner with each frontier on the same cost grids:
+# "heapq" (lazy duplicates), "indexed" (decrease-key) and "buckets" (Dial).
+# Changes are relative to heapq.
+
+import sys
+
+from grid import buildCostGrid
+from ucs import UCS, FRONTIERS
+
+SIZES = [100, 300, 500]
+SEEDS = [1, 2, 3]
+MIN_COST, MAX_COST = 1, 9
+
+
+def pct_change(new, old):
+    return 100.0 * (new - old) / old if old else 0.0
+
+
+def main():
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+
+    print(f"{'grid':>9} {'seed':>4} {'frontier':>8} | {'max_frontier':>17} | {'generated_nodes':>19} | {'runtime_ms':>18} | cost")
+
+    for size in sizes:
+        for seed in SEEDS:
+            costs = buildCostGrid(size, size, MIN_COST, MAX_COST, seed)
+            goal = (size - 1, size - 1)
+
+            base = None
+            for frontier in FRONTIERS:
+                _, _, metrics = UCS((0, 0), goal, size, size, costs, frontier=frontier)
+                if base is None:
+                    base = metrics
+
+                same_cost = "same" if metrics["total_cost"] == base["total_cost"] else "DIFFERENT"
+                print(f"{size:>4}x{size:<4} {seed:>4} {frontier:>8} | "
+                      f"{metrics['max_frontier_size']:>8} ({pct_change(metrics['max_frontier_size'], base['max_frontier_size']):>+5.1f}%) | "
+                      f"{metrics['generated_nodes']:>10} ({pct_change(metrics['generated_nodes'], base['generated_nodes']):>+5.1f}%) | "
+                      f"{metrics['runtime_ms']:>9.1f} ({pct_change(metrics['runtime_ms'], base['runtime_ms']):>+5.1f}%) | {same_cost}")
+
+
+if __name__ == "__main__":
+    main()
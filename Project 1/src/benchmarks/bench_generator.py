@@ -0,0 +1,42 @@
+# benchmarks/bench_generator.py
+# Run from src: python3 -m benchmarks.bench_generator [size ...]
+#
+# Time to generate a cost grid with each engine of buildCostGrid. "compat"
+# gives the same grid as "python"; "numpy" draws a different stream.
+# Speedups are relative to python.
+
+import sys
+import time
+
+from grid import buildCostGrid, ENGINES
+
+SIZES = [500, 1000, 2000]
+MIN_COST, MAX_COST = 1, 9
+
+
+def measure(size, engine):
+    t0 = time.perf_counter()
+    grid = buildCostGrid(size, size, MIN_COST, MAX_COST, 1, engine=engine)
+    elapsed_s = time.perf_counter() - t0
+    return grid, elapsed_s
+
+
+def main():
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+
+    # keep the numpy import out of the first timing
+    for engine in ENGINES:
+        buildCostGrid(2, 2, MIN_COST, MAX_COST, 1, engine=engine)
+
+    print(f"{'grid':>11} {'engine':>7} | {'seconds':>9} | {'speedup':>8} | same as python")
+
+    for size in sizes:
+        base, base_s = measure(size, "python")
+        for engine in ENGINES:
+            grid, elapsed_s = (base, base_s) if engine == "python" else measure(size, engine)
+            same = "yes" if grid.costs == base.costs else "no"
+            print(f"{size:>5}x{size:<5} {engine:>7} | {elapsed_s:>9.3f} | {base_s / elapsed_s:>7.1f}x | {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/bench_grid_memory.py
+# Run from src: python3 -m benchmarks.bench_grid_memory [size ...]
+
+import sys
+import time
+import tracemalloc
+
+from grid import buildCosts, buildCostGrid
+
+SIZES = [100, 1000, 3000]
+
+# The dict version needs several GB past this many cells, so above it the
+# number is extrapolated from the largest size that was actually measured.
+MAX_DICT_CELLS = 1000 * 1000
+
+
+def measure(build, size):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    costs = build(size, size, 1, 9, 1)
+    elapsed_s = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del costs
+    return peak, elapsed_s
+
+
+def fmt_mb(num_bytes):
+    return f"{num_bytes / (1024 * 1024):10.1f} MB"
+
+
+def main():
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+    dict_bytes_per_edge = None
+
+    print(f"{'grid':>11} {'edges':>12} {'dict':>15} {'CostGrid':>13} {'ratio':>8}")
+
+    for size in sizes:
+        edges = 4 * size * size - 4 * size
+
+        grid_peak, grid_s = measure(buildCostGrid, size)
+
+        if size * size <= MAX_DICT_CELLS:
+            dict_peak, dict_s = measure(buildCosts, size)
+            dict_bytes_per_edge = dict_peak / edges
+            dict_note = " "
+        elif dict_bytes_per_edge is not None:
+            dict_peak = dict_bytes_per_edge * edges
+            dict_note = "*"
+        else:
+            dict_peak = None
+            dict_note = " "
+
+        dict_col = "n/a" if dict_peak is None else fmt_mb(dict_peak) + dict_note
+        ratio = "" if dict_peak is None else f"{dict_peak / grid_peak:7.1f}x"
+        print(f"{size:>5}x{size:<5} {edges:>12} {dict_col:>15} {fmt_mb(grid_peak)} {ratio:>8}"
+              f"   (CostGrid build {grid_s:.2f}s)")
+
+    print("* extrapolated from the per-edge size of the largest measured dict")
+
+
+if __name__ == "__main__":
+    main()
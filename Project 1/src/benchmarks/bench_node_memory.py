@@ -0,0 +1,54 @@
+# benchmarks/bench_node_memory.py
+# Run from src: python3 -m benchmarks.bench_node_memory [num_nodes]
+
+import sys
+import tracemalloc
+
+from node import Node, NodePool
+
+NUM_NODES = 1_000_000
+N_COLS = 1000
+
+
+def measure(build, count):
+    tracemalloc.start()
+    nodes = build(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del nodes
+    return current / count
+
+
+def build_objects(count):
+    # what the searches used to allocate: one Node with a (r, c) state per push
+    nodes = []
+    parent = None
+    for i in range(count):
+        parent = Node(divmod(i, N_COLS), parent, "U", i)
+        nodes.append(parent)
+    return nodes
+
+
+def build_pool(count):
+    pool = NodePool(N_COLS)
+    parent = -1
+    for i in range(count):
+        parent = pool.add(i, parent, 0, i)
+    return pool
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_NODES
+
+    # the object version also pays 8 bytes per list slot to keep the nodes alive
+    per_object = measure(build_objects, count)
+    per_pooled = measure(build_pool, count)
+
+    print(f"nodes:        {count}")
+    print(f"Node objects: {per_object:7.1f} bytes/node")
+    print(f"NodePool:     {per_pooled:7.1f} bytes/node")
+    print(f"reduction:    {per_object / per_pooled:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
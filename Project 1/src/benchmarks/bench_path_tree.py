@@ -0,0 +1,52 @@
+# benchmarks/bench_path_tree.py
+# Run from src: python3 -m benchmarks.bench_path_tree [size [queries]]
+#
+# Many goals from one start on the same grid: one UCS call per goal against
+# one shortest_path_tree and an extract() per goal. Both must give the same
+# cost for every goal.
+
+import random
+import sys
+import time
+
+from grid import buildCostGrid
+from ucs import UCS, shortest_path_tree
+
+SIZE = 100
+QUERIES = 1000
+MIN_COST, MAX_COST = 1, 9
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else QUERIES
+
+    costs = buildCostGrid(size, size, MIN_COST, MAX_COST, 1)
+    rng = random.Random(0)
+    goals = [(rng.randrange(size), rng.randrange(size)) for _ in range(queries)]
+    start = (0, 0)
+
+    t0 = time.perf_counter()
+    ucs_costs = [UCS(start, goal, size, size, costs)[2]["total_cost"] for goal in goals]
+    ucs_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    tree = shortest_path_tree(start, size, size, costs)
+    build_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    paths = [tree.extract(goal) for goal in goals]
+    query_s = time.perf_counter() - t0
+
+    same = all(tree.cost(goal) == c for goal, c in zip(goals, ucs_costs))
+    assert all(states for states, _ in paths)
+
+    print(f"{size}x{size} grid, {queries} goals from {start}")
+    print(f"  {queries} UCS calls      : {ucs_s:9.3f} s")
+    print(f"  shortest_path_tree : {build_s:9.3f} s")
+    print(f"  {queries} extract() calls: {query_s:9.3f} s")
+    print(f"  speedup            : {ucs_s / (build_s + query_s):8.1f}x, same costs: {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_successors.py
+# Run from src: python3 -m benchmarks.bench_successors [size]
+#
+# Expands every cell of a size x size grid once and compares the old
+# per-call Succ() (new list, grid.move if/elif chain) with the shared
+# successor_table lookup used by BFS/DFS/UCS.
+
+import sys
+import time
+
+from grid import ACTIONS, move
+from successors import successor_table
+
+SIZE = 1000
+
+
+def Succ(cell, m, n):
+    # the successor function bfs.py/dfs.py/ucs.py used to copy-paste
+    successors = []
+    state = divmod(cell, n)
+
+    for action_id, action in enumerate(ACTIONS):
+        next_state = move(state, action)
+
+        if 0 <= next_state[0] < m and 0 <= next_state[1] < n:
+            successors.append((action_id, next_state[0] * n + next_state[1]))
+
+    return successors
+
+
+def expand_with_succ(m, n):
+    generated = 0
+    for cell in range(m * n):
+        for (action, next_cell) in Succ(cell, m, n):
+            generated += next_cell >= 0
+    return generated
+
+
+def expand_with_table(m, n):
+    succ = successor_table(m, n)
+    succ_kind, succ_moves = succ.kind, succ.moves
+
+    generated = 0
+    for cell in range(m * n):
+        for (action, delta) in succ_moves[succ_kind[cell]]:
+            next_cell = cell + delta
+            generated += next_cell >= 0
+    return generated
+
+
+def timed(fn, m, n):
+    t0 = time.perf_counter()
+    generated = fn(m, n)
+    return generated, time.perf_counter() - t0
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    m = n = size
+    expansions = m * n
+
+    t0 = time.perf_counter()
+    successor_table.cache_clear()
+    successor_table(m, n)
+    build_s = time.perf_counter() - t0
+
+    gen_old, old_s = timed(expand_with_succ, m, n)
+    gen_new, new_s = timed(expand_with_table, m, n)
+    assert gen_old == gen_new
+
+    print(f"grid {m}x{n}, {expansions} expansions, {gen_new} successors")
+    print(f"Succ() per call:  {expansions / old_s:12,.0f} expansions/s ({old_s:.2f}s)")
+    print(f"successor_table:  {expansions / new_s:12,.0f} expansions/s ({new_s:.2f}s, built in {build_s * 1000:.1f} ms)")
+    print(f"speedup:          {old_s / new_s:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,42 @@
 import time
-from grid import move
-from node import ExtractPath, Node
+from array import array
+from budget import cutoff_result, make_budget
+from profiling import report
+from node import ExtractBidirPath, ExtractPath, NodePool, cell_id
+from successors import OPPOSITE, successor_table
 from collections import deque
 
 
-def Succ(state, m, n):
-    actions = ["U", "D", "L", "R"]
-    successors = []
+def BFS(s0, goal, m, n, max_expansions=None, deadline_ms=None, max_frontier=None, profiler=None):
+    # Optional budgets (see budget.py) stop the search with status "cutoff";
+    # an optional Profiler (see profiling.py) times its phases
 
-    for action in actions:
-        next_state = move(state, action)
-
-        # if next state is inside grid: add to successors
-        if 0 <= next_state[0] < m and 0 <= next_state[1] < n:
-            successors.append((action, next_state))
-
-    return successors
+    start_ns = time.perf_counter_ns()
+    budget = make_budget(start_ns, max_expansions, deadline_ms, max_frontier)
 
-def BFS(s0, goal, m, n):
+    # states are integer cell ids, nodes are indices into the pool
+    pool = NodePool(n)
+    add_node = pool.add
+    node_cell = pool.cell
+    goal_cell = cell_id(goal, m, n)
 
-    start_ns = time.perf_counter_ns()
+    # precomputed successor moves, shared by every search on an m x n grid
+    succ = successor_table(m, n)
+    succ_kind, succ_moves = succ.kind, succ.moves
 
     # 1: frontier <- Queue()
     frontier = deque()
+    push, pop, extract = frontier.append, frontier.popleft, ExtractPath
+    if profiler is not None:
+        push = profiler.timed(push, "frontier")
+        pop = profiler.timed_pop(pop)
+        extract = profiler.timed(ExtractPath, "extract")
 
     # 2: frontier.push(Node(s0, nil, nil, g = 0))
-    frontier.append(Node(s0, None, None, 0))
+    push(add_node(cell_id(s0, m, n), -1, -1, 0))
 
     # 3: explored <- ∅
-    explored = set()
+    explored = bytearray(m * n)
 
     expanded_states = 0
     generated_nodes = 1     # start node
@@ -38,42 +46,151 @@ def BFS(s0, goal, m, n):
     while frontier:
 
         # 5: n <- frontier.pop()
-        node = frontier.popleft()
+        node = pop()
+        cell = node_cell[node]
 
         # 6: if Goal(n.state) then return ExtractPath(n)
-        if node.state == goal:
+        if cell == goal_cell:
 
-            states, actions = ExtractPath(node)
+            states, actions = extract(node, pool)
             runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
 
-            return (states,
-                    actions,
-                    {
-                        "expanded_states": expanded_states,
-                        "generated_nodes": generated_nodes,
-                        "max_frontier_size": max_frontier_size,
-                        "runtime_ms": runtime_ms,
-                        "status": "success"
-                    }) 
+            return report(profiler, (states,
+                                     actions,
+                                     {
+                                         "expanded_states": expanded_states,
+                                         "generated_nodes": generated_nodes,
+                                         "max_frontier_size": max_frontier_size,
+                                         "runtime_ms": runtime_ms,
+                                         "status": "success"
+                                     }))
         
         # 8: if n.state ∉ explored then
-        if node.state not in explored:
+        if not explored[cell]:
 
             # 9: add n.state to explored
-            explored.add(node.state)
+            explored[cell] = 1
             expanded_states += 1
 
+            g = pool.g[node] + 1
 
             # 10: for all (a, s′) belongs to Succ(n.state) do
-            for (action, next_state) in Succ(node.state, m, n):
+            for (action, delta) in succ_moves[succ_kind[cell]]:
+                next_cell = cell + delta
                 generated_nodes += 1
 
                 # 11: frontier.push(Node(s′, n, a, g = n.g + 1))
-                frontier.append(Node(next_state, node, action, node.g + 1))
+                push(add_node(next_cell, node, action, g))
                 if len(frontier) > max_frontier_size:
                     max_frontier_size = len(frontier)
 
+            if profiler is not None:
+                profiler.expanded(pool, node)
+
+            if budget is not None:
+                reason = budget.exceeded(expanded_states, len(frontier))
+                if reason is not None:
+                    return report(profiler, cutoff_result(pool, goal, reason, start_ns, expanded_states,
+                                                          generated_nodes, max_frontier_size))
+
     # 15: return failure
+    runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+    return report(profiler, ([],
+                             [],
+                             {
+                                 "expanded_states": expanded_states,
+                                 "generated_nodes": generated_nodes,
+                                 "max_frontier_size": max_frontier_size,
+                                 "runtime_ms": runtime_ms,
+                                 "status": "failure"
+                             }))
+
+
+def BFS_bidir(s0, goal, m, n):
+    # Bidirectional BFS: grow one full layer at a time from whichever side
+    # has the smaller frontier. The first layer that reaches a cell already
+    # seen from the other side contains a shortest path; the best meeting
+    # cell of that layer is kept.
+
+    start_ns = time.perf_counter_ns()
+
+    start_cell = cell_id(s0, m, n)
+    goal_cell = cell_id(goal, m, n)
+
+    succ = successor_table(m, n)
+    succ_kind, succ_moves = succ.kind, succ.moves
+
+    size = m * n
+    # index 0: search from s0, index 1: search from goal (over reversed moves)
+    parent = (array("i", [-1]) * size, array("i", [-1]) * size)
+    action = (array("b", [-1]) * size, array("b", [-1]) * size)
+    dist = (array("i", [-1]) * size, array("i", [-1]) * size)
+    frontiers = [[start_cell], [goal_cell]]
+
+    expanded_states = 0
+    generated_nodes = 1     # start node
+    max_frontier_size = 1
+    meet = -1
+
+    if goal_cell != -1:
+        dist[0][start_cell] = 0
+        dist[1][goal_cell] = 0
+        generated_nodes += 1
+        max_frontier_size = 2
+        if start_cell == goal_cell:
+            meet = start_cell
+
+    while meet == -1 and goal_cell != -1 and frontiers[0] and frontiers[1]:
+
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        other = 1 - side
+        side_parent, side_action, side_dist = parent[side], action[side], dist[side]
+        other_dist = dist[other]
+
+        next_layer = []
+        best = -1
+
+        for cell in frontiers[side]:
+            expanded_states += 1
+            next_dist = side_dist[cell] + 1
+
+            for (a, delta) in succ_moves[succ_kind[cell]]:
+                next_cell = cell + delta
+                if side_dist[next_cell] != -1:
+                    continue
+
+                side_dist[next_cell] = next_dist
+                side_parent[next_cell] = cell
+                # the goal side walks moves backwards: next_cell -> cell
+                side_action[next_cell] = a if side == 0 else OPPOSITE[a]
+                next_layer.append(next_cell)
+                generated_nodes += 1
+
+                if other_dist[next_cell] != -1:
+                    total = next_dist + other_dist[next_cell]
+                    if best == -1 or total < best:
+                        best = total
+                        meet = next_cell
+
+        frontiers[side] = next_layer
+        if len(frontiers[0]) + len(frontiers[1]) > max_frontier_size:
+            max_frontier_size = len(frontiers[0]) + len(frontiers[1])
+
+    if meet != -1:
+
+        states, actions = ExtractBidirPath(meet, parent[0], action[0], parent[1], action[1], n)
+        runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+
+        return (states,
+                actions,
+                {
+                    "expanded_states": expanded_states,
+                    "generated_nodes": generated_nodes,
+                    "max_frontier_size": max_frontier_size,
+                    "runtime_ms": runtime_ms,
+                    "status": "success"
+                })
+
     runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
     return ([],
             [],
@@ -83,4 +200,4 @@ def BFS(s0, goal, m, n):
                 "max_frontier_size": max_frontier_size,
                 "runtime_ms": runtime_ms,
                 "status": "failure"
-            }) 
\ No newline at end of file
+            })
@@ -0,0 +1,66 @@
+import time
+
+from node import ExtractPath
+
+# Search budgets. A search given any of max_expansions, deadline_ms or
+# max_frontier checks them after every expansion and stops with
+# status "cutoff" once one is exceeded, returning the path to the generated
+# node closest to the goal and the metrics so far.
+
+CUTOFF_REASONS = ("max_expansions", "deadline_ms", "max_frontier")
+
+
+class Budget:
+    __slots__ = ("max_expansions", "deadline_ns", "max_frontier")
+
+    def __init__(self, start_ns, max_expansions=None, deadline_ms=None, max_frontier=None):
+        self.max_expansions = max_expansions
+        self.deadline_ns = None if deadline_ms is None else start_ns + int(deadline_ms * 1_000_000)
+        self.max_frontier = max_frontier
+
+    def exceeded(self, expanded_states, frontier_size):
+        # name of the first limit that is used up, None while within budget
+        if self.max_expansions is not None and expanded_states >= self.max_expansions:
+            return "max_expansions"
+        if self.max_frontier is not None and frontier_size > self.max_frontier:
+            return "max_frontier"
+        if self.deadline_ns is not None and time.perf_counter_ns() >= self.deadline_ns:
+            return "deadline_ms"
+        return None
+
+
+def make_budget(start_ns, max_expansions=None, deadline_ms=None, max_frontier=None):
+    # None when there is nothing to check, so unbounded searches pay nothing
+    if max_expansions is None and deadline_ms is None and max_frontier is None:
+        return None
+    return Budget(start_ns, max_expansions, deadline_ms, max_frontier)
+
+
+def closest_node(pool, goal):
+    # node of the pool whose cell is closest to goal (Manhattan), earliest on ties
+    n = pool.n
+    rg, cg = goal
+    best, best_h = -1, None
+    for node, cell in enumerate(pool.cell):
+        r, c = divmod(cell, n)
+        h = abs(r - rg) + abs(c - cg)
+        if best_h is None or h < best_h:
+            best, best_h = node, h
+    return best
+
+
+def cutoff_result(pool, goal, reason, start_ns, expanded_states, generated_nodes, max_frontier_size):
+    # (states, actions, metrics) of a search stopped by its budget
+    states, actions = ExtractPath(closest_node(pool, goal), pool)
+    runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+
+    return (states,
+            actions,
+            {
+                "expanded_states": expanded_states,
+                "generated_nodes": generated_nodes,
+                "max_frontier_size": max_frontier_size,
+                "runtime_ms": runtime_ms,
+                "status": "cutoff",
+                "cutoff_reason": reason
+            })
@@ -1,34 +1,43 @@
 import time
-from grid import move
-from node import ExtractPath, Node
+import tracemalloc
+from grid import ACTIONS
+from budget import cutoff_result, make_budget
+from profiling import report
+from node import ExtractPath, NodePool, cell_id
+from successors import successor_table
 from collections import deque
 
 
-def Succ(state, m, n):
-    actions = ["U", "D", "L", "R"]
-    successors = []
+def DFS(s0, goal, m, n, max_expansions=None, deadline_ms=None, max_frontier=None, profiler=None):
+    # Optional budgets (see budget.py) stop the search with status "cutoff";
+    # an optional Profiler (see profiling.py) times its phases
 
-    for action in actions:
-        next_state = move(state, action)
-
-        # if next state is inside grid: add to successors
-        if 0 <= next_state[0] < m and 0 <= next_state[1] < n:
-            successors.append((action, next_state))
+    start_ns = time.perf_counter_ns()
+    budget = make_budget(start_ns, max_expansions, deadline_ms, max_frontier)
 
-    return successors
+    # states are integer cell ids, nodes are indices into the pool
+    pool = NodePool(n)
+    add_node = pool.add
+    node_cell = pool.cell
+    goal_cell = cell_id(goal, m, n)
 
-def DFS(s0, goal, m, n):
-
-    start_ns = time.perf_counter_ns()
+    # precomputed successor moves, shared by every search on an m x n grid
+    succ = successor_table(m, n)
+    succ_kind, succ_moves = succ.kind, succ.moves
 
     # 1: frontier <- Stack()
     frontier = deque()
+    push, pop, extract = frontier.append, frontier.pop, ExtractPath
+    if profiler is not None:
+        push = profiler.timed(push, "frontier")
+        pop = profiler.timed_pop(pop)
+        extract = profiler.timed(ExtractPath, "extract")
 
     # 2: frontier.push(Node(s0, nil, nil, g = 0))
-    frontier.append(Node(s0, None, None, 0))
+    push(add_node(cell_id(s0, m, n), -1, -1, 0))
 
     # 3: explored <- ∅
-    explored = set()
+    explored = bytearray(m * n)
 
     expanded_states = 0
     generated_nodes = 1     # start node
@@ -38,49 +47,207 @@ def DFS(s0, goal, m, n):
     while frontier:
 
         # 5: n <- frontier.pop()
-        node = frontier.pop()
+        node = pop()
+        cell = node_cell[node]
 
         # 6: if Goal(n.state) then return ExtractPath(n)
-        if node.state == goal:
+        if cell == goal_cell:
 
-            states, actions = ExtractPath(node)
+            states, actions = extract(node, pool)
             runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
 
-            return (states,
-                    actions,
-                    {
-                        "expanded_states": expanded_states,
-                        "generated_nodes": generated_nodes,
-                        "max_frontier_size": max_frontier_size,
-                        "runtime_ms": runtime_ms,
-                        "status": "success"
-                    }) 
+            return report(profiler, (states,
+                                     actions,
+                                     {
+                                         "expanded_states": expanded_states,
+                                         "generated_nodes": generated_nodes,
+                                         "max_frontier_size": max_frontier_size,
+                                         "runtime_ms": runtime_ms,
+                                         "status": "success"
+                                     }))
         
         # 8: if n.state ∉ explored then
-        if node.state not in explored:
+        if not explored[cell]:
 
             # 9: add n.state to explored
-            explored.add(node.state)
+            explored[cell] = 1
             expanded_states += 1
 
+            g = pool.g[node] + 1
 
             # 10: for all (a, s′) belongs to Succ(n.state) do
-            for (action, next_state) in Succ(node.state, m, n):
+            for (action, delta) in succ_moves[succ_kind[cell]]:
+                next_cell = cell + delta
                 generated_nodes += 1
 
                 # 11: frontier.push(Node(s′, n, a, g = n.g + 1))
-                frontier.append(Node(next_state, node, action, node.g + 1))
+                push(add_node(next_cell, node, action, g))
                 if len(frontier) > max_frontier_size:
                     max_frontier_size = len(frontier)
 
+            if profiler is not None:
+                profiler.expanded(pool, node)
+
+            if budget is not None:
+                reason = budget.exceeded(expanded_states, len(frontier))
+                if reason is not None:
+                    return report(profiler, cutoff_result(pool, goal, reason, start_ns, expanded_states,
+                                                          generated_nodes, max_frontier_size))
+
     # 15: return failure
     runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
-    return ([],
-            [],
+    return report(profiler, ([],
+                             [],
+                             {
+                                 "expanded_states": expanded_states,
+                                 "generated_nodes": generated_nodes,
+                                 "max_frontier_size": max_frontier_size,
+                                 "runtime_ms": runtime_ms,
+                                 "status": "failure"
+                             }))
+
+
+# default transposition table cap for IDDFS, in cells
+TT_SIZE = 1 << 16
+
+
+def IDDFS(s0, goal, m, n, tt_size=TT_SIZE, max_depth=None, track_memory=False):
+    """
+    Iterative-deepening DFS: depth-limited DFS with limits 0, 1, 2, ...
+
+    Only the current path is stored (an explicit stack of cells and next-move
+    indices), so memory is linear in the path depth plus the transposition
+    table. The table maps cell -> depth it was first reached at in the current
+    iteration and prunes revisits that are no shallower. It holds at most
+    tt_size cells (0 disables it, None means no cap); without it an open grid
+    has exponentially many paths to every depth.
+
+    Extra metrics: iterations, reexpanded_states (expansions spent in the
+    iterations before the last one), peak_stack_depth, and peak_memory_bytes
+    (tracemalloc peak when track_memory is True, else None).
+    """
+
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        started_tracing = True
+    else:
+        started_tracing = False
+    if track_memory:
+        tracemalloc.reset_peak()
+
+    start_ns = time.perf_counter_ns()
+
+    succ = successor_table(m, n)
+    succ_kind, succ_moves = succ.kind, succ.moves
+
+    start_cell = cell_id(s0, m, n)
+    goal_cell = cell_id(goal, m, n)
+    if max_depth is None:
+        max_depth = m * n - 1   # longest simple path
+
+    expanded_states = 0
+    generated_nodes = 1     # start node
+    iterations = 0
+    last_expanded = 0
+    peak_stack_depth = 1
+    found = None
+
+    # a goal outside the grid is never generated, no limit would find it
+    limits = range(max_depth + 1) if goal_cell >= 0 else range(0)
+
+    for limit in limits:
+        iterations += 1
+        before = expanded_states
+
+        if start_cell == goal_cell:
+            found = ([start_cell], [])
+            break
+
+        # current path: cells, the action into each cell, next move to try
+        path = [start_cell]
+        path_actions = []
+        next_move = [0]
+        on_path = {start_cell}
+        tt = {start_cell: 0} if tt_size != 0 else None
+
+        if limit > 0:
+            expanded_states += 1
+
+        while path:
+            cell = path[-1]
+            depth = len(path) - 1
+            moves = succ_moves[succ_kind[cell]]
+            i = next_move[-1]
+
+            # backtrack when at the depth limit or out of moves
+            if depth == limit or i == len(moves):
+                path.pop()
+                next_move.pop()
+                on_path.discard(cell)
+                if path_actions:
+                    path_actions.pop()
+                continue
+
+            next_move[-1] = i + 1
+            action, delta = moves[i]
+            next_cell = cell + delta
+            generated_nodes += 1
+
+            if next_cell in on_path:
+                continue
+
+            if next_cell == goal_cell:
+                found = (path + [next_cell], path_actions + [action])
+                break
+
+            g = depth + 1
+            if tt is not None:
+                seen = tt.get(next_cell)
+                if seen is not None and seen <= g:
+                    continue
+                if seen is not None or tt_size is None or len(tt) < tt_size:
+                    tt[next_cell] = g
+
+            path.append(next_cell)
+            path_actions.append(action)
+            next_move.append(0)
+            on_path.add(next_cell)
+            if len(path) > peak_stack_depth:
+                peak_stack_depth = len(path)
+            if g < limit:
+                expanded_states += 1
+
+        last_expanded = expanded_states - before
+        if found is not None:
+            break
+
+    runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+
+    peak_memory_bytes = None
+    if track_memory:
+        peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        if started_tracing:
+            tracemalloc.stop()
+
+    if found is not None:
+        cells, actions = found
+        states = [divmod(cell, n) for cell in cells]
+        actions = [ACTIONS[a] for a in actions]
+        status = "success"
+    else:
+        states, actions = [], []
+        status = "failure"
+
+    return (states,
+            actions,
             {
                 "expanded_states": expanded_states,
                 "generated_nodes": generated_nodes,
-                "max_frontier_size": max_frontier_size,
+                "max_frontier_size": peak_stack_depth,
                 "runtime_ms": runtime_ms,
-                "status": "failure"
-            }) 
\ No newline at end of file
+                "status": status,
+                "iterations": iterations,
+                "reexpanded_states": expanded_states - last_expanded,
+                "peak_stack_depth": peak_stack_depth,
+                "peak_memory_bytes": peak_memory_bytes,
+            })
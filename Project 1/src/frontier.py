@@ -0,0 +1,167 @@
+from array import array
+from collections import deque
+
+
+class IndexedHeap:
+    """
+    Binary min-heap over integer keys 0..capacity-1 with decrease-key.
+
+    Each key is in the heap at most once. pos[key] is the key's slot in the
+    heap (-1 when absent), so a cheaper path to a state already in the
+    frontier updates its entry instead of pushing a duplicate.
+    Priorities are compared as-is, e.g. (g, tie_breaker) tuples.
+    """
+
+    __slots__ = ("keys", "prios", "pos")
+
+    def __init__(self, capacity):
+        self.keys = []
+        self.prios = []
+        self.pos = array("i", [-1]) * capacity
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return self.pos[key] != -1
+
+    def push(self, key, prio):
+        if self.pos[key] != -1:
+            raise KeyError(f"key {key} is already in the heap")
+        self.keys.append(key)
+        self.prios.append(prio)
+        self.pos[key] = len(self.keys) - 1
+        self._sift_up(len(self.keys) - 1)
+
+    def decrease_key(self, key, prio):
+        i = self.pos[key]
+        if i == -1:
+            raise KeyError(f"key {key} is not in the heap")
+        if prio > self.prios[i]:
+            raise ValueError("decrease_key cannot increase a priority")
+        self.prios[i] = prio
+        self._sift_up(i)
+
+    def push_or_decrease(self, key, prio):
+        if self.pos[key] == -1:
+            self.push(key, prio)
+        else:
+            self.decrease_key(key, prio)
+
+    def pop(self):
+        # remove and return (prio, key) with the smallest priority
+        keys, prios, pos = self.keys, self.prios, self.pos
+
+        top_key, top_prio = keys[0], prios[0]
+        last_key, last_prio = keys.pop(), prios.pop()
+        pos[top_key] = -1
+
+        if keys:
+            keys[0], prios[0] = last_key, last_prio
+            pos[last_key] = 0
+            self._sift_down(0)
+
+        return top_prio, top_key
+
+    def _sift_up(self, i):
+        keys, prios, pos = self.keys, self.prios, self.pos
+        key, prio = keys[i], prios[i]
+
+        while i > 0:
+            parent = (i - 1) >> 1
+            if prio < prios[parent]:
+                keys[i], prios[i] = keys[parent], prios[parent]
+                pos[keys[i]] = i
+                i = parent
+            else:
+                break
+
+        keys[i], prios[i] = key, prio
+        pos[key] = i
+
+    def _sift_down(self, i):
+        keys, prios, pos = self.keys, self.prios, self.pos
+        size = len(keys)
+        key, prio = keys[i], prios[i]
+
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and prios[child + 1] < prios[child]:
+                child += 1
+            if prios[child] < prio:
+                keys[i], prios[i] = keys[child], prios[child]
+                pos[keys[i]] = i
+                i = child
+            else:
+                break
+
+        keys[i], prios[i] = key, prio
+        pos[key] = i
+
+
+class BucketQueue:
+    """
+    Dial's bucket queue for small non-negative integer priorities.
+
+    Entries are tuples whose first item is the priority, e.g. (g, node),
+    same as the heapq entries they replace. Priorities pushed must be >=
+    the last popped priority for push and pop to stay O(1) amortized;
+    buckets[p % len(buckets)] holds every entry with priority p. A lower
+    or much higher priority still works but rebuilds the buckets. Entries
+    with equal priority pop in push order, the same order heapq gives
+    (g, node_index) entries.
+    """
+
+    __slots__ = ("buckets", "current", "size")
+
+    def __init__(self, max_step):
+        # priorities in the queue span at most max_step + 1 values
+        self.buckets = [deque() for _ in range(max_step + 1)]
+        self.current = None     # last popped priority, no entry is below it
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, entry):
+        prio = entry[0]
+        if self.current is None:
+            self.current = prio
+        elif prio < self.current:
+            # only with an inconsistent heuristic: move the window down to prio
+            self._rebuild(prio, len(self.buckets) + self.current - prio)
+        elif prio - self.current >= len(self.buckets):
+            self._rebuild(self.current, prio - self.current + 1)
+
+        self.buckets[prio % len(self.buckets)].append(entry)
+        self.size += 1
+
+    def pop(self):
+        if self.size == 0:
+            raise IndexError("pop from an empty BucketQueue")
+
+        buckets = self.buckets
+        num_buckets = len(buckets)
+        current = self.current
+
+        bucket = buckets[current % num_buckets]
+        while not bucket:
+            current += 1
+            bucket = buckets[current % num_buckets]
+
+        self.current = current
+        self.size -= 1
+        return bucket.popleft()
+
+    def _rebuild(self, current, num_buckets):
+        # re-spread the entries (in priority, then push order) over a wider window
+        entries = []
+        for offset in range(len(self.buckets)):
+            entries.extend(self.buckets[(self.current + offset) % len(self.buckets)])
+
+        self.current = current
+        self.buckets = [deque() for _ in range(num_buckets)]
+        for entry in entries:
+            self.buckets[entry[0] % num_buckets].append(entry)
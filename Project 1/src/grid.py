@@ -1,7 +1,33 @@
+import gc
 import random
+from array import array
+from itertools import compress, product
 
+ACTIONS = ["U", "D", "L", "R"] # Order is important for reproducibility
+ACTION_ID = {action: i for i, action in enumerate(ACTIONS)}
+
+# "python": the original random.randint loop
+# "numpy": one numpy Generator.integers call (fast, but a different stream)
+# "compat": vectorized with numpy, same values as "python" for every seed
+ENGINES = ("python", "numpy", "compat")
+COMPAT_CHUNK = 1 << 18  # raw draws per step of the compat generator
+
+
+def buildCosts(m, n, min_cost, max_cost, seed, engine="python"):
+    if engine != "python":
+        # same keys and order as the loop below, costs drawn with numpy
+        _, mask, values = numpy_edge_costs(m, n, min_cost, max_cost, seed, engine)
+        keys = ((state, a) for state in product(range(m), range(n)) for a in ACTIONS)
+
+        # millions of new tuples would otherwise trigger full gc passes
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return dict(zip(compress(keys, mask.tolist()), values.tolist()))
+        finally:
+            if gc_was_enabled:
+                gc.enable()
 
-def buildCosts(m, n, min_cost, max_cost, seed):
     random.seed(seed)
     actions = ["U", "D", "L", "R"] # Order is important for reproducibility
 
@@ -34,4 +60,250 @@ def move(state, action):
         return (r, c+1)
     else:
         raise ValueError("Invalid action: {}".format(action))
-    
\ No newline at end of file
+
+
+def cost_typecode(min_cost, max_cost):
+    # smallest array typecode that can hold every cost in [min_cost, max_cost]
+    if min_cost >= 0:
+        if max_cost <= 0xFFFF:
+            return "H"
+        if max_cost <= 0xFFFFFFFF:
+            return "I"
+        return "Q"
+    return "q"
+
+
+class CostGrid:
+    """
+    Compact directed edge costs for an m x n grid.
+
+    costs[cell_id * 4 + action_id] is the cost of taking ACTIONS[action_id]
+    from cell_id = r * n + c. Edges that leave the grid are stored as 0 and
+    are never returned. Indexing with ((r, c), action) works like the dict
+    from buildCosts, so UCS and path_cost accept either one.
+    """
+
+    __slots__ = ("m", "n", "min_cost", "max_cost", "costs")
+
+    def __init__(self, m, n, min_cost, max_cost, costs=None):
+        self.m = m
+        self.n = n
+        self.min_cost = min_cost
+        self.max_cost = max_cost
+
+        if costs is None:
+            typecode = cost_typecode(min_cost, max_cost)
+            costs = array(typecode, bytes(m * n * 4 * array(typecode).itemsize))
+        self.costs = costs
+
+    def edge_index(self, state, action):
+        (r, c) = state
+        next_state = move(state, action)
+
+        if not (0 <= r < self.m and 0 <= c < self.n):
+            return None
+        if not (0 <= next_state[0] < self.m and 0 <= next_state[1] < self.n):
+            return None
+        return (r * self.n + c) * 4 + ACTION_ID[action]
+
+    def __getitem__(self, key):
+        state, action = key
+        idx = self.edge_index(state, action)
+        if idx is None:
+            raise KeyError(key)
+        return self.costs[idx]
+
+    def __contains__(self, key):
+        try:
+            state, action = key
+            return self.edge_index(state, action) is not None
+        except (TypeError, ValueError, KeyError):
+            return False
+
+    def __len__(self):
+        # number of legal directed edges, same as len(buildCosts(...))
+        m, n = self.m, self.n
+        return 4 * m * n - 2 * m - 2 * n
+
+    def nbytes(self):
+        return len(self.costs) * self.costs.itemsize
+
+    @property
+    def typecode(self):
+        # array typecode of costs (an array, or a memoryview of a cached file)
+        costs = self.costs
+        return costs.typecode if isinstance(costs, array) else costs.format
+
+    @property
+    def g_typecode(self):
+        # array typecode for path costs over this grid: "d" for float edge
+        # costs, else "q"
+        return "d" if self.typecode in ("f", "d") else "q"
+
+    @classmethod
+    def from_dict(cls, costs, m, n):
+        # convert a buildCosts dict so searches can index edges by integer.
+        # Integer costs get the smallest fitting typecode, anything else
+        # (float costs) is stored as "d"
+        values = costs.values()
+        lo, hi = min(values, default=0), max(values, default=0)
+        if all(isinstance(v, int) for v in values):
+            grid = cls(m, n, lo, hi)
+        elif all(isinstance(v, (int, float)) for v in values):
+            grid = cls(m, n, lo, hi, array("d", bytes(m * n * 4 * array("d").itemsize)))
+        else:
+            raise ValueError("edge costs must be numbers")
+
+        for (state, action), cost in costs.items():
+            idx = grid.edge_index(state, action)
+            if idx is None:
+                raise ValueError(f"edge {(state, action)} is not in an {m} x {n} grid")
+            grid.costs[idx] = cost
+        return grid
+
+
+# the last dict as_cost_grid converted, and its CostGrid. The dict is kept
+# alive so its id cannot be reused; searches do not change their costs.
+_last_converted = (None, None, None, None)
+
+
+def as_cost_grid(costs, m, n):
+    # costs as a CostGrid. A buildCosts dict is converted once (O(mn)) and the
+    # result reused while the same dict is passed for the same grid size
+    global _last_converted
+    if isinstance(costs, CostGrid):
+        return costs
+
+    last, last_m, last_n, grid = _last_converted
+    if last is costs and (last_m, last_n) == (m, n) and len(grid) == len(costs):
+        return grid
+    grid = CostGrid.from_dict(costs, m, n)
+    _last_converted = (costs, m, n, grid)
+    return grid
+
+
+def buildCostGrid(m, n, min_cost, max_cost, seed, engine="python"):
+    # Same random stream and edge order as buildCosts, stored in a CostGrid
+    if engine != "python":
+        return numpy_cost_grid(m, n, min_cost, max_cost, seed, engine)
+
+    random.seed(seed)
+    grid = CostGrid(m, n, min_cost, max_cost)
+    costs = grid.costs
+    randint = random.randint
+
+    for r in range(m):
+        for c in range(n):
+            base = (r * n + c) * 4
+
+            if r + 1 < m:   # U
+                costs[base] = randint(min_cost, max_cost)
+            if r - 1 >= 0:  # D
+                costs[base + 1] = randint(min_cost, max_cost)
+            if c - 1 >= 0:  # L
+                costs[base + 2] = randint(min_cost, max_cost)
+            if c + 1 < n:   # R
+                costs[base + 3] = randint(min_cost, max_cost)
+    return grid
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("engine='numpy' and engine='compat' need numpy installed") from None
+    return numpy
+
+
+def legal_edge_mask(np, m, n):
+    # bool per CostGrid slot (cell_id * 4 + action_id): does the edge stay in the grid?
+    r = np.arange(m).reshape(m, 1)
+    c = np.arange(n).reshape(1, n)
+
+    mask = np.empty((m, n, 4), dtype=bool)
+    mask[:, :, 0] = r + 1 < m   # U
+    mask[:, :, 1] = r - 1 >= 0  # D
+    mask[:, :, 2] = c - 1 >= 0  # L
+    mask[:, :, 3] = c + 1 < n   # R
+    return mask.ravel()
+
+
+def legacy_randints(np, seed, min_cost, max_cost, count, dtype="q"):
+    """
+    The first count values of random.seed(seed); random.randint(min_cost, max_cost),
+    computed with numpy. Leaves the random module in the same state as the loop.
+
+    randint draws r = getrandbits(k) (k = bit length of the range width) and
+    redraws while r >= width. For k <= 32 every getrandbits call is one 32-bit
+    Mersenne Twister output shifted right by 32 - k, so the stream is numpy's
+    MT19937 started from random's state, shifted and filtered.
+    """
+    width = max_cost - min_cost + 1
+    k = width.bit_length()
+    if k > 32:
+        raise ValueError("engine='compat' needs max_cost - min_cost < 2**32 - 1")
+
+    random.seed(seed)
+    version, internal, gauss = random.getstate()
+
+    bitgen = np.random.MT19937()
+    bitgen.state = {"bit_generator": "MT19937",
+                    "state": {"key": np.array(internal[:-1], dtype=np.uint32), "pos": internal[-1]}}
+
+    # r = word >> (32 - k) is accepted when r < width, i.e. word < width << (32 - k)
+    shift = 32 - k
+    limit = np.uint64(width << shift)
+
+    values = np.empty(count, dtype=dtype)
+    have = 0
+    while have < count:
+        # cache-sized chunks of raw 32-bit words
+        before = bitgen.state
+        words = bitgen.random_raw(COMPAT_CHUNK)
+        accepted = words < limit
+        r = np.compress(accepted, words)
+
+        take = min(len(r), count - have)
+        values[have:have + take] = r[:take] >> shift
+        have += take
+
+    if count:
+        # replay the last chunk up to the last value used, so random ends
+        # where the loop would
+        used = int(np.flatnonzero(accepted)[take - 1]) + 1
+        bitgen.state = before
+        bitgen.random_raw(used)
+        state = bitgen.state["state"]
+        random.setstate((version, tuple(int(x) for x in state["key"]) + (int(state["pos"]),), gauss))
+
+    values += min_cost
+    return values
+
+
+def numpy_edge_costs(m, n, min_cost, max_cost, seed, engine):
+    # (numpy, legal edge mask in CostGrid order, their costs in loop order)
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine} (expected one of {ENGINES})")
+    np = _numpy()
+
+    mask = legal_edge_mask(np, m, n)
+    count = int(mask.sum())
+
+    typecode = cost_typecode(min_cost, max_cost)
+    if engine == "numpy":
+        values = np.random.default_rng(seed).integers(min_cost, max_cost, size=count,
+                                                      dtype=typecode, endpoint=True)
+    else:
+        values = legacy_randints(np, seed, min_cost, max_cost, count, dtype=typecode)
+    return np, mask, values
+
+
+def numpy_cost_grid(m, n, min_cost, max_cost, seed, engine):
+    # buildCostGrid for engine "numpy" / "compat": all edge costs in one go
+    np, mask, values = numpy_edge_costs(m, n, min_cost, max_cost, seed, engine)
+
+    # write straight into the grid's zeroed array; the mask is row-major,
+    # the same (r, c, action) order as the loop
+    grid = CostGrid(m, n, min_cost, max_cost)
+    np.frombuffer(grid.costs, dtype=grid.typecode)[mask] = values
+    return grid
@@ -0,0 +1,138 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from grid import CostGrid, buildCostGrid
+
+# On-disk cache of generated cost grids.
+#
+# A grid is fully determined by (m, n, min_cost, max_cost, seed), so each one
+# is stored once under a hash of those parameters and FORMAT_VERSION. The
+# file is a fixed header followed by the raw CostGrid.costs array; a warm
+# load maps the file and wraps it in a CostGrid without running the random
+# generator. Files are evicted least recently used first (by mtime, which a
+# hit refreshes) once the cache holds more than max_bytes.
+
+FORMAT_VERSION = 1
+CACHE_DIR = ".grid_cache"
+MAX_BYTES = 1 << 30
+
+MAGIC = b"CGRD"
+# magic, version, byteorder, typecode, m, n, min_cost, max_cost, seed
+HEADER = struct.Struct("<4sHcc5q")
+HEADER_SIZE = 64    # payload starts 64-byte aligned
+
+
+def _itemsize(typecode):
+    # bytes per value of a stored typecode, 0 if it is not an array typecode
+    try:
+        return array(typecode.decode()).itemsize
+    except (ValueError, UnicodeDecodeError):
+        return 0
+
+
+def grid_key(m, n, min_cost, max_cost, seed, engine="python"):
+    params = f"v{FORMAT_VERSION}:{m}:{n}:{min_cost}:{max_cost}:{seed}"
+    if engine == "numpy":
+        # "compat" grids are identical to "python" ones and share their files
+        params += ":numpy"
+    return hashlib.sha256(params.encode()).hexdigest()[:32]
+
+
+class GridCache:
+    """
+    Cost grids on disk, keyed by their generation parameters.
+
+        cache = GridCache()
+        costs = cache.get(m, n, min_cost, max_cost, seed)   # builds or maps
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, m, n, min_cost, max_cost, seed, engine="python"):
+        return self.directory / (grid_key(m, n, min_cost, max_cost, seed, engine) + ".grid")
+
+    def get(self, m, n, min_cost, max_cost, seed, engine="python"):
+        grid = self.load(m, n, min_cost, max_cost, seed, engine)
+        if grid is not None:
+            self.hits += 1
+            return grid
+
+        self.misses += 1
+        grid = buildCostGrid(m, n, min_cost, max_cost, seed, engine=engine)
+        self.store(grid, seed, engine)
+        return grid
+
+    def load(self, m, n, min_cost, max_cost, seed, engine="python"):
+        # None if the grid is not cached (or the file does not match)
+        path = self.path(m, n, min_cost, max_cost, seed, engine)
+        try:
+            with open(path, "rb") as f:
+                header = HEADER.unpack(f.read(HEADER.size))
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, struct.error):
+            return None
+
+        magic, version, byteorder, typecode, *params = header
+        # checked before the cast, which raises TypeError on a truncated payload
+        if (magic != MAGIC or version != FORMAT_VERSION
+                or byteorder != sys.byteorder[0].encode()
+                or params != [m, n, min_cost, max_cost, seed]
+                or len(data) - HEADER_SIZE != m * n * 4 * _itemsize(typecode)):
+            data.close()
+            return None
+
+        costs = memoryview(data)[HEADER_SIZE:].cast(typecode.decode())
+
+        try:
+            os.utime(path)  # most recently used
+        except OSError:
+            pass            # read-only cache: still a hit, just not refreshed
+        return CostGrid(m, n, min_cost, max_cost, costs)
+
+    def store(self, grid, seed, engine="python"):
+        path = self.path(grid.m, grid.n, grid.min_cost, grid.max_cost, seed, engine)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, sys.byteorder[0].encode(),
+                             grid.typecode.encode(),
+                             grid.m, grid.n, grid.min_cost, grid.max_cost, seed)
+
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            f.write(grid.costs.tobytes())
+        os.replace(tmp, path)
+
+        self.evict()
+
+    def evict(self):
+        # drop least recently used grids until the cache fits in max_bytes
+        files = []
+        for p in self.directory.glob("*.grid"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, p in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+
+    def nbytes(self):
+        return sum(p.stat().st_size for p in self.directory.glob("*.grid"))
@@ -0,0 +1,134 @@
+import time
+import heapq
+from grid import move
+
+# Jump Point Search for the 4-connected grid when every edge costs the same.
+#
+# Shortest 4-connected paths have many symmetric orderings of the same moves.
+# JPS keeps one canonical order, vertical moves before horizontal ones:
+#   - a node reached moving U/D may keep going straight or turn L/R
+#   - a node reached moving L/R may only keep going straight
+# Scans then jump along straight lines and stop only where something
+# interesting happens. This grid has no blocked cells, so there are no forced
+# neighbours: a vertical scan stops in the goal's row (turning there reaches
+# the goal) and a horizontal scan stops only on the goal itself.
+
+VERTICAL = ("U", "D")
+
+
+def jump(state, action, goal, m, n):
+    # next jump point from state in the direction of action, or None
+    (r, c) = state
+    (rg, cg) = goal
+    (r1, c1) = move(state, action)
+    dr, dc = r1 - r, c1 - c
+
+    if action in VERTICAL:
+        # rows r+dr, r+2dr, ... up to the grid edge: stop in the goal's row
+        if (rg - r) * dr > 0:
+            return (rg, c)
+        return None
+
+    # horizontal: only the goal itself is a jump point
+    if rg == r and (cg - c) * dc > 0:
+        return goal
+    return None
+
+
+def directions(action):
+    # canonical successor directions after arriving with action
+    if action is None:
+        return ("U", "D", "L", "R")
+    if action in VERTICAL:
+        return (action, "L", "R")
+    return (action,)
+
+
+def JPS(s0, goal, m, n):
+
+    start_ns = time.perf_counter_ns()
+
+    # a goal outside the grid is never reached by a scan
+    if not (0 <= goal[0] < m and 0 <= goal[1] < n):
+        frontier = []
+    else:
+        # frontier of jump points ordered by steps from s0
+        frontier = [(0, s0)]
+    best_steps = {s0: 0}
+    parent = {s0: (None, None)}     # jump point -> (previous jump point, direction)
+
+    expanded_states = 0
+    generated_nodes = 1     # start node
+    max_frontier_size = 1
+
+    while frontier:
+
+        g, state = heapq.heappop(frontier)
+
+        if state == goal:
+
+            states, actions = ExtractJumpPath(state, parent)
+            runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+
+            return (states,
+                    actions,
+                    {
+                        "expanded_states": expanded_states,
+                        "generated_nodes": generated_nodes,
+                        "max_frontier_size": max_frontier_size,
+                        "runtime_ms": runtime_ms,
+                        "status": "success"
+                    })
+
+        if g > best_steps[state]:
+            continue
+        expanded_states += 1
+
+        for action in directions(parent[state][1]):
+            jump_point = jump(state, action, goal, m, n)
+            if jump_point is None:
+                continue
+
+            new_g = g + abs(jump_point[0] - state[0]) + abs(jump_point[1] - state[1])
+            if jump_point not in best_steps or new_g < best_steps[jump_point]:
+                best_steps[jump_point] = new_g
+                parent[jump_point] = (state, action)
+                heapq.heappush(frontier, (new_g, jump_point))
+                generated_nodes += 1
+
+                if len(frontier) > max_frontier_size:
+                    max_frontier_size = len(frontier)
+
+    runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+    return ([],
+            [],
+            {
+                "expanded_states": expanded_states,
+                "generated_nodes": generated_nodes,
+                "max_frontier_size": max_frontier_size,
+                "runtime_ms": runtime_ms,
+                "status": "failure"
+            })
+
+
+def ExtractJumpPath(state, parent):
+    # expand the straight segments between jump points back into single moves
+    segments = []
+    current = state
+
+    while parent[current][0] is not None:
+        previous, action = parent[current]
+        segments.append((previous, action, current))
+        current = previous
+    segments.reverse()
+
+    states = [current]
+    actions = []
+    for (previous, action, end) in segments:
+        s = previous
+        while s != end:
+            s = move(s, action)
+            states.append(s)
+            actions.append(action)
+
+    return (states, actions)
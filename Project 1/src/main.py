@@ -1,33 +1,17 @@
-import json
 import sys
-from pathlib import Path
-from grid import buildCosts
-from dfs import DFS
-from bfs import BFS
-from ucs import UCS
+import results_io
+from grid_cache import GridCache
+from dfs import DFS, IDDFS
+from bfs import BFS, BFS_bidir
+from ucs import UCS, UCS_bidir
+from jps import JPS
+from profiling import PHASES
 
 RESULTS_FILE = "results.json"
 
-def append_result(result, filename="results.json"):
-    path = Path(filename)
-
-    if path.exists():
-        with open(path, "r") as f:
-            try:
-                data = json.load(f)
-                if "runs" not in data or not isinstance(data["runs"], list):
-                    # migrate old format safely
-                    data = {"runs": []}
-            except json.JSONDecodeError:
-                data = {"runs": []}
-    else:
-        data = {"runs": []}
-
-    data["runs"].append(result)
-
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
-        f.write("\n")
+def append_result(result, filename=RESULTS_FILE):
+    # append one record to the JSON Lines results file (see results_io)
+    results_io.append_result(result, filename)
 
 def path_cost(states, actions, costs):
     total = 0
@@ -35,15 +19,47 @@ def path_cost(states, actions, costs):
         total += costs[(states[i], actions[i])]
     return total
 
-def run_bfs(start, goal, m, n, costs, min_cost, max_cost, seed):
-    # Run BFS
-
-    states, actions, metrics = BFS(start, goal, m, n)    
+def search_options(algorithm, budget=None, profiler=None):
+    # keyword arguments for the search. Budgets ({"max_expansions",
+    # "deadline_ms", "max_frontier"}, see budget.py) and profilers (see
+    # profiling.py) are only supported by bfs, dfs and the single-direction
+    # ucs variants
+    if algorithm not in ("bfs", "dfs", "ucs", "ucs_indexed", "ucs_buckets"):
+        if budget:
+            raise ValueError(f"{algorithm} does not support search budgets")
+        if profiler is not None:
+            raise ValueError(f"{algorithm} does not support profiling")
+    options = dict(budget or {})
+    if profiler is not None:
+        options["profiler"] = profiler
+    return options
+
+
+def add_extras(result, metrics):
+    # a budget cutoff keeps its partial path; say which limit stopped it
+    if metrics["status"] == "cutoff":
+        result["cutoff_reason"] = metrics["cutoff_reason"]
+    # per-phase timings of a profiled search
+    for phase in PHASES:
+        if f"{phase}_ns" in metrics:
+            result[f"{phase}_ns"] = metrics[f"{phase}_ns"]
+
+
+def run_bfs(start, goal, m, n, costs, min_cost, max_cost, seed, bidirectional=False, save=True, budget=None,
+            profiler=None):
+    # Run BFS ("bfs_bidir" when bidirectional)
+
+    algorithm = "bfs_bidir" if bidirectional else "bfs"
+    options = search_options(algorithm, budget, profiler)
+    if bidirectional:
+        states, actions, metrics = BFS_bidir(start, goal, m, n)
+    else:
+        states, actions, metrics = BFS(start, goal, m, n, **options)
     total = path_cost(states, actions, costs) if metrics["status"] == "success" else 0
 
 
     result = {
-        "algorithm": "bfs",
+        "algorithm": algorithm,
         "m": m,
         "n": n,
         "start": list(start),
@@ -60,25 +76,35 @@ def run_bfs(start, goal, m, n, costs, min_cost, max_cost, seed):
         "runtime_ms": metrics["runtime_ms"],
         "status": metrics["status"],
     }
+    add_extras(result, metrics)
 
-    print(result)
+    # save=False only builds the record (the batch runner prints and saves it)
+    if save:
+        print(result)
 
+        # Save to file
+        append_result(result)
 
-    # Save to file
-    append_result(result)
+    return result
 
 
 ## make like run_bfs for other algorithms
 
-def run_dfs(start, goal, m, n, costs, min_cost, max_cost, seed):
-    # Run DFS
+def run_dfs(start, goal, m, n, costs, min_cost, max_cost, seed, iterative=False, save=True, budget=None,
+            profiler=None):
+    # Run DFS ("iddfs" when iterative: iterative deepening, memory linear in depth)
 
-    states, actions, metrics = DFS(start, goal, m, n)    
+    algorithm = "iddfs" if iterative else "dfs"
+    options = search_options(algorithm, budget, profiler)
+    if iterative:
+        states, actions, metrics = IDDFS(start, goal, m, n, track_memory=True)
+    else:
+        states, actions, metrics = DFS(start, goal, m, n, **options)
     total = path_cost(states, actions, costs) if metrics["status"] == "success" else 0
 
 
     result = {
-        "algorithm": "dfs",
+        "algorithm": algorithm,
         "m": m,
         "n": n,
         "start": list(start),
@@ -95,22 +121,41 @@ def run_dfs(start, goal, m, n, costs, min_cost, max_cost, seed):
         "runtime_ms": metrics["runtime_ms"],
         "status": metrics["status"],
     }
+    add_extras(result, metrics)
 
-    print(result)
+    if iterative:
+        for key in ("iterations", "reexpanded_states", "peak_stack_depth", "peak_memory_bytes"):
+            result[key] = metrics[key]
 
-    # Save to file
-    append_result(result)
+    if save:
+        print(result)
+
+        # Save to file
+        append_result(result)
+
+    return result
     
 
-def run_ucs(start, goal, m, n, costs, min_cost, max_cost, seed):
-    # Run UCS
+def run_ucs(start, goal, m, n, costs, min_cost, max_cost, seed, frontier="heapq", bidirectional=False, save=True,
+            budget=None, profiler=None):
+    # Run UCS ("ucs" with the default heapq frontier, "ucs_<frontier>" otherwise,
+    # "ucs_bidir" when bidirectional)
 
-    states, actions, metrics = UCS(start, goal, m, n, costs)    
+    if bidirectional:
+        algorithm = "ucs_bidir"
+    else:
+        algorithm = "ucs" if frontier == "heapq" else "ucs_" + frontier
+    options = search_options(algorithm, budget, profiler)
+
+    if bidirectional:
+        states, actions, metrics = UCS_bidir(start, goal, m, n, costs)
+    else:
+        states, actions, metrics = UCS(start, goal, m, n, costs, frontier=frontier, **options)
     total = path_cost(states, actions, costs) if metrics["status"] == "success" else 0
 
 
     result = {
-        "algorithm": "ucs",
+        "algorithm": algorithm,
         "m": m,
         "n": n,
         "start": list(start),
@@ -127,11 +172,53 @@ def run_ucs(start, goal, m, n, costs, min_cost, max_cost, seed):
         "runtime_ms": metrics["runtime_ms"],
         "status": metrics["status"],
     }
+    add_extras(result, metrics)
 
-    print(result)
+    if save:
+        print(result)
 
-    # Save to file
-    append_result(result)
+        # Save to file
+        append_result(result)
+
+    return result
+
+
+def run_jps(start, goal, m, n, costs, min_cost, max_cost, seed, save=True):
+    # Run JPS (uniform costs only: every move must cost the same)
+
+    if min_cost != max_cost:
+        raise ValueError("jps needs uniform costs (min_cost == max_cost)")
+
+    states, actions, metrics = JPS(start, goal, m, n)
+    total = path_cost(states, actions, costs) if metrics["status"] == "success" else 0
+
+
+    result = {
+        "algorithm": "jps",
+        "m": m,
+        "n": n,
+        "start": list(start),
+        "goal": list(goal),
+        "min_cost": min_cost,
+        "max_cost": max_cost,
+        "seed": seed,
+        "path": [list(s) for s in states],
+        "steps": len(actions),  # exclude initial None action
+        "total_cost": total if metrics["status"] == "success" else None,
+        "expanded_states": metrics["expanded_states"],
+        "generated_nodes": metrics["generated_nodes"],
+        "max_frontier_size": metrics["max_frontier_size"],
+        "runtime_ms": metrics["runtime_ms"],
+        "status": metrics["status"],
+    }
+
+    if save:
+        print(result)
+
+        # Save to file
+        append_result(result)
+
+    return result
 
 
 
@@ -162,7 +249,7 @@ def main():
     
         seed = int(input("Enter random seed: "))
 
-        algorithm = input("Enter algorithm (bfs, dfs, ucs): ").lower()
+        algorithm = input("Enter algorithm (bfs, dfs, ucs, ucs_indexed, ucs_buckets, bfs_bidir, ucs_bidir, jps, iddfs): ").lower()
 
     start = (rs, cs)
     goal = (rg, cg)
@@ -182,8 +269,13 @@ def main():
     if not (0 <= start[0] < m and 0 <= start[1] < n):
         print("Error: start state is outside the grid.")
         return
+
+    if algorithm == "jps" and min_cost != max_cost:
+        print("Error: jps needs uniform costs (min_cost == max_cost).")
+        return
     
-    costs = buildCosts(m, n, min_cost, max_cost, seed)
+    # generated once, then memory-mapped from the on-disk cache
+    costs = GridCache().get(m, n, min_cost, max_cost, seed)
 
     if algorithm == "bfs":
         run_bfs(start, goal, m, n, costs, min_cost, max_cost, seed)
@@ -191,8 +283,20 @@ def main():
         run_dfs(start, goal, m, n, costs, min_cost, max_cost, seed)
     elif algorithm == "ucs":
         run_ucs(start, goal, m, n, costs, min_cost, max_cost, seed)
+    elif algorithm == "ucs_indexed":
+        run_ucs(start, goal, m, n, costs, min_cost, max_cost, seed, frontier="indexed")
+    elif algorithm == "ucs_buckets":
+        run_ucs(start, goal, m, n, costs, min_cost, max_cost, seed, frontier="buckets")
+    elif algorithm == "bfs_bidir":
+        run_bfs(start, goal, m, n, costs, min_cost, max_cost, seed, bidirectional=True)
+    elif algorithm == "ucs_bidir":
+        run_ucs(start, goal, m, n, costs, min_cost, max_cost, seed, bidirectional=True)
+    elif algorithm == "jps":
+        run_jps(start, goal, m, n, costs, min_cost, max_cost, seed)
+    elif algorithm == "iddfs":
+        run_dfs(start, goal, m, n, costs, min_cost, max_cost, seed, iterative=True)
     else:
-        print("Error: algorithm must be bfs, dfs, or ucs")
+        print("Error: algorithm must be bfs, dfs, ucs, ucs_indexed, ucs_buckets, bfs_bidir, ucs_bidir, jps or iddfs")
         return
 
 
@@ -1,13 +1,21 @@
 import json
 import math
+import sys
 from collections import defaultdict
 from pathlib import Path
 
+# results_io lives in src/, one level up from this script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from results_io import read_results
+from profiling import PHASES
+
 RESULTS_FILE = "results.json"
 OUT_JSON = "metrics/metrics_report.json"
 OUT_CSV = "metrics/metrics_report.csv"
 
 METRICS = ["steps", "total_cost", "expanded_states", "max_frontier_size", "runtime_ms"]
+# per-phase timings of profiled runs (see profiling.py); empty when no run was profiled
+METRICS += [f"{phase}_ns" for phase in PHASES]
 
 
 def mean(xs):
@@ -31,16 +39,12 @@ def main():
     if not path.exists():
         raise FileNotFoundError(f"Missing {RESULTS_FILE}")
 
-    data = json.loads(path.read_text())
-    runs = data.get("runs", [])
-    if not isinstance(runs, list):
-        raise ValueError("results.json must contain a top-level {'runs': [...]} list")
-
-    # Group by (m,n,algorithm)
+    # Group by (m,n,algorithm), streaming the runs and keeping only the
+    # fields the report needs (paths can be large)
     groups = defaultdict(list)
-    for r in runs:
+    for r in read_results(path):
         key = (r.get("m"), r.get("n"), r.get("algorithm"))
-        groups[key].append(r)
+        groups[key].append({k: r.get(k) for k in ["status"] + METRICS})
 
     report = {"by_group": [], "notes": {}}
 
@@ -48,7 +52,8 @@ def main():
     for (m, n, alg), rs in sorted(groups.items(), key=lambda x: (x[0][0], x[0][1], x[0][2])):
         # Optional: only include successes in averages (common in reports)
         successes = [r for r in rs if r.get("status") == "success"]
-        failures = [r for r in rs if r.get("status") != "success"]
+        cutoffs = [r for r in rs if r.get("status") == "cutoff"]
+        failures = [r for r in rs if r.get("status") not in ("success", "cutoff")]
 
         row = {
             "m": m,
@@ -57,6 +62,7 @@ def main():
             "num_runs": len(rs),
             "num_success": len(successes),
             "num_failure": len(failures),
+            "num_cutoff": len(cutoffs),
         }
 
         # For each metric, compute stats over successful runs only
@@ -79,7 +85,8 @@ def main():
 
     # Notes to help you explain choices in the report
     report["notes"] = {
-        "aggregation": "Stats computed over successful runs only. Success/failure counts are included per group.",
+        "aggregation": "Stats computed over successful runs only. Success/failure/cutoff counts are included per group; "
+                       "cutoff runs were stopped by a search budget and are neither.",
         "metrics": METRICS,
     }
 
@@ -88,7 +95,7 @@ def main():
     # Also write a flat CSV table (easy to paste into Word/Google Docs)
     # Columns: m,n,algorithm,num_success + metric_mean columns
     csv_lines = []
-    header = ["m", "n", "algorithm", "num_runs", "num_success", "num_failure"] + [f"{m}_mean" for m in METRICS]
+    header = ["m", "n", "algorithm", "num_runs", "num_success", "num_failure", "num_cutoff"] + [f"{m}_mean" for m in METRICS]
     csv_lines.append(",".join(header))
 
     for row in report["by_group"]:
@@ -99,6 +106,7 @@ def main():
             str(row["num_runs"]),
             str(row["num_success"]),
             str(row["num_failure"]),
+            str(row["num_cutoff"]),
         ]
         for metric in METRICS:
             mu = row[metric]["mean"]
@@ -1,4 +1,11 @@
+from array import array
+
+from grid import ACTIONS
+
+
 class Node:
+    __slots__ = ("state", "parent", "action", "g")
+
     def __init__(self, state, parent, action, g):
         self.state = state # (row, column)
         self.parent = parent    # parent Node
@@ -6,20 +13,97 @@ class Node:
         self.g = g          # cost to reach this node from start
 
 
-def ExtractPath(node):
+class NodePool:
+    """
+    Search nodes stored as parallel arrays instead of one Node object each.
+
+    A node is just its index into the pool. cell is the integer state
+    r * n + c, parent is the parent node index (-1 for the start node),
+    action is the index into ACTIONS (-1 for the start node) and g is the
+    cost to reach the node from the start (g_typecode "d" for float costs).
+    """
+
+    __slots__ = ("n", "cell", "parent", "action", "g")
+
+    def __init__(self, n, g_typecode="q"):
+        self.n = n              # grid columns, to turn cell ids back into (r, c)
+        self.cell = array("i")
+        self.parent = array("i")
+        self.action = array("b")
+        self.g = array(g_typecode)
+
+    def add(self, cell, parent, action, g):
+        node = len(self.cell)
+        self.cell.append(cell)
+        self.parent.append(parent)
+        self.action.append(action)
+        self.g.append(g)
+        return node
+
+    def __len__(self):
+        return len(self.cell)
+
+
+def cell_id(state, m, n):
+    # integer encoding of (r, c); -1 for states outside the grid
+    (r, c) = state
+    if 0 <= r < m and 0 <= c < n:
+        return r * n + c
+    return -1
+
+
+def ExtractPath(node, pool=None):
 
     # get the path from end to beginning
     states = []
     actions = []
     current = node
 
-    while current is not None:
-        states.append(current.state)
-        actions.append(current.action)
-        current = current.parent
-    
+    if pool is not None:
+        # node is an index into pool: follow the parent array back to the start
+        n = pool.n
+        cells, parents, node_actions = pool.cell, pool.parent, pool.action
+
+        while current != -1:
+            states.append(divmod(cells[current], n))
+            actions.append(ACTIONS[node_actions[current]] if node_actions[current] >= 0 else None)
+            current = parents[current]
+    else:
+        while current is not None:
+            states.append(current.state)
+            actions.append(current.action)
+            current = current.parent
+
     # reverse the path to get from beginning to end
     states.reverse()
     actions.reverse()
 
     return (states, actions[1:]) # exclude the first action which is None
+
+
+def ExtractBidirPath(meet, fwd_parent, fwd_action, bwd_parent, bwd_action, n):
+    # Join the two halves of a bidirectional search at cell meet.
+    # fwd_parent[c] is the cell before c on the way from the start and
+    # fwd_action[c] the action taken from it; bwd_parent[c] is the cell after
+    # c on the way to the goal and bwd_action[c] the action that reaches it.
+    # Both are -1 at the cell the search half started from.
+    states = []
+    actions = []
+
+    current = meet
+    while current != -1:
+        states.append(divmod(current, n))
+        if fwd_parent[current] != -1:
+            actions.append(ACTIONS[fwd_action[current]])
+        current = fwd_parent[current]
+
+    states.reverse()
+    actions.reverse()
+
+    current = meet
+    while bwd_parent[current] != -1:
+        actions.append(ACTIONS[bwd_action[current]])
+        current = bwd_parent[current]
+        states.append(divmod(current, n))
+
+    return (states, actions)
@@ -0,0 +1,94 @@
+import time
+
+# Opt-in search instrumentation. BFS, DFS and UCS take profiler=None; with a
+# Profiler they time their phases in nanoseconds and call back on every
+# expansion and generated node. Without one nothing is wrapped and the only
+# cost is one "is not None" test per expansion.
+#
+# Phases:
+#   frontier    push / pop / decrease-key on the frontier
+#   successors  the rest of an expansion: goal and explored checks, successor
+#               moves, costs and new nodes (everything after the pop minus the
+#               other phases)
+#   extract     ExtractPath of the returned path
+#   callbacks   on_expand / on_generate, and the profiler's own bookkeeping
+#               after each expansion
+
+PHASES = ("frontier", "successors", "extract", "callbacks")
+
+
+class Profiler:
+    """
+    Per-phase nanosecond counters for one search, plus optional callbacks:
+
+        on_expand(state, g)     a state is expanded
+        on_generate(state, g)   a node is added (the start node included)
+
+    where state is (r, c). counters() gives {"<phase>_ns": total}; searches
+    add it to their metrics dict.
+    """
+
+    def __init__(self, on_expand=None, on_generate=None):
+        self.on_expand = on_expand
+        self.on_generate = on_generate
+        self.ns = dict.fromkeys(PHASES, 0)
+
+        self._mark_ns = 0       # end of the last pop
+        self._mark_other = 0    # sum of the phase counters at that point
+        self._reported = 0      # pool nodes already passed to on_generate
+
+    def timed(self, fn, phase):
+        # fn, adding the time spent in it to phase
+        ns = self.ns
+        clock = time.perf_counter_ns
+
+        def wrapper(*args):
+            t = clock()
+            result = fn(*args)
+            ns[phase] += clock() - t
+            return result
+        return wrapper
+
+    def timed_pop(self, pop):
+        # like timed(pop, "frontier"), and starts the next expansion's clock
+        ns = self.ns
+        clock = time.perf_counter_ns
+
+        def wrapper(*args):
+            t = clock()
+            result = pop(*args)
+            self._mark_ns = end = clock()
+            ns["frontier"] += end - t
+            self._mark_other = sum(ns.values())
+            return result
+        return wrapper
+
+    def expanded(self, pool, node):
+        # call after a node's successors are generated
+        ns = self.ns
+        now = time.perf_counter_ns()
+        ns["successors"] += (now - self._mark_ns) - (sum(ns.values()) - self._mark_other)
+
+        n = pool.n
+        if self.on_expand is not None:
+            self.on_expand(divmod(pool.cell[node], n), pool.g[node])
+        if self.on_generate is not None:
+            cells, g = pool.cell, pool.g
+            for child in range(self._reported, len(pool)):
+                self.on_generate(divmod(cells[child], n), g[child])
+        self._reported = len(pool)
+
+        ns["callbacks"] += time.perf_counter_ns() - now
+
+    def counters(self):
+        return {f"{phase}_ns": total for phase, total in self.ns.items()}
+
+    def finish(self, result):
+        # (states, actions, metrics) with the counters added to metrics
+        result[2].update(self.counters())
+        return result
+
+
+def report(profiler, result):
+    # a search's return value, with the profiler's counters when there is one
+    return result if profiler is None else profiler.finish(result)
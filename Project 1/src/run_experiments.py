@@ -1,47 +1,155 @@
+import argparse
 import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-from grid import buildCosts
-from main import run_bfs, run_dfs, run_ucs
+from grid import buildCostGrid
+from grid_cache import CACHE_DIR, GridCache
+from results_io import ResultsWriter
+from main import run_bfs, run_dfs, run_ucs, run_jps, search_options
+from profiling import Profiler
 
 
-def main():
-    cfg = json.loads(Path("experiment_config.json").read_text())
+# on-disk grid cache of this process (None: always generate)
+grid_cache = None
 
-    results_file = cfg.get("results_file", "results.json")
+
+def use_grid_cache(directory):
+    # also the pool initializer, so every worker shares the same cache dir
+    global grid_cache
+    grid_cache = GridCache(directory) if directory else None
+
+
+@lru_cache(maxsize=4)
+def cost_grid(m, n, min_cost, max_cost, seed):
+    # each process loads a grid once and reuses it for every algorithm on it
+    if grid_cache is not None:
+        return grid_cache.get(m, n, min_cost, max_cost, seed)
+    return buildCostGrid(m, n, min_cost, max_cost, seed)
+
+
+def run_job(job):
+    # Run one (size, seed, algorithm) job and return its record without saving
+    alg, m, n, start, goal, min_cost, max_cost, seed, budget, profile = job
+    costs = cost_grid(m, n, min_cost, max_cost, seed)
+    args = (start, goal, m, n, costs, min_cost, max_cost, seed)
+
+    # a fresh profiler per run, so its counters go into that run's record
+    options = {"budget": budget, "profiler": Profiler() if profile else None}
+
+    if alg == "bfs":
+        return run_bfs(*args, save=False, **options)
+    elif alg == "dfs":
+        return run_dfs(*args, save=False, **options)
+    elif alg == "ucs":
+        return run_ucs(*args, save=False, **options)
+    elif alg == "ucs_indexed":
+        return run_ucs(*args, frontier="indexed", save=False, **options)
+    elif alg == "ucs_buckets":
+        return run_ucs(*args, frontier="buckets", save=False, **options)
+    elif alg == "bfs_bidir":
+        return run_bfs(*args, bidirectional=True, save=False, **options)
+    elif alg == "ucs_bidir":
+        return run_ucs(*args, bidirectional=True, save=False, **options)
+    elif alg == "jps":
+        search_options(alg, **options)  # jps takes neither option
+        return run_jps(*args, save=False)
+    elif alg == "iddfs":
+        return run_dfs(*args, iterative=True, save=False, **options)
+    else:
+        raise ValueError(f"Unknown algorithm: {alg}")
+
+
+def run_jobs(jobs, workers=1, chunksize=1, cache_dir=None):
+    """
+    Yield the record of every job, in job order.
+
+    With workers > 1 the jobs run on a process pool. Jobs on the same grid
+    are next to each other, so a chunk needs one grid and cost_grid() builds
+    it once in the worker that gets it. map() keeps job order, so the results
+    file matches a serial run apart from timings (runtime_ms, and the
+    tracemalloc peak of iddfs).
+
+    Grids come from the on-disk cache in cache_dir (None to always build).
+    """
+    if workers <= 1:
+        use_grid_cache(cache_dir)
+        yield from map(run_job, jobs)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=use_grid_cache,
+                             initargs=(cache_dir,)) as pool:
+        yield from pool.map(run_job, jobs, chunksize=chunksize)
+
+
+def experiment_jobs(cfg):
+    # Every size x seed x algorithm of one experiment, in the serial run order
     min_cost = int(cfg["min_cost"])
     max_cost = int(cfg["max_cost"])
 
     start = tuple(cfg["start"])
-    sizes = cfg["sizes"]
-    seeds = cfg["seeds"]
     algorithms = [a.lower() for a in cfg["algorithms"]]
+    # optional {"max_expansions", "deadline_ms", "max_frontier"} for every run
+    budget = cfg.get("budget")
+    # per-phase timings (see profiling.py) in every record
+    profile = bool(cfg.get("profile", False))
 
-    total_runs = 0
-
-    for m, n in sizes:
+    jobs = []
+    for m, n in cfg["sizes"]:
         m, n = int(m), int(n)
 
         #Goal changes with grid size (bottom-right)
         goal = (m - 1, n - 1)
 
-        for seed in seeds:
-            seed = int(seed)
-            costs = buildCosts(m, n, min_cost, max_cost, seed)
-
+        for seed in cfg["seeds"]:
             for alg in algorithms:
-                if alg == "bfs":
-                    run_bfs(start, goal, m, n, costs, min_cost, max_cost, seed)
-                elif alg == "dfs":
-                    run_dfs(start, goal, m, n, costs, min_cost, max_cost, seed)
-                elif alg == "ucs":
-                    run_ucs(start, goal, m, n, costs, min_cost, max_cost, seed)
-                else:
-                    raise ValueError(f"Unknown algorithm: {alg}")
-
-                total_runs += 1
-
-    print(f"Done. Total runs: {total_runs} (expected 90)")
+                jobs.append((alg, m, n, start, goal, min_cost, max_cost, int(seed), budget, profile))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the experiments in experiment_config.json")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes (1 runs everything in this process)")
+    parser.add_argument("--grid-cache", default=CACHE_DIR, metavar="DIR",
+                        help=f"on-disk cost grid cache (default {CACHE_DIR})")
+    parser.add_argument("--no-grid-cache", action="store_true",
+                        help="always generate cost grids")
+    opts = parser.parse_args()
+
+    cfg = json.loads(Path("experiment_config.json").read_text())
+
+    results_file = cfg.get("results_file", "results.json")
+
+    # the top-level settings are the base experiment; each entry of
+    # "experiments" overrides some of them (e.g. uniform costs for jps)
+    base = {k: v for k, v in cfg.items() if k != "experiments"}
+    experiments = [base] + [{**base, **exp} for exp in cfg.get("experiments", [])]
+
+    jobs = []
+    expected_runs = 0
+
+    for exp in experiments:
+        jobs.extend(experiment_jobs(exp))
+        expected_runs += len(exp["sizes"]) * len(exp["seeds"]) * len(exp["algorithms"])
+
+    # chunks never straddle two grids when their size divides every
+    # experiment's algorithm count
+    chunksize = math.gcd(*(len(exp["algorithms"]) for exp in experiments))
+
+    total_runs = 0
+
+    # one writer in this process; records come back in job order
+    with ResultsWriter(results_file) as writer:
+        cache_dir = None if opts.no_grid_cache else opts.grid_cache
+        for result in run_jobs(jobs, opts.workers, chunksize, cache_dir):
+            print(result)
+            writer.write(result)
+            total_runs += 1
+
+    print(f"Done. Total runs: {total_runs} (expected {expected_runs})")
     print(f"Results appended to: {results_file}")
 
 
@@ -0,0 +1,49 @@
+from functools import lru_cache
+
+# Moves stay inside the grid depending only on which borders a cell touches,
+# so every cell is one of at most 16 kinds (a bit per action). Each kind has
+# one shared tuple of (action_id, cell_delta) pairs, and a cell's successors
+# are cell + cell_delta for every pair in moves[kind[cell]].
+#
+# grid.move convention: U is r+1, D is r-1, L is c-1, R is c+1.
+
+# OPPOSITE[a] undoes action a (U<->D, L<->R): if cell --a--> next_cell, then
+# next_cell --OPPOSITE[a]--> cell, and that reverse edge has its own cost in
+# the directed cost grid.
+OPPOSITE = (1, 0, 3, 2)
+
+
+class SuccessorTable:
+    __slots__ = ("m", "n", "kind", "moves")
+
+    def __init__(self, m, n):
+        self.m = m
+        self.n = n
+
+        deltas = (n, -n, -1, 1)   # U, D, L, R as cell id offsets
+        self.moves = tuple(
+            tuple((a, deltas[a]) for a in range(4) if kind >> a & 1)
+            for kind in range(16)
+        )
+
+        # kind bit a is set when ACTIONS[a] stays in the grid
+        kind = bytearray()
+        for r in range(m):
+            vertical = (1 if r + 1 < m else 0) | (2 if r - 1 >= 0 else 0)
+            if n == 1:
+                kind.append(vertical)
+                continue
+            kind.append(vertical | 8)                        # first column: R only
+            kind.extend(bytes([vertical | 4 | 8]) * (n - 2))   # interior: L and R
+            kind.append(vertical | 4)                        # last column: L only
+        self.kind = kind
+
+    def __getitem__(self, cell):
+        # tuple of (action_id, cell_delta) for the moves legal from cell
+        return self.moves[self.kind[cell]]
+
+
+@lru_cache(maxsize=8)
+def successor_table(m, n):
+    # built once per grid shape and shared by every search on it
+    return SuccessorTable(m, n)
@@ -1,7 +1,7 @@
 # tests/test_bfs.py
 import pytest
 
-from bfs import BFS
+from bfs import BFS, BFS_bidir
 from grid import move
 
 
@@ -141,3 +141,49 @@ def test_bfs_path_has_no_repeated_states():
 
     assert metrics["status"] == "success"
     assert len(states) == len(set(states)), "Solution path repeated a state (cycle)"
+
+
+@pytest.mark.parametrize(
+    "m,n,start,goal",
+    [(6, 6, (0, 0), (5, 5)), (9, 4, (8, 3), (0, 1)), (7, 7, (3, 3), (3, 3)), (1, 8, (0, 7), (0, 0))],
+)
+def test_bfs_bidir_returns_a_shortest_legal_path(m, n, start, goal):
+    states, actions, metrics = BFS_bidir(start, goal, m, n)
+
+    assert_metrics_shape(metrics)
+    assert metrics["status"] == "success"
+    assert_path_starts_ends(states, actions, start, goal, "success")
+    assert_all_states_in_bounds(states, m, n)
+    assert_actions_match_moves(states, actions)
+    assert len(actions) == manhattan(start, goal)
+    assert len(actions) == len(BFS(start, goal, m, n)[1])
+
+
+def test_bfs_bidir_failure_out_of_bounds_goal_returns_empty_and_failure():
+    states, actions, metrics = BFS_bidir((0, 0), (3, 3), 3, 3)
+
+    assert_metrics_shape(metrics)
+    assert metrics["status"] == "failure"
+    assert_path_starts_ends(states, actions, (0, 0), (3, 3), "failure")
+
+
+def test_bfs_max_expansions_cutoff_returns_partial_path():
+    m, n = 8, 8
+    start, goal = (0, 0), (7, 7)
+
+    states, actions, metrics = BFS(start, goal, m, n, max_expansions=10)
+
+    assert metrics["status"] == "cutoff"
+    assert metrics["cutoff_reason"] == "max_expansions"
+    assert metrics["expanded_states"] == 10
+    assert states[0] == start and states[-1] != goal
+    assert len(actions) == len(states) - 1
+    assert_actions_match_moves(states, actions)
+
+
+def test_bfs_budget_large_enough_still_succeeds():
+    states, actions, metrics = BFS((0, 0), (4, 4), 5, 5, max_expansions=1000, max_frontier=1000,
+                                   deadline_ms=60_000)
+
+    assert metrics["status"] == "success"
+    assert_path_starts_ends(states, actions, (0, 0), (4, 4), "success")
@@ -1,7 +1,7 @@
 # tests/test_dfs.py
 import pytest
 
-from dfs import DFS
+from dfs import DFS, IDDFS
 from grid import move
 
 
@@ -133,3 +133,61 @@ def test_dfs_path_has_no_repeated_states():
 
     assert metrics["status"] == "success"
     assert len(states) == len(set(states)), "Solution path repeated a state (cycle)"
+
+
+@pytest.mark.parametrize(
+    "m,n,start,goal",
+    [(6, 6, (0, 0), (5, 5)), (9, 4, (8, 3), (0, 1)), (7, 7, (3, 3), (3, 3)), (1, 8, (0, 7), (0, 0))],
+)
+def test_iddfs_returns_a_shortest_legal_path(m, n, start, goal):
+    states, actions, metrics = IDDFS(start, goal, m, n)
+
+    assert_metrics_shape(metrics)
+    assert metrics["status"] == "success"
+    assert_path_starts_ends(states, actions, start, goal, "success")
+    assert_legal_moves(states, m, n)
+    assert_actions_match(states, actions)
+    assert len(actions) == abs(start[0] - goal[0]) + abs(start[1] - goal[1])
+
+
+def test_iddfs_reports_iterations_and_reexpansions():
+    states, actions, metrics = IDDFS((0, 0), (4, 4), 5, 5)
+
+    assert metrics["iterations"] == len(actions) + 1   # depth limits 0..8
+    assert 0 < metrics["reexpanded_states"] < metrics["expanded_states"]
+    assert metrics["peak_stack_depth"] <= len(states)
+    assert metrics["peak_memory_bytes"] is None
+
+
+def test_iddfs_without_transposition_table_still_finds_the_goal():
+    states, actions, metrics = IDDFS((0, 0), (3, 3), 4, 4, tt_size=0)
+
+    assert metrics["status"] == "success"
+    assert len(actions) == 6
+
+
+def test_iddfs_tracks_peak_memory_when_asked():
+    states, actions, metrics = IDDFS((0, 0), (9, 9), 10, 10, track_memory=True)
+
+    assert metrics["status"] == "success"
+    assert metrics["peak_memory_bytes"] > 0
+
+
+def test_iddfs_failure_out_of_bounds_goal_returns_empty_and_failure():
+    states, actions, metrics = IDDFS((0, 0), (3, 3), 3, 3)
+
+    assert_metrics_shape(metrics)
+    assert_path_starts_ends(states, actions, (0, 0), (3, 3), "failure")
+
+
+def test_dfs_max_frontier_cutoff_returns_partial_path():
+    m, n = 10, 10
+    start, goal = (0, 0), (9, 9)
+
+    states, actions, metrics = DFS(start, goal, m, n, max_frontier=5)
+
+    assert metrics["status"] == "cutoff"
+    assert metrics["cutoff_reason"] == "max_frontier"
+    assert states[0] == start
+    assert_legal_moves(states, m, n)
+    assert_actions_match(states, actions)
@@ -0,0 +1,72 @@
+# tests/test_frontier.py
+import random
+
+import pytest
+
+from frontier import BucketQueue, IndexedHeap
+
+
+def test_indexed_heap_pops_in_priority_order():
+    rng = random.Random(3)
+    prios = {key: (rng.randint(0, 50), key) for key in range(40)}
+
+    heap = IndexedHeap(40)
+    for key, prio in prios.items():
+        heap.push(key, prio)
+
+    popped = [heap.pop() for _ in range(len(prios))]
+    assert popped == sorted((prio, key) for key, prio in prios.items())
+    assert len(heap) == 0
+
+
+def test_indexed_heap_decrease_key_keeps_one_entry_per_key():
+    heap = IndexedHeap(5)
+    heap.push(0, (10, 0))
+    heap.push(1, (5, 1))
+    heap.push(2, (7, 2))
+
+    heap.push_or_decrease(0, (1, 3))
+    assert len(heap) == 3
+    assert heap.pop() == ((1, 3), 0)
+    assert 0 not in heap and 1 in heap
+
+    with pytest.raises(KeyError):
+        heap.push(1, (4, 4))
+    with pytest.raises(ValueError):
+        heap.decrease_key(1, (6, 5))
+
+
+def test_bucket_queue_pops_like_heapq_on_integer_priorities():
+    import heapq
+
+    rng = random.Random(9)
+    heap, buckets = [], BucketQueue(max_step=9)
+    counter = 0
+    current = 0
+    popped_heap, popped_buckets = [], []
+
+    for _ in range(200):
+        for _ in range(rng.randint(0, 3)):
+            entry = (current + rng.randint(0, 9), counter)
+            counter += 1
+            heapq.heappush(heap, entry)
+            buckets.push(entry)
+        if heap:
+            popped_heap.append(heapq.heappop(heap))
+            popped_buckets.append(buckets.pop())
+            current = popped_heap[-1][0]
+
+    assert popped_buckets == popped_heap
+    assert len(buckets) == len(heap)
+
+
+def test_bucket_queue_handles_priorities_outside_its_window():
+    buckets = BucketQueue(max_step=2)
+    buckets.push((5, "a"))
+    buckets.push((20, "b"))     # wider than max_step
+    assert buckets.pop() == (5, "a")
+    buckets.push((3, "c"))      # below the last popped priority
+
+    assert [buckets.pop(), buckets.pop()] == [(3, "c"), (20, "b")]
+    with pytest.raises(IndexError):
+        buckets.pop()
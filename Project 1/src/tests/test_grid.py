@@ -0,0 +1,107 @@
+# tests/test_grid.py
+import random
+
+import pytest
+
+from grid import buildCosts, buildCostGrid, move, ACTIONS, CostGrid, as_cost_grid
+from ucs import UCS, UCS_indexed, UCS_bidir, shortest_path_tree
+from main import path_cost
+
+
+def test_cost_grid_matches_dict_costs_for_same_seed():
+    m, n = 7, 5
+    costs = buildCosts(m, n, 1, 9, 11)
+    grid = buildCostGrid(m, n, 1, 9, 11)
+
+    assert len(grid) == len(costs)
+    for (state, action), cost in costs.items():
+        assert (state, action) in grid
+        assert grid[(state, action)] == cost
+
+
+def test_cost_grid_rejects_edges_that_leave_the_grid():
+    m, n = 3, 3
+    grid = buildCostGrid(m, n, 1, 5, 1)
+
+    for r in range(m):
+        for c in range(n):
+            for a in ACTIONS:
+                (r2, c2) = move((r, c), a)
+                legal = 0 <= r2 < m and 0 <= c2 < n
+                assert ((r, c), a) in grid if legal else ((r, c), a) not in grid
+
+    with pytest.raises(KeyError):
+        grid[((0, 0), "D")]
+
+
+def test_ucs_and_path_cost_accept_cost_grid():
+    m, n = 6, 6
+    start, goal = (0, 0), (5, 5)
+    costs = buildCosts(m, n, 1, 10, 5)
+    grid = buildCostGrid(m, n, 1, 10, 5)
+
+    states_d, actions_d, metrics_d = UCS(start, goal, m, n, costs)
+    states_g, actions_g, metrics_g = UCS(start, goal, m, n, grid)
+
+    assert metrics_g["status"] == "success"
+    assert metrics_g["total_cost"] == metrics_d["total_cost"]
+    assert path_cost(states_g, actions_g, grid) == metrics_g["total_cost"]
+
+
+def test_dict_costs_are_converted_once_and_keep_float_or_negative_values():
+    costs = buildCosts(5, 4, 1, 9, 2)
+    grid = as_cost_grid(costs, 5, 4)
+    assert as_cost_grid(costs, 5, 4) is grid
+    assert as_cost_grid(dict(costs), 5, 4) is not grid
+
+    halves = {key: cost / 2 for key, cost in costs.items()}
+    assert as_cost_grid(halves, 5, 4).typecode == "d"
+    assert UCS((0, 0), (4, 3), 5, 4, halves)[:2] == UCS((0, 0), (4, 3), 5, 4, costs)[:2]
+    for search in (UCS_indexed, UCS_bidir):
+        states, actions, metrics = search((0, 0), (4, 3), 5, 4, halves)
+        assert metrics["total_cost"] == UCS((0, 0), (4, 3), 5, 4, costs)[2]["total_cost"] / 2
+    tree = shortest_path_tree((0, 0), 5, 4, halves)
+    assert path_cost(*tree.extract((4, 3)), halves) == UCS((0, 0), (4, 3), 5, 4, costs)[2]["total_cost"] / 2
+    with pytest.raises(ValueError):
+        UCS((0, 0), (4, 3), 5, 4, halves, frontier="buckets")
+
+    shifted = {key: cost - 5 for key, cost in costs.items()}
+    assert all(CostGrid.from_dict(shifted, 5, 4)[key] == cost for key, cost in shifted.items())
+
+    with pytest.raises(ValueError):
+        CostGrid.from_dict({((0, 0), "R"): "cheap"}, 5, 4)
+
+
+@pytest.mark.parametrize("min_cost, max_cost", [(1, 9), (1, 1), (0, 1000), (-5, 70000)])
+def test_compat_engine_reproduces_python_stream(min_cost, max_cost):
+    pytest.importorskip("numpy")
+    m, n, seed = 13, 11, 3
+
+    costs = buildCosts(m, n, min_cost, max_cost, seed)
+    after_python = random.getstate()
+    compat = buildCosts(m, n, min_cost, max_cost, seed, engine="compat")
+
+    assert compat == costs
+    assert list(compat) == list(costs)          # same key order
+    assert random.getstate() == after_python    # random left where the loop leaves it
+
+    grid = buildCostGrid(m, n, min_cost, max_cost, seed, engine="compat")
+    assert list(grid.costs) == list(buildCostGrid(m, n, min_cost, max_cost, seed).costs)
+
+
+def test_numpy_engine_fills_every_legal_edge_in_range():
+    pytest.importorskip("numpy")
+    m, n = 9, 6
+
+    costs = buildCosts(m, n, 1, 9, 2, engine="numpy")
+    grid = buildCostGrid(m, n, 1, 9, 2, engine="numpy")
+
+    assert list(costs) == list(buildCosts(m, n, 1, 9, 2))
+    assert all(1 <= c <= 9 for c in costs.values())
+    assert all(grid[key] == cost for key, cost in costs.items())
+
+
+def test_unknown_engine_is_rejected():
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        buildCostGrid(3, 3, 1, 9, 1, engine="fortran")
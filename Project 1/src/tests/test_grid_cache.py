@@ -0,0 +1,106 @@
+# tests/test_grid_cache.py
+import os
+
+import pytest
+
+from grid import buildCostGrid, buildCosts
+from grid_cache import GridCache
+from ucs import UCS
+
+
+def test_warm_load_matches_generated_grid(tmp_path):
+    cache = GridCache(tmp_path)
+
+    cold = cache.get(12, 9, 1, 20, 3)
+    warm = cache.get(12, 9, 1, 20, 3)
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert list(warm.costs) == list(buildCostGrid(12, 9, 1, 20, 3).costs) == list(cold.costs)
+
+    costs = buildCosts(12, 9, 1, 20, 3)
+    for key, cost in costs.items():
+        assert warm[key] == cost
+    assert UCS((0, 0), (11, 8), 12, 9, warm)[:2] == UCS((0, 0), (11, 8), 12, 9, costs)[:2]
+
+
+def test_keys_separate_every_generation_parameter(tmp_path):
+    cache = GridCache(tmp_path)
+    params = [(5, 5, 1, 9, 1), (5, 6, 1, 9, 1), (5, 5, 2, 9, 1), (5, 5, 1, 8, 1), (5, 5, 1, 9, 2)]
+
+    for p in params:
+        cache.get(*p)
+
+    assert len(list(tmp_path.glob("*.grid"))) == len(params)
+    for p in params:
+        assert list(cache.get(*p).costs) == list(buildCostGrid(*p).costs)
+    assert cache.hits == len(params)
+
+
+def test_corrupt_file_is_regenerated(tmp_path):
+    cache = GridCache(tmp_path)
+    cache.get(4, 4, 1, 9, 1)
+    cache.path(4, 4, 1, 9, 1).write_bytes(b"junk")
+
+    assert list(cache.get(4, 4, 1, 9, 1).costs) == list(buildCostGrid(4, 4, 1, 9, 1).costs)
+    assert cache.misses == 2
+
+
+def test_eviction_drops_least_recently_used_grids(tmp_path):
+    cache = GridCache(tmp_path)
+    for seed, age in [(1, 300), (2, 200), (3, 100)]:
+        cache.get(20, 20, 1, 9, seed)
+        t = os.path.getmtime(cache.path(20, 20, 1, 9, seed)) - age
+        os.utime(cache.path(20, 20, 1, 9, seed), (t, t))
+
+    one_grid = cache.path(20, 20, 1, 9, 1).stat().st_size
+    cache.load(20, 20, 1, 9, 1)     # a hit makes seed 1 the most recent
+
+    cache.max_bytes = 2 * one_grid
+    cache.evict()
+
+    assert cache.path(20, 20, 1, 9, 1).exists()
+    assert not cache.path(20, 20, 1, 9, 2).exists()
+    assert cache.path(20, 20, 1, 9, 3).exists()
+    assert cache.nbytes() <= cache.max_bytes
+
+
+def test_grid_cache_keeps_numpy_grids_apart(tmp_path):
+    pytest.importorskip("numpy")
+    cache = GridCache(tmp_path)
+
+    legacy = cache.get(8, 8, 1, 9, 1)
+    compat = cache.get(8, 8, 1, 9, 1, engine="compat")
+    fresh = cache.get(8, 8, 1, 9, 1, engine="numpy")
+
+    assert (cache.misses, cache.hits) == (2, 1)     # compat shares the legacy file
+    assert list(compat.costs) == list(legacy.costs)
+    assert list(fresh.costs) == list(buildCostGrid(8, 8, 1, 9, 1, engine="numpy").costs)
+
+
+def test_truncated_file_is_regenerated(tmp_path):
+    cache = GridCache(tmp_path)
+    cache.get(4, 4, 1, 9, 1)
+    path = cache.path(4, 4, 1, 9, 1)
+    path.write_bytes(path.read_bytes()[:-1])
+
+    assert cache.load(4, 4, 1, 9, 1) is None
+    assert list(cache.get(4, 4, 1, 9, 1).costs) == list(buildCostGrid(4, 4, 1, 9, 1).costs)
+    assert cache.misses == 2
+
+
+def test_loaded_grid_can_be_stored_and_read_only_cache_still_hits(tmp_path, monkeypatch):
+    cache = GridCache(tmp_path / "a")
+    cache.get(5, 6, 1, 9, 2)
+    warm = cache.get(5, 6, 1, 9, 2)
+    assert warm.typecode == buildCostGrid(5, 6, 1, 9, 2).typecode
+
+    # a grid loaded from one cache can be stored in another
+    other = GridCache(tmp_path / "b")
+    other.store(warm, 2)
+    assert list(other.load(5, 6, 1, 9, 2).costs) == list(warm.costs)
+
+    def read_only(*args):
+        raise PermissionError("read-only file system")
+    monkeypatch.setattr(os, "utime", read_only)
+    assert list(cache.get(5, 6, 1, 9, 2).costs) == list(warm.costs)
+    assert cache.hits == 2
@@ -0,0 +1,52 @@
+# tests/test_jps.py
+import pytest
+
+from bfs import BFS
+from grid import move
+from jps import JPS
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def assert_legal_path(states, actions, start, goal, m, n):
+    assert states[0] == start
+    assert states[-1] == goal
+    assert len(actions) == len(states) - 1
+    for i, a in enumerate(actions):
+        assert move(states[i], a) == states[i + 1]
+    for (r, c) in states:
+        assert 0 <= r < m and 0 <= c < n
+
+
+@pytest.mark.parametrize(
+    "m,n,start,goal",
+    [(6, 6, (0, 0), (5, 5)), (9, 4, (8, 3), (0, 1)), (7, 7, (3, 3), (3, 3)),
+     (1, 8, (0, 7), (0, 0)), (8, 1, (0, 0), (7, 0)), (5, 9, (4, 0), (4, 6))],
+)
+def test_jps_returns_a_shortest_legal_path(m, n, start, goal):
+    states, actions, metrics = JPS(start, goal, m, n)
+
+    assert metrics["status"] == "success"
+    assert_legal_path(states, actions, start, goal, m, n)
+    assert len(actions) == manhattan(start, goal)
+    assert len(actions) == len(BFS(start, goal, m, n)[1])
+
+
+def test_jps_failure_out_of_bounds_goal_returns_empty_and_failure():
+    states, actions, metrics = JPS((0, 0), (3, 3), 3, 3)
+
+    assert metrics["status"] == "failure"
+    assert states == []
+    assert actions == []
+
+
+def test_jps_expands_far_fewer_states_than_bfs_on_open_grid():
+    m, n = 100, 100
+    start, goal = (0, 0), (m - 1, n - 1)
+
+    bfs_expanded = BFS(start, goal, m, n)[2]["expanded_states"]
+    jps_expanded = JPS(start, goal, m, n)[2]["expanded_states"]
+
+    assert jps_expanded * 10 <= bfs_expanded
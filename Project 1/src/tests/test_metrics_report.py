@@ -0,0 +1,24 @@
+# tests/test_metrics_report.py
+import json
+
+from metrics import metrics_report
+from results_io import append_result
+
+
+def test_cutoff_runs_are_counted_apart_from_successes_and_failures(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "metrics").mkdir()
+
+    base = {"m": 4, "n": 4, "algorithm": "bfs", "steps": 6, "expanded_states": 10,
+            "max_frontier_size": 3, "runtime_ms": 1.0}
+    for status, cost in (("success", 12), ("success", 14), ("failure", None), ("cutoff", None)):
+        append_result(dict(base, status=status, total_cost=cost), metrics_report.RESULTS_FILE)
+
+    metrics_report.main()
+
+    row, = json.loads((tmp_path / metrics_report.OUT_JSON).read_text())["by_group"]
+    assert (row["num_runs"], row["num_success"], row["num_failure"], row["num_cutoff"]) == (4, 2, 1, 1)
+    assert row["total_cost"]["mean"] == 13.0
+
+    header, line = (tmp_path / metrics_report.OUT_CSV).read_text().splitlines()
+    assert dict(zip(header.split(","), line.split(",")))["num_cutoff"] == "1"
@@ -0,0 +1,36 @@
+# tests/test_node.py
+import pytest
+
+from node import ExtractPath, Node, NodePool, cell_id
+
+
+def test_node_pool_extract_path_matches_linked_nodes():
+    n = 4
+    # (0,0) -U-> (1,0) -R-> (1,1) -R-> (1,2)
+    root = Node((0, 0), None, None, 0)
+    a = Node((1, 0), root, "U", 1)
+    b = Node((1, 1), a, "R", 2)
+    c = Node((1, 2), b, "R", 3)
+
+    pool = NodePool(n)
+    p_root = pool.add(cell_id((0, 0), 3, n), -1, -1, 0)
+    p_a = pool.add(cell_id((1, 0), 3, n), p_root, 0, 1)
+    p_b = pool.add(cell_id((1, 1), 3, n), p_a, 3, 2)
+    p_c = pool.add(cell_id((1, 2), 3, n), p_b, 3, 3)
+
+    assert ExtractPath(p_c, pool) == ExtractPath(c)
+    assert ExtractPath(p_c, pool) == ([(0, 0), (1, 0), (1, 1), (1, 2)], ["U", "R", "R"])
+    assert len(pool) == 4
+    assert pool.g[p_c] == 3
+
+
+def test_extract_path_of_start_node_has_no_actions():
+    pool = NodePool(5)
+    start = pool.add(cell_id((2, 2), 5, 5), -1, -1, 0)
+
+    assert ExtractPath(start, pool) == ([(2, 2)], [])
+
+
+@pytest.mark.parametrize("state", [(-1, 0), (0, -1), (3, 0), (0, 5)])
+def test_cell_id_is_negative_outside_the_grid(state):
+    assert cell_id(state, 3, 5) == -1
@@ -0,0 +1,52 @@
+# tests/test_profiling.py
+import pytest
+
+from bfs import BFS
+from dfs import DFS
+from ucs import UCS
+from grid import buildCosts
+from main import run_ucs, run_bfs
+from profiling import PHASES, Profiler
+
+
+SEARCHES = {
+    "bfs": lambda **kw: BFS((0, 0), (7, 7), 8, 8, **kw),
+    "dfs": lambda **kw: DFS((0, 0), (7, 7), 8, 8, **kw),
+    "ucs": lambda **kw: UCS((0, 0), (7, 7), 8, 8, buildCosts(8, 8, 1, 9, 1), **kw),
+    "ucs_indexed": lambda **kw: UCS((0, 0), (7, 7), 8, 8, buildCosts(8, 8, 1, 9, 1), frontier="indexed", **kw),
+    "ucs_buckets": lambda **kw: UCS((0, 0), (7, 7), 8, 8, buildCosts(8, 8, 1, 9, 1), frontier="buckets", **kw),
+}
+
+
+@pytest.mark.parametrize("name", sorted(SEARCHES))
+def test_profiler_counts_phases_and_calls_back_on_every_event(name):
+    expanded, generated = [], []
+    profiler = Profiler(on_expand=lambda state, g: expanded.append(state),
+                        on_generate=lambda state, g: generated.append(state))
+
+    states, actions, metrics = SEARCHES[name](profiler=profiler)
+    plain_states, plain_actions, plain = SEARCHES[name]()
+
+    # same search, plus the counters
+    assert (states, actions) == (plain_states, plain_actions)
+    assert metrics["expanded_states"] == plain["expanded_states"]
+    for phase in PHASES:
+        assert metrics[f"{phase}_ns"] >= 0
+        assert f"{phase}_ns" not in plain
+    assert metrics["frontier_ns"] > 0 and metrics["successors_ns"] > 0 and metrics["extract_ns"] > 0
+
+    assert len(expanded) == metrics["expanded_states"]
+    assert len(generated) == metrics["generated_nodes"]
+    assert generated[0] == (0, 0)
+
+
+def test_profiled_record_has_phase_counters():
+    costs = buildCosts(6, 6, 1, 9, 2)
+    record = run_ucs((0, 0), (5, 5), 6, 6, costs, 1, 9, 2, save=False, profiler=Profiler())
+
+    assert record["status"] == "success"
+    assert all(record[f"{phase}_ns"] >= 0 for phase in PHASES)
+    assert "frontier_ns" not in run_ucs((0, 0), (5, 5), 6, 6, costs, 1, 9, 2, save=False)
+
+    with pytest.raises(ValueError):
+        run_bfs((0, 0), (5, 5), 6, 6, costs, 1, 9, 2, bidirectional=True, save=False, profiler=Profiler())
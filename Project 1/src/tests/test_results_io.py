@@ -0,0 +1,100 @@
+# tests/test_results_io.py
+import json
+
+import pytest
+
+from results_io import ResultsWriter, append_result, migrate, read_results
+
+
+def test_writer_appends_one_json_record_per_line(tmp_path):
+    path = tmp_path / "results.json"
+
+    with ResultsWriter(path, fsync_every=2) as writer:
+        for i in range(5):
+            writer.write({"run": i})
+    append_result({"run": 5}, path)
+
+    lines = path.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [{"run": i} for i in range(6)]
+    assert list(read_results(path)) == [{"run": i} for i in range(6)]
+
+
+def test_reader_accepts_legacy_runs_document(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text(json.dumps({"runs": [{"run": 0}, {"run": 1}]}, indent=2) + "\n")
+
+    assert list(read_results(path)) == [{"run": 0}, {"run": 1}]
+
+
+def test_migrate_rewrites_legacy_file_and_writer_appends_after_it(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text(json.dumps({"runs": [{"run": 0}, {"run": 1}]}, indent=2) + "\n")
+
+    assert migrate(path) == 2
+    assert migrate(path) == 0   # already JSON Lines
+
+    append_result({"run": 2}, path)
+    assert list(read_results(path)) == [{"run": 0}, {"run": 1}, {"run": 2}]
+
+
+def test_writer_migrates_legacy_file_on_open(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text(json.dumps({"runs": [{"run": 0}]}) + "\n")
+
+    append_result({"run": 1}, path)
+
+    assert path.read_text().splitlines() == ['{"run": 0}', '{"run": 1}']
+
+
+def test_reader_skips_torn_last_line_but_rejects_bad_lines(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text('{"run": 0}\n{"run": 1}\n{"ru')
+    assert list(read_results(path)) == [{"run": 0}, {"run": 1}]
+
+    path.write_text('{"run": 0}\nnot json\n{"run": 1}\n')
+    with pytest.raises(ValueError):
+        list(read_results(path))
+
+
+def test_reader_on_empty_file_yields_nothing(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text("")
+
+    assert list(read_results(path)) == []
+
+
+def test_bad_first_line_does_not_make_a_file_legacy(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text('{"ru\n{"run": 0}\n{"run": 1}\n{"run": 2}\n')
+
+    assert migrate(path) == 0
+    append_result({"run": 3}, path)
+
+    lines = path.read_text().splitlines()
+    assert lines[0] == '{"ru' and len(lines) == 5
+
+
+def test_migrate_refuses_to_rewrite_a_broken_legacy_file(tmp_path):
+    path = tmp_path / "results.json"
+    broken = '{\n  "runs": [\n    {"run": 0},\n'
+    path.write_text(broken)
+
+    with pytest.raises(ValueError):
+        migrate(path)
+    with pytest.raises(ValueError):
+        append_result({"run": 1}, path)
+    assert path.read_text() == broken
+
+
+def test_append_after_torn_last_line_keeps_the_file_readable(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text('{"run": 0}\n{"run": 1')
+
+    append_result({"run": 2}, path)
+
+    assert path.read_text() == '{"run": 0}\n{"run": 2}\n'
+    assert list(read_results(path)) == [{"run": 0}, {"run": 2}]
+
+    path.write_text('{"ru')    # nothing but a torn line
+    append_result({"run": 3}, path)
+    assert list(read_results(path)) == [{"run": 3}]
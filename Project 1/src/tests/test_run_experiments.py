@@ -0,0 +1,35 @@
+# tests/test_run_experiments.py
+from run_experiments import experiment_jobs, run_jobs
+
+
+CFG = {
+    "min_cost": 1,
+    "max_cost": 9,
+    "start": [0, 0],
+    "sizes": [[4, 4], [6, 5]],
+    "seeds": [1, 2],
+    "algorithms": ["bfs", "dfs", "ucs"],
+}
+
+
+def without_timing(records):
+    return [{k: v for k, v in r.items() if k != "runtime_ms"} for r in records]
+
+
+def test_jobs_follow_size_seed_algorithm_order():
+    jobs = experiment_jobs(CFG)
+
+    assert len(jobs) == 2 * 2 * 3
+    assert [j[0] for j in jobs[:3]] == ["bfs", "dfs", "ucs"]
+    assert jobs[0][1:3] == (4, 4) and jobs[-1][1:3] == (6, 5)
+    assert jobs[0][4] == (3, 3)
+
+
+def test_parallel_run_matches_serial_run_in_order():
+    jobs = experiment_jobs(CFG)
+
+    serial = list(run_jobs(jobs))
+    parallel = list(run_jobs(jobs, workers=2, chunksize=3))
+
+    assert without_timing(parallel) == without_timing(serial)
+    assert [r["algorithm"] for r in serial] == [j[0] for j in jobs]
@@ -0,0 +1,27 @@
+# tests/test_successors.py
+import pytest
+
+from grid import ACTIONS, move
+from successors import successor_table
+
+
+@pytest.mark.parametrize("m,n", [(1, 1), (1, 4), (4, 1), (2, 2), (5, 7)])
+def test_successor_table_matches_grid_move(m, n):
+    succ = successor_table(m, n)
+
+    for r in range(m):
+        for c in range(n):
+            cell = r * n + c
+            expected = []
+            for action_id, action in enumerate(ACTIONS):
+                (r2, c2) = move((r, c), action)
+                if 0 <= r2 < m and 0 <= c2 < n:
+                    expected.append((action_id, r2 * n + c2))
+
+            got = [(action, cell + delta) for (action, delta) in succ[cell]]
+            assert got == expected
+
+
+def test_successor_table_is_shared_per_grid_shape():
+    assert successor_table(6, 9) is successor_table(6, 9)
+    assert successor_table(6, 9) is not successor_table(9, 6)
@@ -1,7 +1,8 @@
 # tests/test_ucs.py
 import pytest
 
-from ucs import UCS
+from ucs import UCS, UCS_bidir, shortest_path_tree
+from main import run_ucs
 from grid import move, buildCosts
 
 
@@ -165,3 +166,159 @@ def test_ucs_path_has_no_repeated_states():
 
     assert metrics["status"] == "success"
     assert len(states) == len(set(states)), "Solution path repeated a state (cycle)"
+
+
+@pytest.mark.parametrize("seed", [1, 5, 42])
+def test_ucs_indexed_frontier_matches_heapq_cost_with_smaller_frontier(seed):
+    m, n = 12, 9
+    start = (0, 0)
+    goal = (11, 8)
+
+    costs = buildCosts(m, n, 1, 9, seed)
+
+    _, _, lazy = UCS(start, goal, m, n, costs)
+    states, actions, indexed = UCS(start, goal, m, n, costs, frontier="indexed")
+
+    assert indexed["status"] == "success"
+    assert_path_starts_ends(states, actions, start, goal, "success")
+    assert_total_cost_matches(indexed, states, actions, costs)
+    assert indexed["total_cost"] == lazy["total_cost"]
+    assert indexed["max_frontier_size"] <= lazy["max_frontier_size"]
+    assert indexed["generated_nodes"] <= lazy["generated_nodes"]
+
+
+def test_ucs_indexed_frontier_failure_and_unknown_frontier():
+    costs = buildCosts(3, 3, 1, 5, 1)
+
+    states, actions, metrics = UCS((0, 0), (3, 3), 3, 3, costs, frontier="indexed")
+    assert_metrics_shape(metrics)
+    assert metrics["status"] == "failure"
+    assert_path_starts_ends(states, actions, (0, 0), (3, 3), "failure")
+
+    with pytest.raises(ValueError):
+        UCS((0, 0), (2, 2), 3, 3, costs, frontier="fibonacci")
+
+
+@pytest.mark.parametrize("seed", [2, 3, 11])
+def test_ucs_buckets_frontier_matches_heapq_exactly(seed):
+    m, n = 10, 10
+    start = (0, 0)
+    goal = (9, 9)
+
+    costs = buildCosts(m, n, 1, 9, seed)
+
+    states_h, actions_h, heap_metrics = UCS(start, goal, m, n, costs)
+    states_b, actions_b, bucket_metrics = UCS(start, goal, m, n, costs, frontier="buckets")
+
+    # equal-g entries pop in push order in both, so the whole search is identical
+    assert (states_b, actions_b) == (states_h, actions_h)
+    for key in ("expanded_states", "generated_nodes", "max_frontier_size", "status", "total_cost"):
+        assert bucket_metrics[key] == heap_metrics[key]
+
+
+@pytest.mark.parametrize("seed", [1, 7, 99])
+def test_ucs_bidir_matches_ucs_total_cost(seed):
+    m, n = 11, 8
+    for start, goal in [((0, 0), (10, 7)), ((10, 7), (0, 0)), ((5, 2), (5, 6)), ((4, 4), (4, 4))]:
+        costs = buildCosts(m, n, 1, 9, seed)
+
+        _, _, expected = UCS(start, goal, m, n, costs)
+        states, actions, metrics = UCS_bidir(start, goal, m, n, costs)
+
+        assert_metrics_shape(metrics)
+        assert metrics["status"] == "success"
+        assert_path_starts_ends(states, actions, start, goal, "success")
+        assert_legal_moves(states, m, n)
+        assert_actions_match(states, actions)
+        assert_total_cost_matches(metrics, states, actions, costs)
+        assert metrics["total_cost"] == expected["total_cost"]
+
+
+def test_ucs_bidir_failure_out_of_bounds_goal_returns_empty_and_failure():
+    costs = buildCosts(3, 3, 1, 5, 1)
+    states, actions, metrics = UCS_bidir((0, 0), (3, 3), 3, 3, costs)
+
+    assert_metrics_shape(metrics)
+    assert metrics["status"] == "failure"
+    assert_path_starts_ends(states, actions, (0, 0), (3, 3), "failure")
+
+
+def test_shortest_path_tree_matches_ucs_for_every_goal():
+    m, n = 9, 7
+    start = (2, 3)
+    costs = buildCosts(m, n, 1, 9, 4)
+
+    tree = shortest_path_tree(start, m, n, costs)
+    assert tree.metrics["status"] == "success"
+    assert tree.metrics["expanded_states"] == m * n
+
+    for r in range(m):
+        for c in range(n):
+            goal = (r, c)
+            _, _, metrics = UCS(start, goal, m, n, costs)
+            states, actions = tree.extract(goal)
+
+            assert tree.cost(goal) == metrics["total_cost"]
+            assert_path_starts_ends(states, actions, start, goal, "success")
+            assert_actions_match(states, actions)
+            assert recompute_total_cost(states, actions, costs) == metrics["total_cost"]
+
+
+def test_shortest_path_tree_stops_once_goals_are_settled():
+    m, n = 20, 20
+    costs = buildCosts(m, n, 1, 9, 2)
+    goals = [(1, 2), (3, 0)]
+
+    tree = shortest_path_tree((0, 0), m, n, costs, goals=goals)
+
+    assert tree.metrics["status"] == "success"
+    assert tree.metrics["expanded_states"] < m * n
+    assert (m - 1, n - 1) not in tree
+    assert tree.extract((m - 1, n - 1)) == ([], [])
+    for goal in goals:
+        assert tree.cost(goal) == UCS((0, 0), goal, m, n, costs)[2]["total_cost"]
+
+
+def test_shortest_path_tree_reports_unreachable_goals():
+    costs = buildCosts(4, 4, 1, 9, 1)
+
+    tree = shortest_path_tree((0, 0), 4, 4, costs, goals=[(2, 2), (9, 9)])
+    assert tree.metrics["status"] == "failure"
+    assert tree.cost((9, 9)) is None
+    assert tree.cost((2, 2)) is not None
+
+    outside = shortest_path_tree((-1, 0), 4, 4, costs)
+    assert outside.metrics["status"] == "failure"
+    assert outside.extract((0, 0)) == ([], [])
+
+
+@pytest.mark.parametrize("frontier", ["heapq", "indexed", "buckets"])
+def test_ucs_max_expansions_cutoff_returns_partial_path(frontier):
+    m, n = 10, 10
+    start, goal = (0, 0), (9, 9)
+    costs = buildCosts(m, n, 1, 9, 3)
+
+    states, actions, metrics = UCS(start, goal, m, n, costs, frontier=frontier, max_expansions=20)
+
+    assert metrics["status"] == "cutoff"
+    assert metrics["cutoff_reason"] == "max_expansions"
+    assert metrics["expanded_states"] == 20
+    assert states[0] == start and states[-1] != goal
+    assert_legal_moves(states, m, n)
+    assert_actions_match(states, actions)
+
+
+def test_ucs_deadline_cutoff_and_record():
+    m, n = 30, 30
+    costs = buildCosts(m, n, 1, 9, 1)
+
+    result = run_ucs((0, 0), (29, 29), m, n, costs, 1, 9, 1, save=False, budget={"deadline_ms": 0})
+
+    assert result["status"] == "cutoff"
+    assert result["cutoff_reason"] == "deadline_ms"
+    assert result["total_cost"] is None
+    assert result["path"][0] == [0, 0]
+
+    with pytest.raises(ValueError):
+        run_ucs((0, 0), (29, 29), m, n, costs, 1, 9, 1, bidirectional=True, save=False,
+                budget={"max_expansions": 5})
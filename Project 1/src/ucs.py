@@ -1,36 +1,70 @@
 import time
-from grid import move
-from node import ExtractPath, Node
-from collections import deque
+from array import array
+from grid import ACTIONS, as_cost_grid
+from budget import cutoff_result, make_budget
+from profiling import report
+from node import ExtractBidirPath, ExtractPath, NodePool, cell_id
+from successors import OPPOSITE, successor_table
+from frontier import BucketQueue, IndexedHeap
+from functools import partial
 import heapq
-from itertools import count
 
-def Succ(state, m, n):
-    actions = ["U", "D", "L", "R"]
-    successors = []
+# "heapq": push a new entry per relaxation and skip stale ones on pop
+# "indexed": one entry per state, cheaper paths use decrease-key
+# "buckets": like "heapq" but on Dial's buckets, for integer edge costs
+FRONTIERS = ("heapq", "indexed", "buckets")
 
-    for action in actions:
-        next_state = move(state, action)
 
-        # if next state is inside grid: add to successors
-        if 0 <= next_state[0] < m and 0 <= next_state[1] < n:
-            successors.append((action, next_state))
+def UCS(s0, goal, m, n, costs, frontier="heapq", max_expansions=None, deadline_ms=None, max_frontier=None,
+        profiler=None):
+    # Optional budgets (see budget.py) stop the search with status "cutoff";
+    # an optional Profiler (see profiling.py) times its phases
 
-    return successors
-
-def UCS(s0, goal, m, n, costs):
+    if frontier == "indexed":
+        return UCS_indexed(s0, goal, m, n, costs, max_expansions, deadline_ms, max_frontier, profiler)
+    if frontier not in FRONTIERS:
+        raise ValueError("Invalid frontier: {} (expected one of {})".format(frontier, FRONTIERS))
 
     start_ns = time.perf_counter_ns()
-    counter = count()
+    budget = make_budget(start_ns, max_expansions, deadline_ms, max_frontier)
+
+    # edge costs by cell_id * 4 + action_id
+    grid = as_cost_grid(costs, m, n)
+    edge_costs = grid.costs
+
+    # states are integer cell ids, nodes are indices into the pool.
+    # Node indices grow with every push, so they also break ties in the heap.
+    pool = NodePool(n, grid.g_typecode)
+    add_node = pool.add
+    node_cell = pool.cell
+    goal_cell = cell_id(goal, m, n)
+
+    # precomputed successor moves, shared by every search on an m x n grid
+    succ = successor_table(m, n)
+    succ_kind, succ_moves = succ.kind, succ.moves
 
     # 1: frontier ← PriorityQueue(by g )
-    frontier = []
+    if frontier == "buckets":
+        if grid.g_typecode != "q":
+            raise ValueError("frontier 'buckets' needs integer edge costs")
+        # g of any frontier entry is at most max_cost above the last pop
+        frontier = BucketQueue(grid.max_cost)
+        push, pop = frontier.push, frontier.pop
+    else:
+        frontier = []
+        push, pop = partial(heapq.heappush, frontier), partial(heapq.heappop, frontier)
+
+    extract = ExtractPath
+    if profiler is not None:
+        push = profiler.timed(push, "frontier")
+        pop = profiler.timed_pop(pop)
+        extract = profiler.timed(ExtractPath, "extract")
 
     # 2: frontier .push(Node(s0, nil, nil, g = 0))
-    heapq.heappush(frontier, (0, next(counter), Node(s0, None, None, 0)))
+    push((0, add_node(cell_id(s0, m, n), -1, -1, 0)))
 
     # 3: bestCost ← empty map
-    bestCost = {}
+    bestCost = array("d", [float("inf")]) * (m * n)
 
     expanded_states = 0
     generated_nodes = 1     # start node
@@ -40,51 +74,268 @@ def UCS(s0, goal, m, n, costs):
     while frontier:
 
         # 5: n ← frontier .pop()
-        g, tie_breaker, node = heapq.heappop(frontier) # get the node with lowest g
+        g, node = pop() # get the node with lowest g
+        cell = node_cell[node]
 
         # 6: if Goal(n.state) then return ExtractPath(n)
-        if node.state == goal:
+        if cell == goal_cell:
 
-            states, actions = ExtractPath(node)
+            states, actions = extract(node, pool)
             runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
 
-            return (states,
-                    actions,
-                    {
-                        "expanded_states": expanded_states,
-                        "generated_nodes": generated_nodes,
-                        "max_frontier_size": max_frontier_size,
-                        "runtime_ms": runtime_ms,
-                        "status": "success",
-                        "total_cost": node.g
-
-                    })
+            return report(profiler, (states,
+                                     actions,
+                                     {
+                                         "expanded_states": expanded_states,
+                                         "generated_nodes": generated_nodes,
+                                         "max_frontier_size": max_frontier_size,
+                                         "runtime_ms": runtime_ms,
+                                         "status": "success",
+                                         "total_cost": g
+
+                                     }))
         # 7: end if
 
         # 8: if n.state /∈ bestCost or n.g < bestCost[n.state] then
-        if (node.state not in bestCost) or (node.g < bestCost[node.state]):
+        if g < bestCost[cell]:
 
             # 9: bestCost[n.state] ← n.g
-            bestCost[node.state] = node.g
+            bestCost[cell] = g
             expanded_states += 1
 
             # 10: for all (a, s′, cost) ∈ Succ(n.state) do
-            for (action, next_state) in Succ(node.state, m, n):
-                new_g = node.g + costs[(node.state, action)]
-
-                child = Node(next_state, node, action, new_g)
+            for (action, delta) in succ_moves[succ_kind[cell]]:
+                next_cell = cell + delta
+                new_g = g + edge_costs[cell * 4 + action]
 
                 # 11: frontier .push(Node(s′, n, a, g = n.g + cost))
-                heapq.heappush(frontier, (child.g, next(counter), child))
+                push((new_g, add_node(next_cell, node, action, new_g)))
                 generated_nodes += 1
 
                 if len(frontier) > max_frontier_size:
                     max_frontier_size = len(frontier)
             # 12: end for
+
+            if profiler is not None:
+                profiler.expanded(pool, node)
+
+            if budget is not None:
+                reason = budget.exceeded(expanded_states, len(frontier))
+                if reason is not None:
+                    return report(profiler, cutoff_result(pool, goal, reason, start_ns, expanded_states,
+                                                          generated_nodes, max_frontier_size))
         # 13: end if
     # 14: end while
 
     # 15: return failure
+    runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+    return report(profiler, ([],
+                             [],
+                             {
+                                 "expanded_states": expanded_states,
+                                 "generated_nodes": generated_nodes,
+                                 "max_frontier_size": max_frontier_size,
+                                 "runtime_ms": runtime_ms,
+                                 "status": "failure"
+                             }))
+
+
+def UCS_indexed(s0, goal, m, n, costs, max_expansions=None, deadline_ms=None, max_frontier=None,
+                profiler=None):
+    # UCS with an IndexedHeap frontier: each state is pushed once and only
+    # re-prioritized when a strictly cheaper path to it is found.
+
+    start_ns = time.perf_counter_ns()
+    budget = make_budget(start_ns, max_expansions, deadline_ms, max_frontier)
+
+    grid = as_cost_grid(costs, m, n)
+    edge_costs = grid.costs
+
+    pool = NodePool(n, grid.g_typecode)
+    add_node = pool.add
+    goal_cell = cell_id(goal, m, n)
+
+    succ = successor_table(m, n)
+    succ_kind, succ_moves = succ.kind, succ.moves
+
+    # best g found so far per cell
+    bestCost = array("d", [float("inf")]) * (m * n)
+    closed = bytearray(m * n)
+
+    # 1: frontier ← PriorityQueue(by g ), keyed by cell
+    frontier = IndexedHeap(m * n)
+    push_or_decrease, pop, extract = frontier.push_or_decrease, frontier.pop, ExtractPath
+    if profiler is not None:
+        push_or_decrease = profiler.timed(push_or_decrease, "frontier")
+        pop = profiler.timed_pop(pop)
+        extract = profiler.timed(ExtractPath, "extract")
+
+    # 2: frontier .push(Node(s0, nil, nil, g = 0))
+    start_cell = cell_id(s0, m, n)
+    bestCost[start_cell] = 0
+    frontier.push(start_cell, (0, add_node(start_cell, -1, -1, 0)))
+
+    expanded_states = 0
+    generated_nodes = 1     # start node
+    max_frontier_size = len(frontier)
+
+    while frontier:
+
+        (g, node), cell = pop()
+
+        if cell == goal_cell:
+
+            states, actions = extract(node, pool)
+            runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+
+            return report(profiler, (states,
+                                     actions,
+                                     {
+                                         "expanded_states": expanded_states,
+                                         "generated_nodes": generated_nodes,
+                                         "max_frontier_size": max_frontier_size,
+                                         "runtime_ms": runtime_ms,
+                                         "status": "success",
+                                         "total_cost": g
+                                     }))
+
+        # popped g is final: every state leaves the heap exactly once
+        closed[cell] = 1
+        expanded_states += 1
+
+        for (action, delta) in succ_moves[succ_kind[cell]]:
+            next_cell = cell + delta
+            if closed[next_cell]:
+                continue
+
+            new_g = g + edge_costs[cell * 4 + action]
+
+            # only a strictly cheaper path generates a node
+            if new_g < bestCost[next_cell]:
+                bestCost[next_cell] = new_g
+                child = add_node(next_cell, node, action, new_g)
+                push_or_decrease(next_cell, (new_g, child))
+                generated_nodes += 1
+
+        if len(frontier) > max_frontier_size:
+            max_frontier_size = len(frontier)
+
+        if profiler is not None:
+            profiler.expanded(pool, node)
+
+        if budget is not None:
+            reason = budget.exceeded(expanded_states, len(frontier))
+            if reason is not None:
+                return report(profiler, cutoff_result(pool, goal, reason, start_ns, expanded_states,
+                                                      generated_nodes, max_frontier_size))
+
+    runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+    return report(profiler, ([],
+                             [],
+                             {
+                                 "expanded_states": expanded_states,
+                                 "generated_nodes": generated_nodes,
+                                 "max_frontier_size": max_frontier_size,
+                                 "runtime_ms": runtime_ms,
+                                 "status": "failure"
+                             }))
+
+
+def UCS_bidir(s0, goal, m, n, costs):
+    # Bidirectional Dijkstra. The goal side runs over reversed edges: it
+    # relaxes next_cell -> cell with cost edge_costs[next_cell * 4 + OPPOSITE[a]].
+    # mu is the cheapest start-goal path seen where the two searches touch;
+    # once the two frontier minimums add up to mu no cheaper path remains.
+
+    start_ns = time.perf_counter_ns()
+
+    grid = as_cost_grid(costs, m, n)
+    edge_costs = grid.costs
+
+    start_cell = cell_id(s0, m, n)
+    goal_cell = cell_id(goal, m, n)
+
+    succ = successor_table(m, n)
+    succ_kind, succ_moves = succ.kind, succ.moves
+
+    size = m * n
+    unreached = 1 << 62
+    # index 0: search from s0, index 1: search from goal
+    parent = (array("i", [-1]) * size, array("i", [-1]) * size)
+    action = (array("b", [-1]) * size, array("b", [-1]) * size)
+    dist = (array(grid.g_typecode, [unreached]) * size, array(grid.g_typecode, [unreached]) * size)
+    settled = (bytearray(size), bytearray(size))
+    frontiers = ([(0, start_cell)], [])
+
+    expanded_states = 0
+    generated_nodes = 1     # start node
+    max_frontier_size = 1
+    mu = unreached
+    meet = -1
+
+    dist[0][start_cell] = 0
+    if goal_cell != -1:
+        dist[1][goal_cell] = 0
+        frontiers[1].append((0, goal_cell))
+        generated_nodes += 1
+        max_frontier_size = 2
+        if start_cell == goal_cell:
+            mu, meet = 0, start_cell
+
+    while frontiers[0] and frontiers[1]:
+
+        top_f, top_b = frontiers[0][0][0], frontiers[1][0][0]
+        if top_f + top_b >= mu:
+            break
+
+        side = 0 if top_f <= top_b else 1
+        side_parent, side_action, side_dist = parent[side], action[side], dist[side]
+        other_dist = dist[1 - side]
+
+        g, cell = heapq.heappop(frontiers[side])
+        if settled[side][cell]:
+            continue
+        settled[side][cell] = 1
+        expanded_states += 1
+
+        for (a, delta) in succ_moves[succ_kind[cell]]:
+            next_cell = cell + delta
+
+            if side == 0:
+                new_g = g + edge_costs[cell * 4 + a]
+            else:
+                new_g = g + edge_costs[next_cell * 4 + OPPOSITE[a]]
+
+            if new_g < side_dist[next_cell]:
+                side_dist[next_cell] = new_g
+                side_parent[next_cell] = cell
+                side_action[next_cell] = a if side == 0 else OPPOSITE[a]
+                heapq.heappush(frontiers[side], (new_g, next_cell))
+                generated_nodes += 1
+
+                if new_g + other_dist[next_cell] < mu:
+                    mu = new_g + other_dist[next_cell]
+                    meet = next_cell
+
+        if len(frontiers[0]) + len(frontiers[1]) > max_frontier_size:
+            max_frontier_size = len(frontiers[0]) + len(frontiers[1])
+
+    if meet != -1:
+
+        states, actions = ExtractBidirPath(meet, parent[0], action[0], parent[1], action[1], n)
+        runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+
+        return (states,
+                actions,
+                {
+                    "expanded_states": expanded_states,
+                    "generated_nodes": generated_nodes,
+                    "max_frontier_size": max_frontier_size,
+                    "runtime_ms": runtime_ms,
+                    "status": "success",
+                    "total_cost": mu
+                })
+
     runtime_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
     return ([],
             [],
@@ -94,4 +345,138 @@ def UCS(s0, goal, m, n, costs):
                 "max_frontier_size": max_frontier_size,
                 "runtime_ms": runtime_ms,
                 "status": "failure"
-            })
\ No newline at end of file
+            })
+
+
+class ShortestPathTree:
+    """
+    Cheapest paths from one start cell to every cell a Dijkstra run settled.
+
+    For a settled cell (settled[cell] == 1), dist[cell] is the path cost,
+    parent[cell] the cell before it on the path and action[cell] the action
+    id taken from there (-1 at the start). extract(goal) walks the parents
+    back, so each query costs O(path length) instead of a new search.
+    """
+
+    __slots__ = ("m", "n", "source", "dist", "parent", "action", "settled", "metrics")
+
+    UNREACHED = 1 << 62
+
+    def __init__(self, m, n, source, g_typecode="q"):
+        self.m = m
+        self.n = n
+        self.source = source    # start cell id, -1 outside the grid
+        size = m * n
+        self.dist = array(g_typecode, [self.UNREACHED]) * size
+        self.parent = array("i", [-1]) * size
+        self.action = array("b", [-1]) * size
+        self.settled = bytearray(size)
+        self.metrics = None
+
+    def _cell(self, goal):
+        # cell id of a settled goal, -1 if it was not reached
+        cell = cell_id(goal, self.m, self.n)
+        if cell == -1 or not self.settled[cell]:
+            return -1
+        return cell
+
+    def __contains__(self, goal):
+        return self._cell(goal) != -1
+
+    def cost(self, goal):
+        # cheapest path cost to goal, None if it was not reached
+        cell = self._cell(goal)
+        return None if cell == -1 else self.dist[cell]
+
+    def extract(self, goal):
+        # (states, actions) of the cheapest path to goal, ([], []) if not reached
+        cell = self._cell(goal)
+        if cell == -1:
+            return ([], [])
+
+        n, parent, action = self.n, self.parent, self.action
+        states = []
+        actions = []
+        while cell != -1:
+            states.append(divmod(cell, n))
+            if parent[cell] != -1:
+                actions.append(ACTIONS[action[cell]])
+            cell = parent[cell]
+
+        states.reverse()
+        actions.reverse()
+        return (states, actions)
+
+
+def shortest_path_tree(s0, m, n, costs, goals=None):
+    """
+    Dijkstra from s0 over the whole grid, or until every cell in goals is
+    settled when goals are given (a multi-goal UCS). Returns a
+    ShortestPathTree whose extract(goal) gives the same path costs as
+    UCS(s0, goal, ...) for every settled goal. tree.metrics has the usual
+    search metrics; status is "failure" if a requested goal is unreachable.
+    """
+    start_ns = time.perf_counter_ns()
+
+    grid = as_cost_grid(costs, m, n)
+    edge_costs = grid.costs
+
+    succ = successor_table(m, n)
+    succ_kind, succ_moves = succ.kind, succ.moves
+
+    start_cell = cell_id(s0, m, n)
+    tree = ShortestPathTree(m, n, start_cell, grid.g_typecode)
+    dist, parent, action, settled = tree.dist, tree.parent, tree.action, tree.settled
+
+    # goal cells still waiting to be settled (None: settle everything)
+    pending = None
+    if goals is not None:
+        goals = list(goals)
+        pending = {cell_id(g, m, n) for g in goals}
+        pending.discard(-1)
+
+    frontier = []
+    expanded_states = 0
+    generated_nodes = 0
+    max_frontier_size = 0
+
+    if start_cell != -1:
+        dist[start_cell] = 0
+        frontier.append((0, start_cell))
+        generated_nodes = max_frontier_size = 1
+
+    while frontier:
+        if pending is not None and not pending:
+            break
+
+        g, cell = heapq.heappop(frontier)
+        if settled[cell]:
+            continue
+        settled[cell] = 1
+        expanded_states += 1
+        if pending is not None:
+            pending.discard(cell)
+
+        for (a, delta) in succ_moves[succ_kind[cell]]:
+            next_cell = cell + delta
+            new_g = g + edge_costs[cell * 4 + a]
+
+            if new_g < dist[next_cell]:
+                dist[next_cell] = new_g
+                parent[next_cell] = cell
+                action[next_cell] = a
+                heapq.heappush(frontier, (new_g, next_cell))
+                generated_nodes += 1
+
+        if len(frontier) > max_frontier_size:
+            max_frontier_size = len(frontier)
+
+    found = start_cell != -1 and (goals is None or all(g in tree for g in goals))
+    tree.metrics = {
+        "expanded_states": expanded_states,
+        "generated_nodes": generated_nodes,
+        "max_frontier_size": max_frontier_size,
+        "runtime_ms": (time.perf_counter_ns() - start_ns) / 1_000_000,
+        "status": "success" if found else "failure",
+    }
+    return tree
@@ -1,38 +1,122 @@
 import heapq
 import time
+from functools import partial
 
 from .node import Node, ExtractPath
-from .grid import move, in_bounds, ACTIONS
+from .grid import OPPOSITE, in_bounds, neighbor_table
+from .frontier import BucketQueue, IndexedHeap
+from .heuristic import cached_heuristic
+from .budget import closer, cutoff_result, make_budget
+from .profiling import report
+
+# "heapq": push a new entry per relaxation and skip stale ones on pop
+# "indexed": one entry per state, cheaper paths use decrease-key
+# "buckets": like "heapq" but on Dial's buckets, for integer costs and heuristics
+FRONTIERS = ("heapq", "indexed", "buckets")
 
 
 
 # Yield (action, next_state, step_cost) for legal moves only.
 def successors(state, m, n, costs):
-    for a in ACTIONS:
-        s2 = move(state, a)
-        if in_bounds(s2, m, n) and (state, a) in costs:
-            yield a, s2, costs[(state, a)]
+    # a state outside the grid has no successors
+    for a, s2, key in neighbor_table(m, n).get(state, ()):
+        if key in costs:
+            yield a, s2, costs[key]
+
+
+def astar(m, n, start, goal, costs, heuristic_fn, frontier="heapq", weight=1.0, beam_width=None,
+          h_cache=None, consistent=False, max_expansions=None, deadline_ms=None, max_frontier=None,
+          profiler=None):
+    """
+    A* ordered by f = g + weight * h. With an admissible heuristic the path
+    costs at most weight times the optimum (weighted A*; weight 1 is plain A*).
+
+    beam_width keeps only the beam_width best frontier entries after every
+    expansion. That bounds memory but can lose the optimal path or every
+    path, so its suboptimality_bound is None.
+
+    The result has suboptimality_bound and time_to_first_solution_ms
+    (the runtime, as the first path found is the one returned).
+
+    h_cache ("memo" or "table", see heuristic.H_CACHES) caches heuristic
+    values for this search; the default None calls heuristic_fn every time.
+
+    expanded_states counts states actually expanded (stale duplicates popped
+    from the frontier are skipped, not counted); reopened counts expansions
+    of a state that was already expanded with a higher g, which only an
+    inconsistent heuristic causes. consistent=True promises a consistent
+    heuristic (manhattan, euclidean, manhattan_scaled, axis_min and alt all
+    are): a state is closed for good when it is first expanded, closed
+    states are never pushed again and a state is only pushed when its g
+    improves, so the frontier holds far fewer duplicates.
 
+    max_expansions, deadline_ms and max_frontier (see budget.py) stop the
+    search with status "cutoff" once one is exceeded; the result then holds
+    the path to the expanded state with the lowest h and total_cost None.
 
-def astar(m, n, start, goal, costs, heuristic_fn):
+    profiler (see profiling.py) adds per-phase nanosecond counters to the
+    result and calls its on_expand / on_generate callbacks.
+    """
+    if weight < 1:
+        raise ValueError("weight must be >= 1")
+    if beam_width is not None and beam_width < 1:
+        raise ValueError("beam_width must be >= 1")
+    if frontier == "indexed":
+        if weight != 1 or beam_width is not None:
+            raise ValueError("weight and beam_width need frontier='heapq'")
+        return astar_indexed(m, n, start, goal, costs, heuristic_fn, h_cache=h_cache,
+                             max_expansions=max_expansions, deadline_ms=deadline_ms,
+                             max_frontier=max_frontier, profiler=profiler)
+    if frontier not in FRONTIERS:
+        raise ValueError(f"Unknown frontier: {frontier} (expected one of {FRONTIERS})")
 
     t0 = time.perf_counter()
+    budget = make_budget(t0, max_expansions, deadline_ms, max_frontier)
+    best = None     # expanded node closest to the goal, for a cutoff
+
+    heuristic_fn = cached_heuristic(heuristic_fn, h_cache, m, n, goal)
+    extract = ExtractPath
+    if profiler is not None:
+        heuristic_fn = profiler.timed(heuristic_fn, "heuristic")
+        extract = profiler.timed(ExtractPath, "extract")
+    bound = None if beam_width is not None else weight
+    h0 = heuristic_fn(start, goal)
+    if weight != 1:
+        h0 *= weight
 
     # 1: frontier ← PriorityQueue(by f)
-    frontier = []
+    if frontier == "buckets":
+        if weight != 1 or beam_width is not None:
+            raise ValueError("weight and beam_width need frontier='heapq'")
+        if not isinstance(h0, int):
+            raise ValueError("frontier='buckets' needs integer costs and an integer heuristic")
+        # with a consistent heuristic, f grows by at most cost + 1 per step
+        frontier = BucketQueue(max(costs.values(), default=0) + 1)
+        push, pop = frontier.push, frontier.pop
+    else:
+        frontier = []
+        push, pop = partial(heapq.heappush, frontier), partial(heapq.heappop, frontier)
+    if profiler is not None:
+        push, pop = profiler.timed_push(push), profiler.timed_pop(pop)
     tie = 0
 
     # 2: frontier.push(Node(s0, nil, nil, g = 0))
-    h0 = heuristic_fn(start, goal)
     start_node = Node(state=start, parent=None, action=None, g=0, h=h0, tie=tie)
-    heapq.heappush(frontier, (start_node.f, start_node.tie, start_node))
+    push((start_node.f, start_node.tie, start_node))
     tie += 1
 
     # 3: bestCost ← empty map
+    # (g each state was expanded with; with consistent=True the cheapest g
+    # pushed so far, and closed marks expanded cells)
     bestCost = {}
+    closed = bytearray(m * n) if consistent else None
+
+    # precomputed legal moves, shared by every search on an m x n grid
+    neighbors = neighbor_table(m, n)
 
     # Metrics tracking
     expanded_states = 0
+    reopened = 0
     generated_nodes = 1
     max_frontier_size = 1
 
@@ -43,57 +127,346 @@ def astar(m, n, start, goal, costs, heuristic_fn):
             max_frontier_size = len(frontier)
 
         # 5: n ← frontier.pop()
-        _, _, node = heapq.heappop(frontier)
+        _, _, node = pop()
 
         # 6: if Goal(n.state) then return ExtractPath(n)
         if node.state == goal:
-            states, actions = ExtractPath(node)
+            states, actions = extract(node)
             runtime_ms = (time.perf_counter() - t0) * 1000.0
-            return {
+            return report(profiler, {
                 "status": "success",
                 "states": states,
                 "actions": actions,
                 "steps": len(actions),
                 "total_cost": node.g,
                 "expanded_states": expanded_states,
+                "reopened": reopened,
                 "generated_nodes": generated_nodes,
                 "max_frontier_size": max_frontier_size,
                 "runtime_ms": runtime_ms,
-            }
+                "suboptimality_bound": bound,
+                "time_to_first_solution_ms": runtime_ms,
+            })
 
-        expanded_states += 1
+        if consistent:
+            # the first pop of a state has its final g; later pops are stale
+            r, c = node.state
+            if closed[r * n + c]:
+                continue
+            closed[r * n + c] = 1
+            expand = True
+        else:
+            # 8: if n.state ∉ bestCost or n.g < bestCost[n.state] then
+            expand = (node.state not in bestCost) or (node.g < bestCost[node.state])
+            if expand:
+                if node.state in bestCost:
+                    reopened += 1
 
-        # 8: if n.state ∉ bestCost or n.g < bestCost[n.state] then
-        if (node.state not in bestCost) or (node.g < bestCost[node.state]):
+                # 9: bestCost[n.state] ← n.g
+                bestCost[node.state] = node.g
 
-            # 9: bestCost[n.state] ← n.g
-            bestCost[node.state] = node.g
+        if expand:
+            expanded_states += 1
 
             # 10: for all (a, s′, cost) ∈ Succ(n.state) do
-            for a, s2, step_cost in successors(node.state, m, n, costs):
+            for a, s2, key in neighbors[node.state]:
+                if key not in costs:
+                    continue
 
                 # 11: g′ ← n.g + cost
-                g2 = node.g + step_cost
+                g2 = node.g + costs[key]
+
+                if consistent:
+                    # closed states are final; only push strictly cheaper paths
+                    r2, c2 = s2
+                    if closed[r2 * n + c2] or (s2 in bestCost and g2 >= bestCost[s2]):
+                        continue
+                    bestCost[s2] = g2
 
                 # 12: frontier.push(Node(s′, n, a, g = g′))
                 h2 = heuristic_fn(s2, goal)
+                if weight != 1:
+                    h2 *= weight
                 child = Node(state=s2, parent=node, action=a, g=g2, h=h2, tie=tie)
-                heapq.heappush(frontier, (child.f, child.tie, child))
+                push((child.f, child.tie, child))
                 tie += 1
                 generated_nodes += 1
 
+            if beam_width is not None and len(frontier) > beam_width:
+                # a sorted list is a valid heap
+                frontier[:] = heapq.nsmallest(beam_width, frontier)
+
+            if profiler is not None:
+                profiler.expanded(node)
+
+            if budget is not None:
+                if closer(node, best):
+                    best = node
+                reason = budget.exceeded(expanded_states, len(frontier))
+                if reason is not None:
+                    return report(profiler, cutoff_result(best, reason, t0, expanded_states, reopened,
+                                                          generated_nodes, max(max_frontier_size, len(frontier))))
+
         # 14: end if
     # 15: end while
 
     # 16: return failure
     runtime_ms = (time.perf_counter() - t0) * 1000.0
-    return {
+    return report(profiler, {
+        "status": "failure",
+        "states": [],
+        "actions": [],
+        "steps": 0,
+        "total_cost": None,
+        "expanded_states": expanded_states,
+        "reopened": reopened,
+        "generated_nodes": generated_nodes,
+        "max_frontier_size": max_frontier_size,
+        "runtime_ms": runtime_ms,
+        "suboptimality_bound": bound,
+        "time_to_first_solution_ms": None,
+    })
+
+
+def astar_indexed(m, n, start, goal, costs, heuristic_fn, h_cache=None, max_expansions=None,
+                  deadline_ms=None, max_frontier=None, profiler=None):
+    """
+    A* with an IndexedHeap frontier: every state has at most one frontier
+    entry, and a cheaper path to it lowers that entry's f via decrease-key.
+    A closed state is reopened if a cheaper path shows up later, so results
+    stay optimal for inconsistent heuristics too.
+    """
+    t0 = time.perf_counter()
+    budget = make_budget(t0, max_expansions, deadline_ms, max_frontier)
+    best = None
+
+    heuristic_fn = cached_heuristic(heuristic_fn, h_cache, m, n, goal)
+    extract = ExtractPath
+    if profiler is not None:
+        heuristic_fn = profiler.timed(heuristic_fn, "heuristic")
+        extract = profiler.timed(ExtractPath, "extract")
+
+    neighbors = neighbor_table(m, n)
+
+    frontier = IndexedHeap()
+    push, push_or_decrease, pop = frontier.push, frontier.push_or_decrease, frontier.pop
+    if profiler is not None:
+        push, push_or_decrease = profiler.timed_push(push), profiler.timed_push(push_or_decrease)
+        pop = profiler.timed_pop(pop)
+    tie = 0
+
+    start_node = Node(state=start, parent=None, action=None, g=0, h=heuristic_fn(start, goal), tie=tie)
+    push(start, (start_node.f, start_node.tie, start_node))
+    tie += 1
+
+    bestCost = {start: 0}
+    closed = set()
+
+    expanded_states = 0
+    reopened = 0
+    generated_nodes = 1
+    max_frontier_size = 1
+
+    while frontier:
+
+        if len(frontier) > max_frontier_size:
+            max_frontier_size = len(frontier)
+
+        (_, _, node), _ = pop()
+
+        if node.state == goal:
+            states, actions = extract(node)
+            runtime_ms = (time.perf_counter() - t0) * 1000.0
+            return report(profiler, {
+                "status": "success",
+                "states": states,
+                "actions": actions,
+                "steps": len(actions),
+                "total_cost": node.g,
+                "expanded_states": expanded_states,
+                "reopened": reopened,
+                "generated_nodes": generated_nodes,
+                "max_frontier_size": max_frontier_size,
+                "runtime_ms": runtime_ms,
+            })
+
+        closed.add(node.state)
+        expanded_states += 1
+
+        for a, s2, key in neighbors[node.state]:
+            if key not in costs:
+                continue
+
+            g2 = node.g + costs[key]
+
+            # only a strictly cheaper path generates a node
+            if s2 in bestCost and g2 >= bestCost[s2]:
+                continue
+
+            bestCost[s2] = g2
+            if s2 in closed:
+                # a cheaper path to an expanded state: it will be expanded again
+                closed.discard(s2)
+                reopened += 1
+
+            child = Node(state=s2, parent=node, action=a, g=g2, h=heuristic_fn(s2, goal), tie=tie)
+            push_or_decrease(s2, (child.f, child.tie, child))
+            tie += 1
+            generated_nodes += 1
+
+        if profiler is not None:
+            profiler.expanded(node)
+
+        if budget is not None:
+            if closer(node, best):
+                best = node
+            reason = budget.exceeded(expanded_states, len(frontier))
+            if reason is not None:
+                return report(profiler, cutoff_result(best, reason, t0, expanded_states, reopened,
+                                                      generated_nodes, max(max_frontier_size, len(frontier))))
+
+    runtime_ms = (time.perf_counter() - t0) * 1000.0
+    return report(profiler, {
         "status": "failure",
         "states": [],
         "actions": [],
         "steps": 0,
         "total_cost": None,
         "expanded_states": expanded_states,
+        "reopened": reopened,
+        "generated_nodes": generated_nodes,
+        "max_frontier_size": max_frontier_size,
+        "runtime_ms": runtime_ms,
+    })
+
+
+def astar_bidir(m, n, start, goal, costs, heuristic_fn):
+    """
+    Bidirectional A* with average potentials (Ikeda et al.):
+    p(s) = (h(s, goal) - h(start, s)) / 2 orders the forward search and -p(s)
+    the backward one, which walks reversed edges (costs[(s2, OPPOSITE[a])]).
+    Both are consistent when heuristic_fn is, so the searches can stop once
+    the two frontier minimums add up to mu, the best path found so far.
+    heuristic_fn(start, s) must bound the cost from start to s, which holds
+    for the symmetric manhattan/euclidean heuristics. A heuristic with a
+    from_source(start) method (Landmarks) supplies that bound itself, so its
+    per-goal tables are not rebuilt between the two terms.
+    """
+    t0 = time.perf_counter()
+
+    neighbors = neighbor_table(m, n)
+
+    from_source = getattr(heuristic_fn, "from_source", None)
+    h_start = from_source(start) if from_source is not None else (lambda state: heuristic_fn(start, state))
+
+    def potential(state):
+        return (heuristic_fn(state, goal) - h_start(state)) / 2
+
+    # index 0: search from start, index 1: search from goal
+    frontiers = ([], [])
+    dist = ({start: 0}, {goal: 0})
+    parent = ({start: None}, {goal: None})     # state -> (previous state, action)
+    closed = (set(), set())
+    tie = 0
+
+    heapq.heappush(frontiers[0], (potential(start), tie, start))
+    tie += 1
+    generated_nodes = 1
+
+    # a goal outside the grid is unreachable: leave the backward side empty
+    if in_bounds(goal, m, n):
+        heapq.heappush(frontiers[1], (-potential(goal), tie, goal))
+        tie += 1
+        generated_nodes += 1
+
+    expanded_states = 0
+    max_frontier_size = generated_nodes
+
+    mu = float("inf")
+    meet = None
+    if start == goal:
+        mu, meet = 0, start
+
+    while frontiers[0] and frontiers[1]:
+
+        if len(frontiers[0]) + len(frontiers[1]) > max_frontier_size:
+            max_frontier_size = len(frontiers[0]) + len(frontiers[1])
+
+        if frontiers[0][0][0] + frontiers[1][0][0] >= mu:
+            break
+
+        side = 0 if frontiers[0][0][0] <= frontiers[1][0][0] else 1
+        sign = 1 if side == 0 else -1
+        side_dist, side_parent, other_dist = dist[side], parent[side], dist[1 - side]
+
+        _, _, state = heapq.heappop(frontiers[side])
+        if state in closed[side]:
+            continue
+        closed[side].add(state)
+        expanded_states += 1
+
+        g = side_dist[state]
+        for a, s2, key in neighbors[state]:
+            if side == 1:
+                # backward: the edge actually used is s2 -> state
+                a = OPPOSITE[a]
+                key = (s2, a)
+            if key not in costs:
+                continue
+
+            g2 = g + costs[key]
+            if s2 in side_dist and g2 >= side_dist[s2]:
+                continue
+
+            side_dist[s2] = g2
+            side_parent[s2] = (state, a)
+            heapq.heappush(frontiers[side], (g2 + sign * potential(s2), tie, s2))
+            tie += 1
+            generated_nodes += 1
+
+            if s2 in other_dist and g2 + other_dist[s2] < mu:
+                mu = g2 + other_dist[s2]
+                meet = s2
+
+    if meet is None:
+        runtime_ms = (time.perf_counter() - t0) * 1000.0
+        return {
+            "status": "failure",
+            "states": [],
+            "actions": [],
+            "steps": 0,
+            "total_cost": None,
+            "expanded_states": expanded_states,
+            "generated_nodes": generated_nodes,
+            "max_frontier_size": max_frontier_size,
+            "runtime_ms": runtime_ms,
+        }
+
+    # start .. meet from the forward parents, meet .. goal from the backward ones
+    states, actions = [meet], []
+    cur = meet
+    while parent[0][cur] is not None:
+        cur, a = parent[0][cur]
+        states.append(cur)
+        actions.append(a)
+    states.reverse()
+    actions.reverse()
+
+    cur = meet
+    while parent[1][cur] is not None:
+        nxt, a = parent[1][cur]
+        actions.append(a)
+        states.append(nxt)
+        cur = nxt
+
+    runtime_ms = (time.perf_counter() - t0) * 1000.0
+    return {
+        "status": "success",
+        "states": states,
+        "actions": actions,
+        "steps": len(actions),
+        "total_cost": mu,
+        "expanded_states": expanded_states,
         "generated_nodes": generated_nodes,
         "max_frontier_size": max_frontier_size,
         "runtime_ms": runtime_ms,
@@ -0,0 +1,199 @@
+import heapq
+import time
+
+from .grid import neighbor_table
+from .heuristic import manhattan
+
+# ARA* defaults: first search with f = g + 3h, then lower the weight by 0.5
+INITIAL_WEIGHT = 3.0
+WEIGHT_STEP = 0.5
+
+
+def ara_star(m, n, start, goal, costs, heuristic_fn=manhattan, weight=INITIAL_WEIGHT,
+             weight_step=WEIGHT_STEP, time_budget_ms=None, admissible=True):
+    """
+    Anytime Repairing A* (Likhachev et al.). A weighted A* search with
+    f = g + weight * h finds a first path fast; the weight is then lowered by
+    weight_step and the search repaired, reusing the g values found so far,
+    until weight reaches 1 or time_budget_ms (None: no limit) runs out.
+
+    States whose g drops after they were expanded go to an INCONS list
+    instead of being reopened, and rejoin the open list for the next weight.
+    After each search the path is within
+        bound = min(weight, g(goal) / min(g + h over OPEN and INCONS))
+    of the optimum (1 means optimal). The bound needs an admissible
+    heuristic; with admissible=False (e.g. manhattan when steps can cost 0)
+    it is None and the search runs down to weight 1.
+
+    Returns the same dict as astar() for the best path found, where
+    suboptimality_bound is the bound of that path and solutions lists every
+    improvement as {"total_cost", "suboptimality_bound", "weight",
+    "time_ms", "expanded_states"}.
+    """
+    if weight < 1:
+        raise ValueError("weight must be >= 1")
+    if weight_step <= 0:
+        raise ValueError("weight_step must be > 0")
+
+    t0 = time.perf_counter()
+    deadline = None if time_budget_ms is None else t0 + time_budget_ms / 1000.0
+
+    neighbors = neighbor_table(m, n)
+
+    g = {start: 0}
+    parent = {start: None}       # state -> (previous state, action)
+    h = {start: heuristic_fn(start, goal)}
+
+    open_heap = []
+    in_open = set()
+    closed = set()
+    incons = set()
+    tie = 0
+
+    def key(state, w):
+        return g[state] + w * h[state]
+
+    def push(state, w):
+        nonlocal tie
+        heapq.heappush(open_heap, (key(state, w), tie, state))
+        tie += 1
+        in_open.add(state)
+
+    push(start, weight)
+
+    expanded_states = 0
+    generated_nodes = 1
+    max_frontier_size = 1
+    solutions = []
+
+    def improve_path(w):
+        # weighted A* until nothing in OPEN can beat g(goal); False on timeout
+        nonlocal expanded_states, generated_nodes, max_frontier_size
+
+        while open_heap:
+            f, _, state = open_heap[0]
+            if state not in in_open or f != key(state, w):
+                heapq.heappop(open_heap)    # stale entry
+                continue
+            if g.get(goal, float("inf")) <= f:
+                return True
+            if deadline is not None and time.perf_counter() > deadline:
+                return False
+
+            heapq.heappop(open_heap)
+            in_open.discard(state)
+            closed.add(state)
+            expanded_states += 1
+
+            gs = g[state]
+            for a, s2, edge in neighbors[state]:
+                if edge not in costs:
+                    continue
+
+                g2 = gs + costs[edge]
+                if s2 in g and g2 >= g[s2]:
+                    continue
+
+                g[s2] = g2
+                parent[s2] = (state, a)
+                if s2 not in h:
+                    h[s2] = heuristic_fn(s2, goal)
+                generated_nodes += 1
+
+                if s2 in closed:
+                    incons.add(s2)
+                else:
+                    push(s2, w)
+
+            if len(in_open) > max_frontier_size:
+                max_frontier_size = len(in_open)
+        return True
+
+    def bound(w):
+        # how far g(goal) can be from the optimum, given OPEN and INCONS
+        if not admissible:
+            return None
+        lower = min((g[s] + h[s] for s in in_open | incons), default=None)
+        if lower is None or lower >= g[goal]:
+            return 1.0
+        return min(w, g[goal] / lower) if lower > 0 else w
+
+    while True:
+        out_of_time = not improve_path(weight)
+        # an interrupted search only has the OPEN/INCONS part of the bound
+        w = float("inf") if out_of_time else weight
+
+        if goal in g and (not solutions or g[goal] < solutions[-1]["total_cost"]):
+            solutions.append({
+                "total_cost": g[goal],
+                "suboptimality_bound": bound(w),
+                "weight": weight,
+                "time_ms": (time.perf_counter() - t0) * 1000.0,
+                "expanded_states": expanded_states,
+            })
+        elif solutions and admissible:
+            # same path, tighter proof
+            solutions[-1]["suboptimality_bound"] = min(solutions[-1]["suboptimality_bound"], bound(w))
+
+        proven = admissible and solutions and solutions[-1]["suboptimality_bound"] <= 1
+        if out_of_time or not solutions or proven or weight <= 1:
+            break
+
+        # lower the weight and repair: OPEN gets INCONS, keys are recomputed
+        weight = max(1.0, weight - weight_step)
+        states = in_open | incons
+        open_heap.clear()
+        in_open.clear()
+        incons.clear()
+        closed.clear()
+        for state in states:
+            push(state, weight)
+
+    runtime_ms = (time.perf_counter() - t0) * 1000.0
+
+    if not solutions:
+        return {
+            "status": "failure",
+            "states": [],
+            "actions": [],
+            "steps": 0,
+            "total_cost": None,
+            "expanded_states": expanded_states,
+            "generated_nodes": generated_nodes,
+            "max_frontier_size": max_frontier_size,
+            "runtime_ms": runtime_ms,
+            "suboptimality_bound": None,
+            "time_to_first_solution_ms": None,
+            "solutions": [],
+        }
+
+    states, actions = [goal], []
+    cur = goal
+    while parent[cur] is not None:
+        cur, a = parent[cur]
+        states.append(cur)
+        actions.append(a)
+    states.reverse()
+    actions.reverse()
+
+    # parents can have improved after g(goal) was set, so the path costs at
+    # most g(goal); report what it actually costs, in the last solution too
+    # (its bound still holds for the cheaper path)
+    total_cost = sum(costs[(s, a)] for s, a in zip(states, actions))
+    if total_cost < solutions[-1]["total_cost"]:
+        solutions[-1]["total_cost"] = total_cost
+
+    return {
+        "status": "success",
+        "states": states,
+        "actions": actions,
+        "steps": len(actions),
+        "total_cost": total_cost,
+        "expanded_states": expanded_states,
+        "generated_nodes": generated_nodes,
+        "max_frontier_size": max_frontier_size,
+        "runtime_ms": runtime_ms,
+        "suboptimality_bound": solutions[-1]["suboptimality_bound"],
+        "time_to_first_solution_ms": solutions[0]["time_ms"],
+        "solutions": solutions,
+    }
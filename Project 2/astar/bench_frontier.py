@@ -0,0 +1,45 @@
+# astar/bench_frontier.py
+# Run: python -m astar.bench_frontier
+#
+# A* (Manhattan) with each frontier on the same cost grids: "heapq" (lazy
+# duplicates), "indexed" (decrease-key) and "buckets" (Dial).
+# Changes are relative to heapq.
+
+from .grid import buildCosts
+from .a_star import astar, FRONTIERS
+from .heuristic import manhattan
+
+GRID_SIZES = [(50, 50), (100, 100), (200, 200)]
+SEEDS = [1, 2, 3]
+MIN_COST, MAX_COST = 1, 9
+
+
+def pct_change(new, old):
+    return 100.0 * (new - old) / old if old else 0.0
+
+
+def main():
+    print("grid      seed frontier | max_frontier      | generated          | runtime_ms         | cost")
+
+    for (m, n) in GRID_SIZES:
+        for seed in SEEDS:
+            costs = buildCosts(m, n, MIN_COST, MAX_COST, seed)
+
+            base = None
+            for frontier in FRONTIERS:
+                result = astar(m, n, (0, 0), (m - 1, n - 1), costs, heuristic_fn=manhattan, frontier=frontier)
+                if base is None:
+                    base = result
+
+                same_cost = "same" if result["total_cost"] == base["total_cost"] else "DIFFERENT"
+                print(
+                    f"{m}x{n:<6} {seed:>4} {frontier:>8} | "
+                    f"{result['max_frontier_size']:>6} ({pct_change(result['max_frontier_size'], base['max_frontier_size']):+6.1f}%) | "
+                    f"{result['generated_nodes']:>7} ({pct_change(result['generated_nodes'], base['generated_nodes']):+6.1f}%) | "
+                    f"{result['runtime_ms']:>7.1f} ({pct_change(result['runtime_ms'], base['runtime_ms']):+6.1f}%) | "
+                    f"{same_cost}"
+                )
+
+
+if __name__ == "__main__":
+    main()
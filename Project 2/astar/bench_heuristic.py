@@ -0,0 +1,65 @@
+# astar/bench_heuristic.py
+# Run: python -m astar.bench_heuristic
+#
+# Heuristic cost on a 500x500 grid, goal in the far corner:
+#   lookups: ns per h(state, goal) over every cell, after any table is built
+#   build:   time to set up the cache ("table" fills every cell up front)
+#   astar:   corner-to-corner A* runtime with each h_cache
+# Changes are relative to h_cache=None.
+
+import time
+
+from .grid import buildCosts, neighbor_table
+from .a_star import astar
+from .heuristic import H_CACHES, cached_heuristic, euclidean, heuristic_table, manhattan
+
+M, N = 500, 500
+SEED = 1
+MIN_COST, MAX_COST = 1, 9
+
+
+def pct_change(new, old):
+    return 100.0 * (new - old) / old if old else 0.0
+
+
+def main():
+    goal = (M - 1, N - 1)
+    states = [(r, c) for r in range(M) for c in range(N)]
+    costs = buildCosts(M, N, MIN_COST, MAX_COST, SEED)
+    # keep the numpy import and the neighbor table out of the timings
+    heuristic_table(manhattan, 2, 2, goal)
+    neighbor_table(M, N)
+
+    print(f"{M}x{N}, goal {goal}")
+    print("heuristic h_cache | lookup ns        | build_ms | astar_ms            | cost")
+
+    for heuristic_fn in (manhattan, euclidean):
+        base = None
+        for h_cache in H_CACHES:
+            t0 = time.perf_counter()
+            h = cached_heuristic(heuristic_fn, h_cache, M, N, goal)
+            build_ms = (time.perf_counter() - t0) * 1000.0
+
+            # twice, so "memo" is measured warm like "table"
+            for _ in range(2):
+                t0 = time.perf_counter()
+                for s in states:
+                    h(s, goal)
+                lookup_ns = (time.perf_counter() - t0) * 1e9 / len(states)
+
+            result = astar(M, N, (0, 0), goal, costs, heuristic_fn=heuristic_fn, h_cache=h_cache)
+            if base is None:
+                base = (lookup_ns, result)
+
+            same_cost = "same" if result["total_cost"] == base[1]["total_cost"] else "DIFFERENT"
+            print(
+                f"{heuristic_fn.__name__:>9} {str(h_cache):>7} | "
+                f"{lookup_ns:>6.1f} ({pct_change(lookup_ns, base[0]):+6.1f}%) | "
+                f"{build_ms:>8.1f} | "
+                f"{result['runtime_ms']:>8.1f} ({pct_change(result['runtime_ms'], base[1]['runtime_ms']):+6.1f}%) | "
+                f"{same_cost}"
+            )
+
+
+if __name__ == "__main__":
+    main()
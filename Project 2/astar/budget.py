@@ -0,0 +1,62 @@
+import time
+
+from .node import ExtractPath
+
+# Search budgets. astar() given any of max_expansions, deadline_ms or
+# max_frontier checks them after every expansion and stops with status
+# "cutoff" once one is exceeded, returning the path to the expanded node with
+# the lowest h (lowest f on ties) and the metrics so far.
+
+CUTOFF_REASONS = ("max_expansions", "deadline_ms", "max_frontier")
+
+
+class Budget:
+    __slots__ = ("max_expansions", "deadline", "max_frontier")
+
+    def __init__(self, t0, max_expansions=None, deadline_ms=None, max_frontier=None):
+        self.max_expansions = max_expansions
+        self.deadline = None if deadline_ms is None else t0 + deadline_ms / 1000.0
+        self.max_frontier = max_frontier
+
+    def exceeded(self, expanded_states, frontier_size):
+        # name of the first limit that is used up, None while within budget
+        if self.max_expansions is not None and expanded_states >= self.max_expansions:
+            return "max_expansions"
+        if self.max_frontier is not None and frontier_size > self.max_frontier:
+            return "max_frontier"
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            return "deadline_ms"
+        return None
+
+
+def make_budget(t0, max_expansions=None, deadline_ms=None, max_frontier=None):
+    # None when there is nothing to check, so unbounded searches pay nothing
+    if max_expansions is None and deadline_ms is None and max_frontier is None:
+        return None
+    return Budget(t0, max_expansions, deadline_ms, max_frontier)
+
+
+def closer(node, best):
+    # is node a better partial path than best: lower h, then lower f
+    return best is None or (node.h, node.f) < (best.h, best.f)
+
+
+def cutoff_result(best, reason, t0, expanded_states, reopened, generated_nodes, max_frontier_size):
+    # astar() result of a search stopped by its budget; best is never None
+    # because the start node is expanded before the first check
+    states, actions = ExtractPath(best)
+    return {
+        "status": "cutoff",
+        "cutoff_reason": reason,
+        "states": states,
+        "actions": actions,
+        "steps": len(actions),
+        "total_cost": None,
+        "expanded_states": expanded_states,
+        "reopened": reopened,
+        "generated_nodes": generated_nodes,
+        "max_frontier_size": max_frontier_size,
+        "runtime_ms": (time.perf_counter() - t0) * 1000.0,
+        "suboptimality_bound": None,
+        "time_to_first_solution_ms": None,
+    }
@@ -1,6 +1,16 @@
+import gc
 import random
+from functools import lru_cache
+from itertools import compress, product
 
 ACTIONS = ["U", "D", "L", "R"]  # order matters for reproducibility
+OPPOSITE = {"U": "D", "D": "U", "L": "R", "R": "L"}  # move(move(s, a), OPPOSITE[a]) == s
+
+# "python": the original random.randint loop
+# "numpy": one numpy Generator.integers call (fast, but a different stream)
+# "compat": vectorized with numpy, same values as "python" for every seed
+ENGINES = ("python", "numpy", "compat")
+COMPAT_CHUNK = 1 << 18  # raw draws per step of the compat generator
 
 
 def move(state, action):
@@ -22,11 +32,38 @@ def in_bounds(state, m, n):
     return 0 <= r < m and 0 <= c < n
 
 
-def buildCosts(m, n, min_cost, max_cost, seed):
+@lru_cache(maxsize=1)
+def neighbor_table(m, n):
+    """
+    Precomputed legal moves for every cell of an m x n grid:
+    table[state] -> tuple of (action, next_state, (state, action)).
+    The last item is the costs key, so callers never build it per expansion.
+    Only the table of the last grid size is kept: it holds a few tuples per
+    cell, more memory than the costs dict it serves.
+    """
+    table = {}
+    for r in range(m):
+        for c in range(n):
+            s = (r, c)
+            moves = []
+            for a in ACTIONS:
+                s2 = move(s, a)
+                if in_bounds(s2, m, n):
+                    moves.append((a, s2, (s, a)))
+            table[s] = tuple(moves)
+    return table
+
+
+def buildCosts(m, n, min_cost, max_cost, seed, engine="python"):
     """
     Builds directed edge costs: costs[(state, action)] -> int
     Only includes legal (in-bounds) moves.
+
+    engine is one of ENGINES; "numpy" and "compat" need numpy.
     """
+    if engine != "python":
+        return numpy_costs(m, n, min_cost, max_cost, seed, engine)
+
     random.seed(seed)
 
     costs = {}
@@ -38,3 +75,115 @@ def buildCosts(m, n, min_cost, max_cost, seed):
                 if in_bounds(s2, m, n):
                     costs[(s, a)] = random.randint(min_cost, max_cost)
     return costs
+
+
+def cost_typecode(min_cost, max_cost):
+    # smallest array typecode that can hold every cost in [min_cost, max_cost]
+    if min_cost >= 0:
+        if max_cost <= 0xFFFF:
+            return "H"
+        if max_cost <= 0xFFFFFFFF:
+            return "I"
+        return "Q"
+    return "q"
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("engine='numpy' and engine='compat' need numpy installed") from None
+    return numpy
+
+
+def legal_edge_mask(np, m, n):
+    # bool per (r, c, action) in buildCosts order: does the edge stay in the grid?
+    r = np.arange(m).reshape(m, 1)
+    c = np.arange(n).reshape(1, n)
+
+    mask = np.empty((m, n, 4), dtype=bool)
+    mask[:, :, 0] = r - 1 >= 0  # U
+    mask[:, :, 1] = r + 1 < m   # D
+    mask[:, :, 2] = c - 1 >= 0  # L
+    mask[:, :, 3] = c + 1 < n   # R
+    return mask.ravel()
+
+
+def legacy_randints(np, seed, min_cost, max_cost, count, dtype="q"):
+    """
+    The first count values of random.seed(seed); random.randint(min_cost, max_cost),
+    computed with numpy. Leaves the random module in the same state as the loop.
+
+    randint draws r = getrandbits(k) (k = bit length of the range width) and
+    redraws while r >= width. For k <= 32 every getrandbits call is one 32-bit
+    Mersenne Twister output shifted right by 32 - k, so the stream is numpy's
+    MT19937 started from random's state, shifted and filtered.
+    """
+    width = max_cost - min_cost + 1
+    k = width.bit_length()
+    if k > 32:
+        raise ValueError("engine='compat' needs max_cost - min_cost < 2**32 - 1")
+
+    random.seed(seed)
+    version, internal, gauss = random.getstate()
+
+    bitgen = np.random.MT19937()
+    bitgen.state = {"bit_generator": "MT19937",
+                    "state": {"key": np.array(internal[:-1], dtype=np.uint32), "pos": internal[-1]}}
+
+    # r = word >> (32 - k) is accepted when r < width, i.e. word < width << (32 - k)
+    shift = 32 - k
+    limit = np.uint64(width << shift)
+
+    values = np.empty(count, dtype=dtype)
+    have = 0
+    while have < count:
+        # cache-sized chunks of raw 32-bit words
+        before = bitgen.state
+        words = bitgen.random_raw(COMPAT_CHUNK)
+        accepted = words < limit
+        r = np.compress(accepted, words)
+
+        take = min(len(r), count - have)
+        values[have:have + take] = r[:take] >> shift
+        have += take
+
+    if count:
+        # replay the last chunk up to the last value used, so random ends
+        # where the loop would
+        used = int(np.flatnonzero(accepted)[take - 1]) + 1
+        bitgen.state = before
+        bitgen.random_raw(used)
+        state = bitgen.state["state"]
+        random.setstate((version, tuple(int(x) for x in state["key"]) + (int(state["pos"]),), gauss))
+
+    values += min_cost
+    return values
+
+
+def numpy_costs(m, n, min_cost, max_cost, seed, engine):
+    # buildCosts for engine "numpy" / "compat": all edge costs in one go
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine} (expected one of {ENGINES})")
+    np = _numpy()
+
+    mask = legal_edge_mask(np, m, n)
+    count = int(mask.sum())
+
+    typecode = cost_typecode(min_cost, max_cost)
+    if engine == "numpy":
+        values = np.random.default_rng(seed).integers(min_cost, max_cost, size=count,
+                                                      dtype=typecode, endpoint=True)
+    else:
+        values = legacy_randints(np, seed, min_cost, max_cost, count, dtype=typecode)
+
+    keys = (((r, c), a) for r, c in product(range(m), range(n)) for a in ACTIONS)
+
+    # millions of new tuples would otherwise trigger full gc passes
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return dict(zip(compress(keys, mask.tolist()), values.tolist()))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
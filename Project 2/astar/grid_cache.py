@@ -0,0 +1,180 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from pathlib import Path
+
+from .grid import buildCosts, cost_typecode, neighbor_table
+from .landmarks import NUM_LANDMARKS, Landmarks
+
+# On-disk cache of generated cost grids.
+#
+# A grid is fully determined by (m, n, min_cost, max_cost, seed), so each one
+# is stored once under a hash of those parameters and FORMAT_VERSION. The
+# file is a fixed header followed by the edge costs as a raw array, in the
+# order buildCosts generates them (row, column, then ACTIONS). A warm load
+# maps the file and zips it with the edge keys into the usual costs dict,
+# without running the random generator. Landmark tables for the ALT heuristic
+# are stored next to their grid (same key, ".alt<k>" suffix). Files are
+# evicted least recently used first (by mtime, which a hit refreshes) once
+# the cache holds more than max_bytes.
+
+FORMAT_VERSION = 1
+CACHE_DIR = ".grid_cache"
+MAX_BYTES = 1 << 30
+
+MAGIC = b"AGRD"
+# magic, version, byteorder, typecode, m, n, min_cost, max_cost, seed
+HEADER = struct.Struct("<4sHcc5q")
+HEADER_SIZE = 64    # payload starts 64-byte aligned
+
+
+def _itemsize(typecode):
+    # bytes per value of a stored typecode, 0 if it is not an array typecode
+    try:
+        return array(typecode.decode()).itemsize
+    except (ValueError, UnicodeDecodeError):
+        return 0
+
+
+def grid_key(m, n, min_cost, max_cost, seed, engine="python"):
+    params = f"v{FORMAT_VERSION}:{m}:{n}:{min_cost}:{max_cost}:{seed}"
+    if engine == "numpy":
+        # "compat" grids are identical to "python" ones and share their files
+        params += ":numpy"
+    return hashlib.sha256(params.encode()).hexdigest()[:32]
+
+
+@lru_cache(maxsize=8)
+def edge_keys(m, n):
+    # (state, action) of every legal edge, in buildCosts order
+    table = neighbor_table(m, n)
+    return tuple(key for state in table for (_, _, key) in table[state])
+
+
+class GridCache:
+    """
+    Cost grids on disk, keyed by their generation parameters.
+
+        cache = GridCache()
+        costs = cache.get(m, n, min_cost, max_cost, seed)   # same dict as buildCosts
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, m, n, min_cost, max_cost, seed, engine="python"):
+        return self.directory / (grid_key(m, n, min_cost, max_cost, seed, engine) + ".grid")
+
+    def get(self, m, n, min_cost, max_cost, seed, engine="python"):
+        costs = self.load(m, n, min_cost, max_cost, seed, engine)
+        if costs is not None:
+            self.hits += 1
+            return costs
+
+        self.misses += 1
+        costs = buildCosts(m, n, min_cost, max_cost, seed, engine=engine)
+        self.store(costs, m, n, min_cost, max_cost, seed, engine)
+        return costs
+
+    def load(self, m, n, min_cost, max_cost, seed, engine="python"):
+        # None if the grid is not cached (or the file does not match)
+        path = self.path(m, n, min_cost, max_cost, seed, engine)
+        try:
+            with open(path, "rb") as f:
+                header = HEADER.unpack(f.read(HEADER.size))
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, struct.error):
+            return None
+
+        magic, version, byteorder, typecode, *params = header
+        keys = edge_keys(m, n)
+        with data:
+            # checked before the cast, which raises TypeError on a truncated payload
+            if (magic != MAGIC or version != FORMAT_VERSION
+                    or byteorder != sys.byteorder[0].encode()
+                    or params != [m, n, min_cost, max_cost, seed]
+                    or len(data) - HEADER_SIZE != len(keys) * _itemsize(typecode)):
+                return None
+
+            view = memoryview(data)[HEADER_SIZE:].cast(typecode.decode())
+            try:
+                costs = dict(zip(keys, view))
+            finally:
+                view.release()
+
+        try:
+            os.utime(path)  # most recently used
+        except OSError:
+            pass            # read-only cache: still a hit, just not refreshed
+        return costs
+
+    def store(self, costs, m, n, min_cost, max_cost, seed, engine="python"):
+        path = self.path(m, n, min_cost, max_cost, seed, engine)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        typecode = cost_typecode(min_cost, max_cost)
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, sys.byteorder[0].encode(),
+                             typecode.encode(), m, n, min_cost, max_cost, seed)
+        values = array(typecode, (costs[key] for key in edge_keys(m, n)))
+
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            f.write(values.tobytes())
+        os.replace(tmp, path)
+
+        self.evict()
+
+    def landmarks(self, m, n, min_cost, max_cost, seed, k=NUM_LANDMARKS, engine="python"):
+        # ALT landmark tables of a cached grid, computed on the first request
+        grid_path = self.path(m, n, min_cost, max_cost, seed, engine)
+        path = grid_path.with_suffix(f".alt{k}")
+
+        lm = Landmarks.load(path, m, n)
+        if lm is not None:
+            self.hits += 1
+            try:
+                os.utime(path)  # most recently used
+            except OSError:
+                pass
+            return lm
+
+        self.misses += 1
+        lm = Landmarks.build(m, n, self.get(m, n, min_cost, max_cost, seed, engine), k)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        lm.save(path)
+        self.evict()
+        return lm
+
+    def files(self):
+        return [p for p in self.directory.glob("*") if p.suffix == ".grid" or p.suffix.startswith(".alt")]
+
+    def evict(self):
+        # drop least recently used files until the cache fits in max_bytes
+        files = []
+        for p in self.files():
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, p in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+
+    def nbytes(self):
+        return sum(p.stat().st_size for p in self.files())
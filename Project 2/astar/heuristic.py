@@ -1,5 +1,7 @@
 import math
 
+from .grid import ACTIONS, move
+
 
 def manhattan(state, goal):
     r, c = state
@@ -11,3 +13,141 @@ def euclidean(state, goal):
     r, c = state
     rg, cg = goal
     return math.sqrt((r - rg) ** 2 + (c - cg) ** 2)
+
+
+# Whole-grid versions for heuristic_table(): f(np, rows, cols, goal) gets an
+# (m, 1) row index and a (1, n) column index array and returns the (m, n)
+# table, with the same values as the scalar function.
+manhattan.vectorized = lambda np, r, c, goal: np.abs(r - goal[0]) + np.abs(c - goal[1])
+euclidean.vectorized = lambda np, r, c, goal: np.sqrt((r - goal[0]) ** 2 + (c - goal[1]) ** 2)
+
+
+# Factories for heuristics that depend on the cost grid. Each binds the grid
+# metadata once and returns a heuristic_fn(state, goal) closure.
+
+def scaled_manhattan(min_cost):
+    # every step costs at least min_cost, so min_cost * manhattan is still admissible
+    def h(state, goal):
+        r, c = state
+        rg, cg = goal
+        return min_cost * (abs(r - rg) + abs(c - cg))
+    h.vectorized = lambda np, r, c, goal: min_cost * (np.abs(r - goal[0]) + np.abs(c - goal[1]))
+    return h
+
+
+def axis_min(m, n, costs):
+    """
+    Any path from row r down to row rg crosses every row boundary in between
+    with some edge of that direction, and the same holds for columns. The
+    sum of the cheapest such edge per boundary is a lower bound, computed
+    from prefix sums per direction. Moving one step changes the bound by at
+    most that edge's cost, so it is consistent as well as admissible.
+    """
+    # cheapest edge crossing each boundary: rows i <-> i+1, columns j <-> j+1
+    down = [math.inf] * max(m - 1, 0)
+    up = [math.inf] * max(m - 1, 0)
+    right = [math.inf] * max(n - 1, 0)
+    left = [math.inf] * max(n - 1, 0)
+
+    for (state, a), cost in costs.items():
+        r, c = state
+        r2, c2 = move(state, a)
+        if r2 > r:
+            down[r] = min(down[r], cost)
+        elif r2 < r:
+            up[r2] = min(up[r2], cost)
+        elif c2 > c:
+            right[c] = min(right[c], cost)
+        else:
+            left[c2] = min(left[c2], cost)
+
+    def prefix(mins):
+        # prefix[i] = cost of crossing boundaries 0..i-1; missing edges count 0
+        sums = [0]
+        for x in mins:
+            sums.append(sums[-1] + (0 if x == math.inf else x))
+        return sums
+
+    down, up, right, left = prefix(down), prefix(up), prefix(right), prefix(left)
+
+    def h(state, goal):
+        r, c = state
+        rg, cg = goal
+        vertical = down[rg] - down[r] if rg >= r else up[r] - up[rg]
+        horizontal = right[cg] - right[c] if cg >= c else left[c] - left[cg]
+        return vertical + horizontal
+    return h
+
+
+# names for main.py and run_astar_experiments; "alt" lives in landmarks.py
+HEURISTICS = ("manhattan", "euclidean", "manhattan_scaled", "axis_min")
+
+
+def is_consistent(name, min_cost):
+    # h(s) <= cost(s, s') + h(s') on every edge, so astar(consistent=True) is safe.
+    # manhattan and euclidean assume every step costs at least 1.
+    if name in ("manhattan", "euclidean"):
+        return min_cost >= 1
+    return name in ("manhattan_scaled", "axis_min", "alt")
+
+
+def make_heuristic(name, m, n, min_cost, costs):
+    # heuristic_fn for one of HEURISTICS on this cost grid
+    if name == "manhattan":
+        return manhattan
+    if name == "euclidean":
+        return euclidean
+    if name == "manhattan_scaled":
+        return scaled_manhattan(min_cost)
+    if name == "axis_min":
+        return axis_min(m, n, costs)
+    raise ValueError(f"Unknown heuristic: {name} (expected one of {HEURISTICS})")
+
+
+# astar(..., h_cache=...): None calls heuristic_fn for every generated node,
+# "memo" remembers h per state for one search, "table" computes h for every
+# cell up front (vectorized with numpy when it is installed and the heuristic
+# has a .vectorized version, else a plain loop).
+H_CACHES = (None, "memo", "table")
+
+
+def heuristic_table(heuristic_fn, m, n, goal):
+    # table[r][c] = heuristic_fn((r, c), goal), as nested lists for fast lookups
+    vectorized = getattr(heuristic_fn, "vectorized", None)
+    if vectorized is not None:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is not None:
+            rows = np.arange(m).reshape(m, 1)
+            cols = np.arange(n).reshape(1, n)
+            return np.broadcast_to(vectorized(np, rows, cols, goal), (m, n)).tolist()
+
+    return [[heuristic_fn((r, c), goal) for c in range(n)] for r in range(m)]
+
+
+def cached_heuristic(heuristic_fn, h_cache, m, n, goal):
+    # heuristic_fn wrapped in the cache h_cache selects (see H_CACHES)
+    if h_cache is None:
+        return heuristic_fn
+
+    if h_cache == "memo":
+        memo = {}
+
+        def h(state, _goal):
+            value = memo.get(state)
+            if value is None:
+                value = memo[state] = heuristic_fn(state, goal)
+            return value
+        return h
+
+    if h_cache == "table":
+        table = heuristic_table(heuristic_fn, m, n, goal)
+
+        def h(state, _goal):
+            r, c = state
+            return table[r][c]
+        return h
+
+    raise ValueError(f"Unknown h_cache: {h_cache} (expected one of {H_CACHES})")
@@ -0,0 +1,150 @@
+import time
+import tracemalloc
+
+from .grid import in_bounds, neighbor_table
+from .heuristic import manhattan
+
+# default transposition table cap for IDA*, in states
+TT_SIZE = 1 << 16
+
+
+def ida_star(m, n, start, goal, costs, heuristic_fn=manhattan, tt_size=TT_SIZE, track_memory=False):
+    """
+    IDA*: depth-first searches bounded by f = g + h. Each iteration raises
+    the bound to the smallest f that went over it, so with an admissible
+    heuristic the first path found is optimal.
+
+    Only the current path is kept on an explicit stack, so memory is linear
+    in the path depth plus the transposition table. The table maps
+    state -> smallest g it was reached with in the current iteration and
+    prunes revisits that are no cheaper. It holds at most tt_size states
+    (0 disables it, None means no cap).
+
+    Returns the same dict as astar() plus iterations, reexpanded_states
+    (expansions spent in the iterations before the last one),
+    peak_stack_depth and peak_memory_bytes (tracemalloc peak when
+    track_memory is True, else None).
+    """
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        started_tracing = True
+    else:
+        started_tracing = False
+    if track_memory:
+        tracemalloc.reset_peak()
+
+    t0 = time.perf_counter()
+
+    neighbors = neighbor_table(m, n)
+
+    expanded_states = 0
+    generated_nodes = 1
+    iterations = 0
+    last_expanded = 0
+    peak_stack_depth = 1
+    found = None
+
+    bound = heuristic_fn(start, goal)
+
+    # a goal outside the grid is never generated
+    if start == goal:
+        iterations = 1
+        found = ([start], [], 0)
+    elif not in_bounds(goal, m, n):
+        bound = None
+
+    while found is None and bound is not None:
+        iterations += 1
+        before = expanded_states
+        next_bound = None
+
+        # current path: states, g of each state, action into it, next move to try
+        path = [start]
+        path_g = [0]
+        path_actions = []
+        next_move = [0]
+        on_path = {start}
+        tt = {start: 0} if tt_size != 0 else None
+        expanded_states += 1
+
+        while path:
+            state = path[-1]
+            moves = neighbors[state]
+            i = next_move[-1]
+
+            if i == len(moves):
+                path.pop()
+                path_g.pop()
+                next_move.pop()
+                on_path.discard(state)
+                if path_actions:
+                    path_actions.pop()
+                continue
+
+            next_move[-1] = i + 1
+            a, s2, key = moves[i]
+            if key not in costs or s2 in on_path:
+                continue
+
+            g2 = path_g[-1] + costs[key]
+            generated_nodes += 1
+
+            f2 = g2 + heuristic_fn(s2, goal)
+            if f2 > bound:
+                if next_bound is None or f2 < next_bound:
+                    next_bound = f2
+                continue
+
+            if s2 == goal:
+                found = (path + [s2], path_actions + [a], g2)
+                break
+
+            if tt is not None:
+                seen = tt.get(s2)
+                if seen is not None and seen <= g2:
+                    continue
+                if seen is not None or tt_size is None or len(tt) < tt_size:
+                    tt[s2] = g2
+
+            path.append(s2)
+            path_g.append(g2)
+            path_actions.append(a)
+            next_move.append(0)
+            on_path.add(s2)
+            expanded_states += 1
+            if len(path) > peak_stack_depth:
+                peak_stack_depth = len(path)
+
+        last_expanded = expanded_states - before
+        bound = next_bound
+
+    runtime_ms = (time.perf_counter() - t0) * 1000.0
+
+    peak_memory_bytes = None
+    if track_memory:
+        peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        if started_tracing:
+            tracemalloc.stop()
+
+    if found is not None:
+        states, actions, total_cost = found
+        status = "success"
+    else:
+        states, actions, total_cost = [], [], None
+        status = "failure"
+
+    return {
+        "status": status,
+        "states": states,
+        "actions": actions,
+        "steps": len(actions),
+        "total_cost": total_cost,
+        "expanded_states": expanded_states,
+        "generated_nodes": generated_nodes,
+        "max_frontier_size": peak_stack_depth,
+        "runtime_ms": runtime_ms,
+        "iterations": iterations,
+        "reexpanded_states": expanded_states - last_expanded,
+        "peak_stack_depth": peak_stack_depth,
+        "peak_memory_bytes": peak_memory_bytes,
+    }
@@ -0,0 +1,216 @@
+import heapq
+import os
+import struct
+import sys
+from array import array
+
+from .grid import OPPOSITE, neighbor_table
+
+# ALT (A*, Landmarks, Triangle inequality) heuristic.
+#
+# For a landmark L and directed path costs d, the triangle inequality gives
+#     d(v, t) >= d(L, t) - d(L, v)      (distances from L)
+#     d(v, t) >= d(v, L) - d(t, L)      (distances to L)
+# so the largest of these over k landmarks is an admissible and consistent
+# lower bound. Landmarks are picked by farthest-point selection, and both
+# distance tables are computed once per cost grid with Dijkstra.
+
+NUM_LANDMARKS = 8
+
+MAGIC = b"ALTL"
+FORMAT_VERSION = 1
+# magic, version, byteorder, typecode, m, n, k
+HEADER = struct.Struct("<4sHcc3q")
+HEADER_SIZE = 64    # payload starts 64-byte aligned
+
+
+def dijkstra(m, n, costs, source, reverse=False):
+    """
+    Path costs from source to every cell (or from every cell to source when
+    reverse is set), indexed by r * n + c. Cells that cannot be reached are -1.
+    """
+    neighbors = neighbor_table(m, n)
+    dist = [-1] * (m * n)
+    frontier = [(0, source)]
+    best = {source: 0}
+
+    while frontier:
+        g, state = heapq.heappop(frontier)
+        r, c = state
+        if dist[r * n + c] != -1:
+            continue
+        dist[r * n + c] = g
+
+        for a, s2, key in neighbors[state]:
+            # the reverse search follows s2 -> state, the edge (s2, OPPOSITE[a])
+            key = (s2, OPPOSITE[a]) if reverse else key
+            if key not in costs:
+                continue
+            g2 = g + costs[key]
+            if g2 < best.get(s2, g2 + 1):
+                best[s2] = g2
+                heapq.heappush(frontier, (g2, s2))
+
+    return dist
+
+
+def select_landmarks(m, n, costs, k=NUM_LANDMARKS, first=(0, 0)):
+    """
+    Farthest-point selection: the first landmark is the cell farthest from
+    first, every next one the cell whose distance to the nearest landmark so
+    far is largest. Returns (cells, dist_from, dist_to), one distance list
+    per landmark.
+    """
+    k = min(k, m * n)
+    cells, dist_from, dist_to = [], [], []
+
+    nearest = dijkstra(m, n, costs, first)
+    for _ in range(k):
+        cell = max(range(m * n), key=lambda i: nearest[i])
+        if nearest[cell] <= 0 and cells:
+            break   # every cell is a landmark or unreachable
+
+        landmark = divmod(cell, n)
+        d_from = dijkstra(m, n, costs, landmark)
+        cells.append(landmark)
+        dist_from.append(d_from)
+        dist_to.append(dijkstra(m, n, costs, landmark, reverse=True))
+
+        # unreachable cells (-1) stay at -1 and are never picked
+        nearest = d_from if len(cells) == 1 else list(map(min, nearest, d_from))
+
+    return cells, dist_from, dist_to
+
+
+class Landmarks:
+    """
+    Distance tables of k landmarks on one cost grid, usable as a heuristic:
+
+        lm = Landmarks.build(m, n, costs)
+        astar(m, n, start, goal, costs, heuristic_fn=lm)
+
+    dist_from[i][cell] = d(landmark i, cell) and dist_to[i][cell] =
+    d(cell, landmark i), as compact unsigned arrays (unreachable cells hold
+    UNREACHED and never contribute to a bound).
+    """
+
+    UNREACHED = 0xFFFFFFFF
+
+    def __init__(self, m, n, cells, dist_from, dist_to):
+        self.m = m
+        self.n = n
+        self.cells = [tuple(c) for c in cells]
+        self.dist_from = dist_from
+        self.dist_to = dist_to
+
+        # per-goal columns, so a query only looks up the state's entries
+        self._goal = None
+        self._goal_dists = ()
+
+    @classmethod
+    def build(cls, m, n, costs, k=NUM_LANDMARKS):
+        cells, dist_from, dist_to = select_landmarks(m, n, costs, k)
+        pack = lambda d: array("I", (cls.UNREACHED if x == -1 else x for x in d))
+        return cls(m, n, cells, [pack(d) for d in dist_from], [pack(d) for d in dist_to])
+
+    @property
+    def k(self):
+        return len(self.cells)
+
+    def _set_goal(self, goal):
+        gr, gc = goal
+        gcell = gr * self.n + gc
+        self._goal = goal
+        self._goal_dists = tuple(
+            (d_from, d_to, d_from[gcell], d_to[gcell])
+            for d_from, d_to in zip(self.dist_from, self.dist_to)
+            if d_from[gcell] != self.UNREACHED and d_to[gcell] != self.UNREACHED
+        )
+
+    def __call__(self, state, goal):
+        if goal != self._goal:
+            self._set_goal(goal)
+
+        r, c = state
+        cell = r * self.n + c
+        unreached = self.UNREACHED
+
+        h = 0
+        for d_from, d_to, from_goal, to_goal in self._goal_dists:
+            a = d_from[cell]
+            if a != unreached and from_goal - a > h:
+                h = from_goal - a
+            b = d_to[cell]
+            if b != unreached and b - to_goal > h:
+                h = b - to_goal
+        return h
+
+    def from_source(self, source):
+        """
+        Lower bound on d(source, v), as a function of v, from the same
+        inequalities with source in place of v and v in place of the target:
+            d(source, v) >= d(L, v) - d(L, source)
+            d(source, v) >= d(source, L) - d(v, L)
+        Unlike calling self(source, v), this does not swap the cached goal.
+        """
+        sr, sc = source
+        scell = sr * self.n + sc
+        unreached = self.UNREACHED
+        rows = tuple(
+            (d_from, d_to, d_from[scell], d_to[scell])
+            for d_from, d_to in zip(self.dist_from, self.dist_to)
+            if d_from[scell] != unreached and d_to[scell] != unreached
+        )
+        n = self.n
+
+        def h(state):
+            r, c = state
+            cell = r * n + c
+            best = 0
+            for d_from, d_to, from_source, to_source in rows:
+                a = d_from[cell]
+                if a != unreached and a - from_source > best:
+                    best = a - from_source
+                b = d_to[cell]
+                if b != unreached and to_source - b > best:
+                    best = to_source - b
+            return best
+        return h
+
+    def save(self, path):
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, sys.byteorder[0].encode(), b"I",
+                             self.m, self.n, self.k)
+        cells = array("I", (r * self.n + c for r, c in self.cells))
+
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            f.write(cells.tobytes())
+            for table in self.dist_from + self.dist_to:
+                f.write(table.tobytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, m, n):
+        # None if the file is missing or does not match
+        try:
+            with open(path, "rb") as f:
+                header = HEADER.unpack(f.read(HEADER.size))
+                magic, version, byteorder, typecode, fm, fn, k = header
+                if (magic != MAGIC or version != FORMAT_VERSION
+                        or byteorder != sys.byteorder[0].encode()
+                        or typecode != b"I" or (fm, fn) != (m, n)):
+                    return None
+
+                f.seek(HEADER_SIZE)
+                cells = array("I")
+                cells.fromfile(f, k)
+                tables = []
+                for _ in range(2 * k):
+                    table = array("I")
+                    table.fromfile(f, m * n)
+                    tables.append(table)
+        except (OSError, EOFError, struct.error):
+            return None
+
+        return cls(m, n, [divmod(cell, n) for cell in cells], tables[:k], tables[k:])
@@ -3,11 +3,18 @@ import math
 from collections import defaultdict
 from pathlib import Path
 
+from results_io import read_results
+
+from .profiling import PHASES
+
 RESULTS_FILE = "results/results_astar.json"
 OUT_JSON = "metrics/astar_metrics_report.json"
 OUT_CSV  = "metrics/astar_metrics_report.csv"
 
-METRICS = ["steps", "total_cost", "expanded_states", "max_frontier_size", "runtime_ms"]
+METRICS = ["steps", "total_cost", "expanded_states", "reopened", "max_frontier_size", "runtime_ms",
+           "suboptimality_bound", "time_to_first_solution_ms"]
+# per-phase timings of profiled runs (see profiling.py); empty when no run was profiled
+METRICS += [f"{phase}_ns" for phase in PHASES]
 
 
 def mean(xs):
@@ -30,35 +37,35 @@ def main():
     if not path.exists():
         raise FileNotFoundError(f"Missing {RESULTS_FILE}")
 
-    data = json.loads(path.read_text())
-    runs = data.get("runs", [])
-    if not isinstance(runs, list):
-        raise ValueError("results.json must contain a top-level {'runs': [...]} list")
-
     # Ensure output dir exists
     Path("metrics").mkdir(parents=True, exist_ok=True)
 
-    # Group by (m,n,algorithm,heuristic)  ✅ important for A* comparison
+    # Group by (m,n,algorithm,variant,heuristic)  ✅ important for A* comparison
+    # (runs are streamed; only the fields the report needs are kept;
+    # variant is e.g. "weighted=1.5", None for plain searches)
     groups = defaultdict(list)
-    for r in runs:
-        key = (r.get("m"), r.get("n"), r.get("algorithm"), r.get("heuristic"))
-        groups[key].append(r)
+    for r in read_results(path):
+        key = (r.get("m"), r.get("n"), r.get("algorithm"), r.get("variant"), r.get("heuristic"))
+        groups[key].append({k: r.get(k) for k in ["status"] + METRICS})
 
     report = {"by_group": [], "notes": {}}
 
     # Build summary rows
-    for (m, n, alg, hname), rs in sorted(groups.items(), key=lambda x: (x[0][0], x[0][1], x[0][2], x[0][3])):
+    for (m, n, alg, variant, hname), rs in sorted(groups.items(), key=lambda x: (x[0][0], x[0][1], x[0][2], x[0][3] or "", x[0][4] or "")):
         successes = [r for r in rs if r.get("status") == "success"]
-        failures = [r for r in rs if r.get("status") != "success"]
+        cutoffs = [r for r in rs if r.get("status") == "cutoff"]
+        failures = [r for r in rs if r.get("status") not in ("success", "cutoff")]
 
         row = {
             "m": m,
             "n": n,
             "algorithm": alg,
+            "variant": variant,
             "heuristic": hname,
             "num_runs": len(rs),
             "num_success": len(successes),
             "num_failure": len(failures),
+            "num_cutoff": len(cutoffs),
         }
 
         for metric in METRICS:
@@ -77,17 +84,29 @@ def main():
 
         report["by_group"].append(row)
 
+    # expanded_states relative to manhattan on the same grid size and algorithm
+    manhattan_expanded = {
+        (row["m"], row["n"], row["algorithm"], row["variant"]): row["expanded_states"]["mean"]
+        for row in report["by_group"] if row["heuristic"] == "manhattan"
+    }
+    for row in report["by_group"]:
+        base = manhattan_expanded.get((row["m"], row["n"], row["algorithm"], row["variant"]))
+        mu = row["expanded_states"]["mean"]
+        row["expanded_vs_manhattan"] = mu / base if mu is not None and base else None
+
     report["notes"] = {
-        "aggregation": "Stats computed over successful runs only. Success/failure counts are included per group.",
-        "grouping": "Grouped by (m,n,algorithm,heuristic) so Manhattan vs Euclidean can be compared.",
+        "aggregation": "Stats computed over successful runs only. Success/failure/cutoff counts are included per group; "
+                       "cutoff runs were stopped by a search budget and are neither.",
+        "grouping": "Grouped by (m,n,algorithm,variant,heuristic) so heuristics and search variants (weighted=W, ara=W, beam=B) can be compared.",
         "metrics": METRICS,
+        "expanded_vs_manhattan": "Mean expanded_states divided by the manhattan group's mean for the same (m,n,algorithm,variant); below 1 means fewer expansions.",
     }
 
     Path(OUT_JSON).write_text(json.dumps(report, indent=2) + "\n")
 
     # CSV: add heuristic column + mean columns
     csv_lines = []
-    header = ["m", "n", "algorithm", "heuristic", "num_runs", "num_success", "num_failure"] + [f"{m}_mean" for m in METRICS]
+    header = ["m", "n", "algorithm", "variant", "heuristic", "num_runs", "num_success", "num_failure", "num_cutoff"] + [f"{m}_mean" for m in METRICS] + ["expanded_vs_manhattan"]
     csv_lines.append(",".join(header))
 
     for row in report["by_group"]:
@@ -95,14 +114,18 @@ def main():
             str(row["m"]),
             str(row["n"]),
             row["algorithm"],
+            "" if row["variant"] is None else row["variant"],
             str(row["heuristic"]),
             str(row["num_runs"]),
             str(row["num_success"]),
             str(row["num_failure"]),
+            str(row["num_cutoff"]),
         ]
         for metric in METRICS:
             mu = row[metric]["mean"]
             line.append("" if mu is None else f"{mu:.4f}")
+        ratio = row["expanded_vs_manhattan"]
+        line.append("" if ratio is None else f"{ratio:.4f}")
         csv_lines.append(",".join(line))
 
     Path(OUT_CSV).write_text("\n".join(csv_lines) + "\n")
@@ -0,0 +1,102 @@
+import time
+
+# Opt-in search instrumentation. astar() takes profiler=None; with a Profiler
+# it times its phases in nanoseconds and calls back on every expansion and
+# generated node. Without one nothing is wrapped and the only cost is one
+# "is not None" test per expansion.
+#
+# Phases:
+#   frontier    push / pop / decrease-key on the frontier
+#   heuristic   heuristic_fn calls (after h_cache, so cache hits are counted)
+#   successors  the rest of an expansion: closed/bestCost checks, successor
+#               moves, costs and new nodes (everything after the pop minus the
+#               other phases)
+#   extract     ExtractPath of the returned path
+#   callbacks   on_expand / on_generate, and the profiler's own bookkeeping
+#               after each expansion
+
+PHASES = ("frontier", "heuristic", "successors", "extract", "callbacks")
+
+
+class Profiler:
+    """
+    Per-phase nanosecond counters for one search, plus optional callbacks:
+
+        on_expand(state, g)     a state is expanded
+        on_generate(state, g)   a node is pushed (the start node included)
+
+    counters() gives {"<phase>_ns": total}; astar() adds it to its result.
+    """
+
+    def __init__(self, on_expand=None, on_generate=None):
+        self.on_expand = on_expand
+        self.on_generate = on_generate
+        self.ns = dict.fromkeys(PHASES, 0)
+
+        self._mark_ns = 0       # end of the last pop
+        self._mark_other = 0    # sum of the phase counters at that point
+
+    def timed(self, fn, phase):
+        # fn, adding the time spent in it to phase
+        ns = self.ns
+        clock = time.perf_counter_ns
+
+        def wrapper(*args):
+            t = clock()
+            result = fn(*args)
+            ns[phase] += clock() - t
+            return result
+        return wrapper
+
+    def timed_push(self, push):
+        # like timed(push, "frontier"), and reports the pushed node (the last
+        # element of the entry) to on_generate
+        ns = self.ns
+        clock = time.perf_counter_ns
+        on_generate = self.on_generate
+
+        def wrapper(*args):
+            t = clock()
+            result = push(*args)
+            end = clock()
+            ns["frontier"] += end - t
+            if on_generate is not None:
+                node = args[-1][-1]
+                on_generate(node.state, node.g)
+                ns["callbacks"] += clock() - end
+            return result
+        return wrapper
+
+    def timed_pop(self, pop):
+        # like timed(pop, "frontier"), and starts the next expansion's clock
+        ns = self.ns
+        clock = time.perf_counter_ns
+
+        def wrapper(*args):
+            t = clock()
+            result = pop(*args)
+            self._mark_ns = end = clock()
+            ns["frontier"] += end - t
+            self._mark_other = sum(ns.values())
+            return result
+        return wrapper
+
+    def expanded(self, node):
+        # call after a node's successors are generated
+        ns = self.ns
+        now = time.perf_counter_ns()
+        ns["successors"] += (now - self._mark_ns) - (sum(ns.values()) - self._mark_other)
+
+        if self.on_expand is not None:
+            self.on_expand(node.state, node.g)
+        ns["callbacks"] += time.perf_counter_ns() - now
+
+    def counters(self):
+        return {f"{phase}_ns": total for phase, total in self.ns.items()}
+
+
+def report(profiler, result):
+    # astar() result dict, with the profiler's counters when there is one
+    if profiler is not None:
+        result.update(profiler.counters())
+    return result
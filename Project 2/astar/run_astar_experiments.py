@@ -1,40 +1,31 @@
-import json
 import time
-from pathlib import Path
 
-from .grid import buildCosts
+from .grid_cache import GridCache
 from .a_star import astar
-from .heuristic import manhattan, euclidean
+from .heuristic import is_consistent, make_heuristic
+from .profiling import PHASES, Profiler
+from results_io import ResultsWriter
 
 RESULTS_FILE = "results/results_astar.json"
 
+# grids are generated once and loaded from disk afterwards
+GRIDS = GridCache()
 
-def append_result(result, filename=RESULTS_FILE):
-    path = Path(filename)
 
-    if path.exists():
-        try:
-            with open(path, "r") as f:
-                data = json.load(f)
-            if "runs" not in data or not isinstance(data["runs"], list):
-                data = {"runs": []}
-        except (json.JSONDecodeError, OSError):
-            data = {"runs": []}
+def run_one(m, n, start, goal, min_cost, max_cost, seed, heuristic_name, budget=None, profile=False):
+    # budget: optional {"max_expansions", "deadline_ms", "max_frontier"} (see budget.py)
+    # profile: add per-phase timings (see profiling.py) to the record
+    costs = GRIDS.get(m, n, min_cost, max_cost, seed)
+    if heuristic_name == "alt":
+        # landmark tables belong to the grid, cached next to it
+        heuristic_fn = GRIDS.landmarks(m, n, min_cost, max_cost, seed)
     else:
-        data = {"runs": []}
+        heuristic_fn = make_heuristic(heuristic_name, m, n, min_cost, costs)
+    result = astar(m, n, start, goal, costs, heuristic_fn=heuristic_fn,
+                   consistent=is_consistent(heuristic_name, min_cost),
+                   profiler=Profiler() if profile else None, **(budget or {}))
 
-    data["runs"].append(result)
-
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
-        f.write("\n")
-
-
-def run_one(m, n, start, goal, min_cost, max_cost, seed, heuristic_name, heuristic_fn):
-    costs = buildCosts(m, n, min_cost, max_cost, seed)
-    result = astar(m, n, start, goal, costs, heuristic_fn=heuristic_fn)
-
-    return {
+    record = {
         "algorithm": "astar",
         "m": m,
         "n": n,
@@ -48,11 +39,18 @@ def run_one(m, n, start, goal, min_cost, max_cost, seed, heuristic_name, heurist
         "steps": result["steps"],
         "total_cost": result["total_cost"],
         "expanded_states": result["expanded_states"],
+        "reopened": result["reopened"],
         "generated_nodes": result["generated_nodes"],
         "max_frontier_size": result["max_frontier_size"],
         "runtime_ms": result["runtime_ms"],
         "status": result["status"],
     }
+    if result["status"] == "cutoff":
+        # partial path to the expanded state closest to the goal
+        record["cutoff_reason"] = result["cutoff_reason"]
+    if profile:
+        record.update({f"{phase}_ns": result[f"{phase}_ns"] for phase in PHASES})
+    return record
 
 
 def main():
@@ -70,38 +68,42 @@ def main():
     start = (0, 0)
 
     heuristics = [
-        ("manhattan", manhattan),
-        ("euclidean", euclidean),  # optional (you implemented it)
+        "manhattan",
+        "euclidean",          # optional (you implemented it)
+        "manhattan_scaled",   # min_cost * manhattan
+        "axis_min",           # cheapest edge per row/column boundary crossed
+        "alt",                # landmarks, built per grid in run_one
     ]
 
     total_runs = 0
     t0 = time.perf_counter()
 
-    for (m, n) in grid_sizes:
-        goal = (m - 1, n - 1)
-
-        for seed in seeds:
-            for heuristic_name, heuristic_fn in heuristics:
-                record = run_one(
-                    m=m,
-                    n=n,
-                    start=start,
-                    goal=goal,
-                    min_cost=min_cost,
-                    max_cost=max_cost,
-                    seed=seed,
-                    heuristic_name=heuristic_name,
-                    heuristic_fn=heuristic_fn,
-                )
-                append_result(record, RESULTS_FILE)
-                total_runs += 1
-
-                print(
-                    f"[{total_runs:02d}] {m}x{n} seed={seed} h={heuristic_name} "
-                    f"status={record['status']} steps={record['steps']} "
-                    f"cost={record['total_cost']} expanded={record['expanded_states']} "
-                    f"frontier_max={record['max_frontier_size']} runtime_ms={record['runtime_ms']:.3f}"
-                )
+    # one append-only writer for the whole batch
+    with ResultsWriter(RESULTS_FILE) as writer:
+        for (m, n) in grid_sizes:
+            goal = (m - 1, n - 1)
+
+            for seed in seeds:
+                for heuristic_name in heuristics:
+                    record = run_one(
+                        m=m,
+                        n=n,
+                        start=start,
+                        goal=goal,
+                        min_cost=min_cost,
+                        max_cost=max_cost,
+                        seed=seed,
+                        heuristic_name=heuristic_name,
+                    )
+                    writer.write(record)
+                    total_runs += 1
+
+                    print(
+                        f"[{total_runs:02d}] {m}x{n} seed={seed} h={heuristic_name} "
+                        f"status={record['status']} steps={record['steps']} "
+                        f"cost={record['total_cost']} expanded={record['expanded_states']} "
+                        f"frontier_max={record['max_frontier_size']} runtime_ms={record['runtime_ms']:.3f}"
+                    )
 
     elapsed_ms = (time.perf_counter() - t0) * 1000.0
     print(f"\nDone. Wrote {total_runs} runs to {RESULTS_FILE}. Total runtime: {elapsed_ms:.2f} ms")
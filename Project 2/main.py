@@ -1,37 +1,24 @@
-import json
 import sys
 import random
-from pathlib import Path
+from functools import partial
 
-from astar.grid import buildCosts
-from astar.a_star import astar
-from astar.heuristic import manhattan, euclidean
+import results_io
+
+from astar.grid_cache import GridCache
+from astar.a_star import astar, astar_bidir
+from astar.ida_star import ida_star
+from astar.ara_star import ara_star
+from astar.heuristic import HEURISTICS, is_consistent, make_heuristic
 
 from tsp.tsp import generate_cities
-from tsp.hill_climbing import random_restart_hill_climbing
+from tsp.hill_climbing import ENGINES, OPERATORS, random_restart_hill_climbing
 
 RESULTS_FILE = "results.json"
 
 
 def append_result(result, filename=RESULTS_FILE):
-    path = Path(filename)
-
-    if path.exists():
-        try:
-            with open(path, "r") as f:
-                data = json.load(f)
-            if "runs" not in data or not isinstance(data["runs"], list):
-                data = {"runs": []}
-        except (json.JSONDecodeError, OSError):
-            data = {"runs": []}
-    else:
-        data = {"runs": []}
-
-    data["runs"].append(result)
-
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
-        f.write("\n")
+    # append one record to the JSON Lines results file (see results_io)
+    results_io.append_result(result, filename)
 
 
 def path_cost(states, actions, costs):
@@ -41,12 +28,41 @@ def path_cost(states, actions, costs):
     return total
 
 
+def parse_search(search):
+    """
+    (search_fn, algorithm, variant) for the [search] argument of astar mode:
+    astar, bidir, ida, weighted=W (f = g + W*h), ara=W[,BUDGET_MS]
+    (anytime ARA* starting at weight W) or beam=B (beam width B).
+    variant is None for the plain searches. Raises ValueError otherwise.
+    """
+    if search == "astar":
+        return astar, "astar", None
+    if search == "bidir":
+        return astar_bidir, "astar_bidir", None
+    if search == "ida":
+        return partial(ida_star, track_memory=True), "ida_star", None
+
+    name, _, value = search.partition("=")
+    try:
+        if name == "weighted":
+            return partial(astar, weight=float(value)), "weighted_astar", search
+        if name == "ara":
+            weight, _, budget = value.partition(",")
+            budget = float(budget) if budget else None
+            return partial(ara_star, weight=float(weight), time_budget_ms=budget), "ara_star", search
+        if name == "beam":
+            return partial(astar, beam_width=int(value)), "beam_astar", search
+    except ValueError:
+        pass
+    raise ValueError("search must be astar, bidir, ida, weighted=W, ara=W[,BUDGET_MS] or beam=B")
+
+
 def main():
     args = sys.argv[1:]
 
     # Mode selection
-    # A*:  python main.py astar m n rs cs rg cg min_cost max_cost seed heuristic
-    # TSP: python main.py tsp n_cities coord_min coord_max restarts seed operator
+    # A*:  python main.py astar m n rs cs rg cg min_cost max_cost seed heuristic [search]
+    # TSP: python main.py tsp n_cities coord_min coord_max restarts seed operator [engine]
     if len(args) == 0:
         mode = input("Mode (astar/tsp): ").strip().lower()
     else:
@@ -59,9 +75,10 @@ def main():
         a = args[1:]  # after mode
 
         # Accept CLI args or interactive input
-        if len(a) == 10:
+        if len(a) in (10, 11):
             m, n, rs, cs, rg, cg, min_cost, max_cost, seed = map(int, a[:9])
             heuristic_name = a[9].lower()
+            search = a[10].lower() if len(a) == 11 else "astar"
         elif len(args) == 0:
             m = int(input("Enter number of rows (m): "))
             n = int(input("Enter number of columns (n): "))
@@ -72,18 +89,22 @@ def main():
             min_cost = int(input("Enter minimum cost: "))
             max_cost = int(input("Enter maximum cost: "))
             seed = int(input("Enter random seed: "))
-            heuristic_name = input("Heuristic (manhattan/euclidean): ").strip().lower()
+            heuristic_name = input("Heuristic (manhattan/euclidean/manhattan_scaled/axis_min/alt): ").strip().lower()
+            search = input("Search (astar/bidir/ida/weighted=W/ara=W/beam=B) [astar]: ").strip().lower() or "astar"
         else:
-            print("Usage: python main.py astar m n rs cs rg cg min_cost max_cost seed heuristic")
+            print("Usage: python main.py astar m n rs cs rg cg min_cost max_cost seed heuristic [search]")
             return
 
-        # Pick heuristic function
-        if heuristic_name == "manhattan":
-            heuristic_fn = manhattan
-        elif heuristic_name == "euclidean":
-            heuristic_fn = euclidean
-        else:
-            print("Error: heuristic must be 'manhattan' or 'euclidean'")
+        # Pick search: plain A*, bidirectional A*, IDA* or a bounded-suboptimal variant
+        try:
+            search_fn, algorithm, variant = parse_search(search)
+        except ValueError as e:
+            print("Error:", e)
+            return
+
+        # Heuristic names; the function is built with the grid below
+        if heuristic_name not in HEURISTICS + ("alt",):
+            print(f"Error: heuristic must be one of {', '.join(HEURISTICS)} or alt")
             return
 
         start = (rs, cs)
@@ -106,29 +127,56 @@ def main():
             print("Error: goal state is outside the grid.")
             return
 
-        # Build reproducible directed edge costs
-        costs = buildCosts(m, n, min_cost, max_cost, seed)
-
-        # Run A*
-        result = astar(m, n, start, goal, costs, heuristic_fn=heuristic_fn)
+        # Build reproducible directed edge costs (cached on disk after the first run)
+        grids = GridCache()
+        costs = grids.get(m, n, min_cost, max_cost, seed)
+        if heuristic_name == "alt":
+            # ALT landmark tables, cached next to the grid
+            heuristic_fn = grids.landmarks(m, n, min_cost, max_cost, seed)
+        else:
+            heuristic_fn = make_heuristic(heuristic_name, m, n, min_cost, costs)
+
+        # Run A* (the closed-set fast path when the heuristic is consistent)
+        if algorithm in ("astar", "weighted_astar", "beam_astar"):
+            search_fn = partial(search_fn, consistent=is_consistent(heuristic_name, min_cost))
+        elif algorithm == "ara_star":
+            # ARA*'s bound assumes h never overestimates; a consistent
+            # heuristic is admissible, the others are not guaranteed to be
+            admissible = is_consistent(heuristic_name, min_cost)
+            if not admissible:
+                print(f"Warning: {heuristic_name} is not admissible with min_cost={min_cost}; "
+                      "ARA* reports no suboptimality bound")
+            search_fn = partial(search_fn, admissible=admissible)
+        result = search_fn(m, n, start, goal, costs, heuristic_fn=heuristic_fn)
 
         # Print terminal output
-        print("Algorithm: astar")
+        print("Algorithm:", algorithm)
         print("Grid:", f"{m}x{n}")
         print("Start:", start)
         print("Goal:", goal)
         print("Cost range:", (min_cost, max_cost))
         print("Seed:", seed)
         print("Heuristic:", heuristic_name)
+        if variant is not None:
+            print("Variant:", variant)
         print("Status:", result["status"])
 
         if result["status"] == "success":
             print("Steps:", result["steps"])
             print("Total cost:", result["total_cost"])
             print("Expanded states:", result["expanded_states"])
+            if "reopened" in result:
+                print("Reopened states:", result["reopened"])
             print("Generated nodes:", result["generated_nodes"])
             print("Max frontier size:", result["max_frontier_size"])
             print("Runtime (ms):", round(result["runtime_ms"], 3))
+            if variant is not None:
+                print("Suboptimality bound:", result["suboptimality_bound"])
+                print("Time to first solution (ms):", round(result["time_to_first_solution_ms"], 3))
+            for sol in result.get("solutions", []):
+                b = sol["suboptimality_bound"]
+                print(f"  ARA* w={sol['weight']}: cost={sol['total_cost']} "
+                      f"bound={'unknown' if b is None else f'{b:.3f}'} at {sol['time_ms']:.3f} ms")
             print("Path states:", result["states"])
             print("Path actions:", result["actions"])
 
@@ -143,7 +191,7 @@ def main():
 
         # Save JSON output (required fields)
         run_record = {
-            "algorithm": "astar",
+            "algorithm": algorithm,
             "m": m,
             "n": n,
             "start": list(start),
@@ -162,6 +210,18 @@ def main():
             "status": result["status"],
         }
 
+        # A* reports reopened states; IDA* its re-expansion overhead and memory use
+        for key in ("reopened", "iterations", "reexpanded_states", "peak_stack_depth", "peak_memory_bytes"):
+            if key in result:
+                run_record[key] = result[key]
+
+        # weighted / ARA* / beam runs: which variant, how suboptimal, how fast
+        if variant is not None:
+            run_record["variant"] = variant
+            for key in ("suboptimality_bound", "time_to_first_solution_ms", "solutions"):
+                if key in result:
+                    run_record[key] = result[key]
+
         append_result(run_record, RESULTS_FILE)
 
     # -------------------------
@@ -170,23 +230,25 @@ def main():
     elif mode == "tsp":
         a = args[1:]  # after mode
 
-        # python main.py tsp n_cities coord_min coord_max restarts seed operator
-        if len(a) == 6:
+        # python main.py tsp n_cities coord_min coord_max restarts seed operator [engine]
+        if len(a) in (6, 7):
             n_cities = int(a[0])
             coord_min = float(a[1])
             coord_max = float(a[2])
             restarts = int(a[3])
             seed = int(a[4])
             operator = a[5].strip().lower()
+            engine = a[6].strip().lower() if len(a) == 7 else "python"
         elif len(args) == 0:
             n_cities = int(input("Enter number of cities (n): "))
             coord_min = float(input("Enter coord min (e.g., 0): "))
             coord_max = float(input("Enter coord max (e.g., 100): "))
             restarts = int(input("Enter number of restarts: "))
             seed = int(input("Enter random seed: "))
-            operator = input("Operator (two_opt): ").strip().lower()
+            operator = input(f"Operator ({'/'.join(OPERATORS)}): ").strip().lower()
+            engine = input("Engine (python/numpy) [python]: ").strip().lower() or "python"
         else:
-            print("Usage: python main.py tsp n_cities coord_min coord_max restarts seed operator")
+            print("Usage: python main.py tsp n_cities coord_min coord_max restarts seed operator [engine]")
             return
 
         # Validation
@@ -202,8 +264,16 @@ def main():
             print("Error: restarts must be positive.")
             return
 
-        if operator != "two_opt":
-            print("Error: operator must be 'two_opt'")
+        if operator not in OPERATORS:
+            print(f"Error: operator must be one of {', '.join(OPERATORS)}")
+            return
+
+        if engine not in ENGINES:
+            print(f"Error: engine must be one of {', '.join(ENGINES)}")
+            return
+
+        if operator != "two_opt" and engine != "python":
+            print("Error: engine must be 'python' for operator", operator)
             return
 
         # Reproducible RNG for BOTH cities + initial tours
@@ -217,7 +287,8 @@ def main():
             restarts=restarts,
             seed=seed,
             operator=operator,
-            rng=rng
+            rng=rng,
+            engine=engine
         )
 
         # Print terminal output (required)
@@ -227,26 +298,29 @@ def main():
         print("Seed:", seed)
         print("Restarts:", restarts)
         print("Operator:", operator)
-
-        for r in restart_records:
-            print(
-                f"Restart {r['restart_index']}: "
-                f"initial={round(r['initial_cost'], 3)} "
-                f"best={round(r['best_cost'], 3)} "
-                f"iters={r['iterations']} "
-                f"runtime_ms={r['runtime_ms']}"
-            )
-
-            # Save ONE JSON record per restart (your chosen structure)
-            append_result(r, RESULTS_FILE)
+        print("Engine:", engine)
+
+        with results_io.ResultsWriter(RESULTS_FILE) as writer:
+            for r in restart_records:
+                print(
+                    f"Restart {r['restart_index']}: "
+                    f"initial={round(r['initial_cost'], 3)} "
+                    f"best={round(r['best_cost'], 3)} "
+                    f"iters={r['iterations']} "
+                    f"evals={r['evaluations']} "
+                    f"runtime_ms={r['runtime_ms']}"
+                )
+
+                # Save ONE JSON record per restart (your chosen structure)
+                writer.write(r)
 
         print("Best overall cost:", round(best_cost, 3))
         print("Best overall tour:", best_tour)
 
     else:
         print("Error: mode must be 'astar' or 'tsp'")
-        print("A*:  python main.py astar m n rs cs rg cg min_cost max_cost seed heuristic")
-        print("TSP: python main.py tsp n_cities coord_min coord_max restarts seed operator")
+        print("A*:  python main.py astar m n rs cs rg cg min_cost max_cost seed heuristic [search]")
+        print("TSP: python main.py tsp n_cities coord_min coord_max restarts seed operator [engine]")
         return
 
 
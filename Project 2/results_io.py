@@ -0,0 +1,181 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+# Results files are JSON Lines: one run record per line, appended in place.
+# Older files hold a single {"runs": [...]} document; read_results() accepts
+# both and migrate() rewrites the old layout as JSON Lines.
+
+FSYNC_EVERY = 100   # records between fsyncs in a ResultsWriter
+
+
+def _is_legacy(first_line):
+    # The old layout is pretty-printed ("{" alone on the first line) or a
+    # single {"runs": [...]} line. A run record never has a "runs" key, and
+    # any other first line (a torn record included) is JSON Lines.
+    if first_line.strip() == "{":
+        return True
+    try:
+        doc = json.loads(first_line)
+    except json.JSONDecodeError:
+        return False
+    return isinstance(doc, dict) and "runs" in doc
+
+
+def _first_line(path):
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                return line
+    return None
+
+
+def read_results(filename):
+    """
+    Yield run records from a results file, one at a time.
+
+    JSON Lines files are streamed line by line. A torn last line (a crash in
+    the middle of a write) is skipped; any other bad line raises ValueError.
+    Legacy {"runs": [...]} files are loaded whole.
+    """
+    path = Path(filename)
+    first = _first_line(path)
+    if first is None:
+        return
+
+    if _is_legacy(first):
+        data = json.loads(path.read_text())
+        runs = data.get("runs") if isinstance(data, dict) else None
+        if not isinstance(runs, list):
+            raise ValueError(f"{filename} must contain a top-level {{'runs': [...]}} list")
+        yield from runs
+        return
+
+    with open(path, "r") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                if not line.endswith("\n"):
+                    return
+                raise ValueError(f"{filename}:{lineno}: not a JSON record")
+
+
+def migrate(filename):
+    """
+    Rewrite a legacy {"runs": [...]} file as JSON Lines, in place.
+    Returns the number of records converted (0 if there was nothing to do).
+    Raises ValueError, leaving the file as it is, if the legacy document
+    does not parse.
+    """
+    path = Path(filename)
+    if not path.exists():
+        return 0
+    first = _first_line(path)
+    if first is None or not _is_legacy(first):
+        return 0
+
+    try:
+        runs = list(read_results(path))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{filename}: legacy results document does not parse ({e}); not migrating") from None
+
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        for r in runs:
+            f.write(json.dumps(r) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return len(runs)
+
+
+def _drop_torn_tail(path):
+    # Cut a last line left without its "\n" by a crash back to the previous
+    # newline, so the next append starts on a line of its own. read_results
+    # skips such a line anyway.
+    try:
+        f = open(path, "rb+")
+    except FileNotFoundError:
+        return
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+
+        pos = end
+        while pos > 0:
+            start = max(0, pos - 4096)
+            f.seek(start)
+            i = f.read(pos - start).rfind(b"\n")
+            if i >= 0:
+                f.truncate(start + i + 1)
+                return
+            pos = start
+        f.truncate(0)
+
+
+class ResultsWriter:
+    """
+    Append-only JSON Lines sink. Records are buffered by the file object and
+    fsync'd every fsync_every records and on close, so each run costs O(1)
+    no matter how many runs the file already holds.
+
+        with ResultsWriter("results/results_astar.json") as writer:
+            writer.write(record)
+    """
+
+    def __init__(self, filename, fsync_every=FSYNC_EVERY):
+        self.path = Path(filename)
+        self.fsync_every = fsync_every
+        self.count = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        migrate(self.path)
+        _drop_torn_tail(self.path)
+        self._f = open(self.path, "a")
+        self._pending = 0
+
+    def write(self, record):
+        self._f.write(json.dumps(record) + "\n")
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.fsync_every:
+            self.flush()
+
+    def flush(self):
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._pending = 0
+
+    def close(self):
+        if not self._f.closed:
+            self.flush()
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def append_result(result, filename):
+    # one-off append, for single runs from the command line
+    with ResultsWriter(filename) as writer:
+        writer.write(result)
+
+
+if __name__ == "__main__":
+    # python -m results_io migrate results/results_astar.json [more.json ...]
+    if len(sys.argv) < 3 or sys.argv[1] != "migrate":
+        print("Usage: python -m results_io migrate FILE [FILE ...]")
+        sys.exit(1)
+    for name in sys.argv[2:]:
+        print(f"{name}: migrated {migrate(name)} runs")
@@ -2,11 +2,18 @@
 # Run: python -m pytest -q
 
 
+import random
+
 import pytest
 
-from astar.grid import buildCosts, move, in_bounds, ACTIONS
-from astar.a_star import astar
-from astar.heuristic import manhattan, euclidean
+from astar.grid import buildCosts, move, in_bounds, neighbor_table, ACTIONS
+from astar.a_star import astar, astar_bidir, successors
+from astar.heuristic import manhattan, euclidean, heuristic_table, make_heuristic
+from astar.ida_star import ida_star
+from astar.ara_star import ara_star
+from astar.grid_cache import GridCache
+from astar.landmarks import Landmarks, dijkstra
+from astar.profiling import PHASES, Profiler
 
 
 
@@ -92,3 +99,431 @@ def test_recomputed_total_cost_matches_reported_total_cost(heuristic_fn):
         recomputed += costs[(states[i], a)]
 
     assert recomputed == result["total_cost"]
+
+
+def test_neighbor_table_matches_move_and_in_bounds():
+    m, n = 4, 6
+    table = neighbor_table(m, n)
+
+    for r in range(m):
+        for c in range(n):
+            s = (r, c)
+            expected = [(a, move(s, a), (s, a)) for a in ACTIONS if in_bounds(move(s, a), m, n)]
+            assert list(table[s]) == expected
+
+    # states outside the grid have no successors
+    costs = buildCosts(m, n, 1, 9, 1)
+    assert list(successors((m, 0), m, n, costs)) == []
+    assert list(successors((0, -1), m, n, costs)) == []
+
+
+@pytest.mark.parametrize(
+    "heuristic_fn",
+    [manhattan, euclidean],
+    ids=["manhattan", "euclidean"]
+)
+def test_indexed_frontier_matches_heapq_total_cost(heuristic_fn):
+    m, n = 15, 12
+    start = (0, 0)
+    goal = (14, 11)
+
+    for seed in (1, 2, 3):
+        costs = buildCosts(m, n, 1, 9, seed)
+        lazy = astar(m, n, start, goal, costs, heuristic_fn=heuristic_fn)
+        indexed = astar(m, n, start, goal, costs, heuristic_fn=heuristic_fn, frontier="indexed")
+
+        assert indexed["status"] == "success"
+        assert indexed["states"][0] == start and indexed["states"][-1] == goal
+        assert indexed["total_cost"] == lazy["total_cost"]
+        assert indexed["max_frontier_size"] <= lazy["max_frontier_size"]
+        assert indexed["generated_nodes"] <= lazy["generated_nodes"]
+
+
+def test_buckets_frontier_matches_heapq_with_manhattan():
+    m, n = 15, 12
+    start = (0, 0)
+    goal = (14, 11)
+
+    for seed in (4, 5, 6):
+        costs = buildCosts(m, n, 1, 9, seed)
+        lazy = astar(m, n, start, goal, costs, heuristic_fn=manhattan)
+        buckets = astar(m, n, start, goal, costs, heuristic_fn=manhattan, frontier="buckets")
+
+        for key in ("states", "actions", "total_cost", "expanded_states", "generated_nodes", "max_frontier_size"):
+            assert buckets[key] == lazy[key]
+
+
+def test_buckets_frontier_rejects_non_integer_heuristic():
+    costs = buildCosts(5, 5, 1, 9, 1)
+
+    with pytest.raises(ValueError):
+        astar(5, 5, (0, 0), (4, 4), costs, heuristic_fn=euclidean, frontier="buckets")
+
+
+@pytest.mark.parametrize(
+    "heuristic_fn",
+    [manhattan, euclidean],
+    ids=["manhattan", "euclidean"]
+)
+def test_bidirectional_astar_matches_astar_total_cost(heuristic_fn):
+    m, n = 12, 10
+    for seed in (1, 2, 3):
+        costs = buildCosts(m, n, 1, 9, seed)
+        for start, goal in [((0, 0), (11, 9)), ((11, 9), (0, 0)), ((6, 1), (6, 8)), ((3, 3), (3, 3))]:
+            expected = astar(m, n, start, goal, costs, heuristic_fn=heuristic_fn)
+            result = astar_bidir(m, n, start, goal, costs, heuristic_fn=heuristic_fn)
+
+            assert result["status"] == "success"
+            assert result["states"][0] == start and result["states"][-1] == goal
+            assert len(result["actions"]) == len(result["states"]) - 1 == result["steps"]
+
+            recomputed = 0
+            for i, a in enumerate(result["actions"]):
+                assert move(result["states"][i], a) == result["states"][i + 1]
+                recomputed += costs[(result["states"][i], a)]
+
+            assert recomputed == result["total_cost"] == expected["total_cost"]
+
+
+@pytest.mark.parametrize(
+    "heuristic_fn",
+    [manhattan, euclidean],
+    ids=["manhattan", "euclidean"]
+)
+def test_ida_star_matches_astar_total_cost(heuristic_fn):
+    m, n = 8, 7
+    for seed in (1, 2, 3):
+        costs = buildCosts(m, n, 1, 9, seed)
+        for start, goal in [((0, 0), (7, 6)), ((7, 6), (0, 0)), ((4, 1), (4, 5)), ((3, 3), (3, 3))]:
+            expected = astar(m, n, start, goal, costs, heuristic_fn=heuristic_fn)
+            result = ida_star(m, n, start, goal, costs, heuristic_fn=heuristic_fn)
+
+            assert result["status"] == "success"
+            assert result["states"][0] == start and result["states"][-1] == goal
+
+            recomputed = 0
+            for i, a in enumerate(result["actions"]):
+                assert move(result["states"][i], a) == result["states"][i + 1]
+                recomputed += costs[(result["states"][i], a)]
+
+            assert recomputed == result["total_cost"] == expected["total_cost"]
+
+
+def test_ida_star_reports_reexpansions_and_memory():
+    m, n = 8, 8
+    costs = buildCosts(m, n, 1, 9, 7)
+
+    result = ida_star(m, n, (0, 0), (7, 7), costs, track_memory=True)
+    no_table = ida_star(m, n, (0, 0), (7, 7), costs, tt_size=0)
+
+    assert result["iterations"] > 1
+    assert 0 < result["reexpanded_states"] < result["expanded_states"]
+    assert 1 <= result["peak_stack_depth"] <= m * n
+    assert result["peak_memory_bytes"] > 0
+    assert no_table["total_cost"] == result["total_cost"]
+    assert no_table["peak_memory_bytes"] is None
+
+
+def test_grid_cache_warm_load_matches_buildCosts(tmp_path):
+    cache = GridCache(tmp_path)
+
+    cold = cache.get(9, 7, 1, 9, 5)
+    warm = cache.get(9, 7, 1, 9, 5)
+    expected = buildCosts(9, 7, 1, 9, 5)
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert cold == warm == expected
+    assert list(warm) == list(expected)    # same key order as buildCosts
+    assert cache.get(9, 7, 1, 9, 6) == buildCosts(9, 7, 1, 9, 6)
+
+
+def test_grid_cache_regenerates_a_truncated_file(tmp_path):
+    cache = GridCache(tmp_path)
+    cache.get(5, 5, 1, 1000, 2)      # 2-byte costs, so one byte less is half a value
+    path = cache.path(5, 5, 1, 1000, 2)
+    path.write_bytes(path.read_bytes()[:-1])
+
+    assert cache.load(5, 5, 1, 1000, 2) is None
+    assert cache.get(5, 5, 1, 1000, 2) == buildCosts(5, 5, 1, 1000, 2)
+    assert cache.misses == 2
+
+
+def test_grid_cache_evicts_down_to_max_bytes(tmp_path):
+    cache = GridCache(tmp_path)
+    for seed in (1, 2, 3):
+        cache.get(10, 10, 1, 9, seed)
+    one_grid = cache.path(10, 10, 1, 9, 1).stat().st_size
+
+    cache.max_bytes = 2 * one_grid
+    cache.evict()
+
+    assert cache.nbytes() <= cache.max_bytes
+    assert len(list(tmp_path.glob("*.grid"))) == 2
+
+
+@pytest.mark.parametrize("min_cost, max_cost", [(1, 9), (1, 1), (0, 1000)])
+def test_compat_engine_reproduces_python_stream(min_cost, max_cost):
+    pytest.importorskip("numpy")
+
+    costs = buildCosts(11, 13, min_cost, max_cost, 4)
+    after_python = random.getstate()
+    compat = buildCosts(11, 13, min_cost, max_cost, 4, engine="compat")
+
+    assert compat == costs
+    assert list(compat) == list(costs)
+    assert random.getstate() == after_python
+
+    fresh = buildCosts(11, 13, min_cost, max_cost, 4, engine="numpy")
+    assert list(fresh) == list(costs)
+    assert all(min_cost <= c <= max_cost for c in fresh.values())
+
+
+def test_alt_heuristic_is_admissible_and_keeps_astar_optimal():
+    m, n = 12, 10
+    costs = buildCosts(m, n, 1, 9, 3)
+    lm = Landmarks.build(m, n, costs, k=4)
+    assert lm.k == 4
+
+    goal = (m - 1, 2)
+    true_cost = dijkstra(m, n, costs, goal, reverse=True)  # cost of cell -> goal
+    for r in range(m):
+        for c in range(n):
+            assert 0 <= lm((r, c), goal) <= true_cost[r * n + c]
+
+    alt = astar(m, n, (0, n - 1), goal, costs, heuristic_fn=lm)
+    base = astar(m, n, (0, n - 1), goal, costs, heuristic_fn=manhattan)
+    assert alt["total_cost"] == base["total_cost"]
+    assert alt["expanded_states"] <= base["expanded_states"]
+
+    # the source-side bound used by astar_bidir, and the bidirectional search
+    start = (0, n - 1)
+    from_start = lm.from_source(start)
+    cost_from_start = dijkstra(m, n, costs, start)
+    for r in range(m):
+        for c in range(n):
+            assert from_start((r, c)) == lm(start, (r, c))
+            assert 0 <= from_start((r, c)) <= cost_from_start[r * n + c]
+    assert astar_bidir(m, n, start, goal, costs, heuristic_fn=lm)["total_cost"] == base["total_cost"]
+
+
+def test_grid_cache_persists_landmarks_next_to_the_grid(tmp_path):
+    cache = GridCache(tmp_path)
+
+    built = cache.landmarks(8, 9, 1, 9, 2, k=3)
+    loaded = cache.landmarks(8, 9, 1, 9, 2, k=3)
+
+    assert loaded.cells == built.cells
+    assert loaded.dist_from == built.dist_from and loaded.dist_to == built.dist_to
+    assert len(list(tmp_path.glob("*.alt3"))) == 1
+    assert cache.nbytes() == sum(p.stat().st_size for p in tmp_path.iterdir())
+
+
+@pytest.mark.parametrize("name", ["manhattan_scaled", "axis_min"])
+def test_cost_scaled_heuristics_are_admissible_and_optimal(name):
+    m, n, min_cost = 11, 9, 4
+    costs = buildCosts(m, n, min_cost, 9, 6)
+    h = make_heuristic(name, m, n, min_cost, costs)
+
+    goal = (3, 7)
+    true_cost = dijkstra(m, n, costs, goal, reverse=True)
+    for r in range(m):
+        for c in range(n):
+            assert manhattan((r, c), goal) <= h((r, c), goal) <= true_cost[r * n + c]
+
+    scaled = astar(m, n, (m - 1, 0), goal, costs, heuristic_fn=h)
+    base = astar(m, n, (m - 1, 0), goal, costs, heuristic_fn=manhattan)
+    assert scaled["total_cost"] == base["total_cost"]
+    assert scaled["expanded_states"] <= base["expanded_states"]
+
+
+def test_weighted_astar_stays_within_its_bound():
+    m, n = 20, 20
+    costs = buildCosts(m, n, 1, 9, 8)
+    optimal = astar(m, n, (0, 0), (m - 1, n - 1), costs, heuristic_fn=manhattan)
+
+    for weight in (1.5, 3.0):
+        result = astar(m, n, (0, 0), (m - 1, n - 1), costs, heuristic_fn=manhattan, weight=weight)
+        assert result["status"] == "success"
+        assert result["suboptimality_bound"] == weight
+        assert optimal["total_cost"] <= result["total_cost"] <= weight * optimal["total_cost"]
+        assert result["time_to_first_solution_ms"] == result["runtime_ms"]
+
+    with pytest.raises(ValueError):
+        astar(m, n, (0, 0), (1, 1), costs, heuristic_fn=manhattan, weight=0.5)
+
+
+def test_beam_search_bounds_the_frontier():
+    m, n = 20, 20
+    costs = buildCosts(m, n, 1, 9, 8)
+
+    result = astar(m, n, (0, 0), (m - 1, n - 1), costs, heuristic_fn=manhattan, beam_width=10)
+    assert result["max_frontier_size"] <= 10 + 4
+    assert result["suboptimality_bound"] is None
+    if result["status"] == "success":
+        assert sum(costs[(s, a)] for s, a in zip(result["states"], result["actions"])) == result["total_cost"]
+
+
+def test_ara_star_improves_to_optimal():
+    for seed in (1, 2, 3):
+        m, n = 25, 25
+        costs = buildCosts(m, n, 1, 9, seed)
+        optimal = astar(m, n, (0, 0), (m - 1, n - 1), costs, heuristic_fn=manhattan)["total_cost"]
+
+        result = ara_star(m, n, (0, 0), (m - 1, n - 1), costs, heuristic_fn=manhattan, weight=3.0)
+        solutions = result["solutions"]
+
+        assert result["status"] == "success"
+        assert result["total_cost"] == optimal
+        assert result["suboptimality_bound"] == 1.0
+        assert result["time_to_first_solution_ms"] == solutions[0]["time_ms"]
+        assert sum(costs[(s, a)] for s, a in zip(result["states"], result["actions"])) == optimal
+
+        costs_found = [s["total_cost"] for s in solutions]
+        assert costs_found == sorted(costs_found, reverse=True)
+        for s in solutions:
+            assert s["total_cost"] <= s["suboptimality_bound"] * optimal
+
+        # the reported cost is the last solution's, whatever path it ends on
+        assert solutions[-1]["total_cost"] == result["total_cost"]
+
+
+def test_ara_star_claims_no_bound_for_an_inadmissible_heuristic():
+    # manhattan overestimates when steps can cost 0
+    costs = buildCosts(6, 6, 0, 3, 1)
+    optimal = astar(6, 6, (0, 0), (5, 5), costs, heuristic_fn=lambda s, g: 0)["total_cost"]
+
+    result = ara_star(6, 6, (0, 0), (5, 5), costs, heuristic_fn=manhattan, weight=3.0, admissible=False)
+
+    assert result["status"] == "success"
+    assert result["total_cost"] > optimal
+    assert result["suboptimality_bound"] is None
+    assert result["solutions"][-1]["total_cost"] == result["total_cost"]
+    assert all(s["suboptimality_bound"] is None for s in result["solutions"])
+
+
+def test_ara_star_with_no_time_left_fails_cleanly():
+    costs = buildCosts(30, 30, 1, 9, 1)
+    result = ara_star(30, 30, (0, 0), (29, 29), costs, time_budget_ms=0)
+    assert result["status"] == "failure"
+    assert result["solutions"] == [] and result["time_to_first_solution_ms"] is None
+
+
+@pytest.mark.parametrize("h_cache", ["memo", "table"])
+@pytest.mark.parametrize(
+    "heuristic_fn",
+    [manhattan, euclidean],
+    ids=["manhattan", "euclidean"]
+)
+def test_h_cache_does_not_change_the_search(h_cache, heuristic_fn):
+    m, n = 15, 12
+    costs = buildCosts(m, n, 1, 9, 9)
+
+    plain = astar(m, n, (0, 0), (m - 1, n - 1), costs, heuristic_fn=heuristic_fn)
+    cached = astar(m, n, (0, 0), (m - 1, n - 1), costs, heuristic_fn=heuristic_fn, h_cache=h_cache)
+
+    for key in ("states", "total_cost", "expanded_states", "generated_nodes"):
+        assert cached[key] == plain[key]
+
+
+def test_heuristic_table_matches_heuristic_fn():
+    m, n, goal = 6, 8, (4, 1)
+    costs = buildCosts(m, n, 2, 9, 3)
+
+    # vectorized (numpy when installed) and plain-loop heuristics alike
+    for heuristic_fn in (manhattan, euclidean, make_heuristic("manhattan_scaled", m, n, 2, costs),
+                         make_heuristic("axis_min", m, n, 2, costs)):
+        table = heuristic_table(heuristic_fn, m, n, goal)
+        assert table == [[heuristic_fn((r, c), goal) for c in range(n)] for r in range(m)]
+
+    with pytest.raises(ValueError):
+        astar(m, n, (0, 0), goal, costs, heuristic_fn=manhattan, h_cache="lru")
+
+
+def test_expanded_states_counts_each_expansion_once():
+    m, n = 20, 20
+    costs = buildCosts(m, n, 1, 9, 4)
+
+    for frontier in ("heapq", "indexed", "buckets"):
+        result = astar(m, n, (0, 0), (m - 1, n - 1), costs, heuristic_fn=manhattan, frontier=frontier)
+        # manhattan is consistent, so no state is expanded twice
+        assert result["expanded_states"] <= m * n
+        assert result["reopened"] == 0
+
+
+def test_consistent_fast_path_matches_astar_with_a_smaller_frontier():
+    m, n = 30, 30
+    for seed in (1, 2, 3):
+        costs = buildCosts(m, n, 1, 9, seed)
+        plain = astar(m, n, (0, 0), (m - 1, n - 1), costs, heuristic_fn=manhattan)
+        fast = astar(m, n, (0, 0), (m - 1, n - 1), costs, heuristic_fn=manhattan, consistent=True)
+
+        assert fast["total_cost"] == plain["total_cost"]
+        assert fast["expanded_states"] == plain["expanded_states"]
+        assert fast["generated_nodes"] < plain["generated_nodes"]
+        assert fast["max_frontier_size"] <= plain["max_frontier_size"]
+
+
+def test_inconsistent_heuristic_reopens_states_and_stays_optimal():
+    m, n, goal = 20, 20, (19, 19)
+    costs = buildCosts(m, n, 1, 9, 2)
+
+    # admissible but inconsistent: a random fraction of the true cost-to-go
+    true_cost = dijkstra(m, n, costs, goal, reverse=True)
+    rng = random.Random(0)
+    h_values = {(r, c): true_cost[r * n + c] * rng.random() for r in range(m) for c in range(n)}
+
+    def h(state, _goal):
+        return h_values[state]
+
+    for frontier in ("heapq", "indexed"):
+        result = astar(m, n, (0, 0), goal, costs, heuristic_fn=h, frontier=frontier)
+        assert result["total_cost"] == true_cost[0]
+        assert result["reopened"] > 0
+
+
+@pytest.mark.parametrize("frontier", ["heapq", "indexed"])
+def test_budget_cutoff_returns_partial_path_closest_to_goal(frontier):
+    m, n, start, goal = 30, 30, (0, 0), (29, 29)
+    costs = buildCosts(m, n, 1, 9, 1)
+
+    result = astar(m, n, start, goal, costs, heuristic_fn=manhattan, frontier=frontier, max_expansions=50)
+
+    assert result["status"] == "cutoff"
+    assert result["cutoff_reason"] == "max_expansions"
+    assert result["expanded_states"] == 50
+    assert result["total_cost"] is None
+    states = result["states"]
+    assert states[0] == start and states[-1] != goal
+    assert [move(s, a) for s, a in zip(states, result["actions"])] == states[1:]
+    # closer to the goal than the start is
+    assert manhattan(states[-1], goal) < manhattan(start, goal)
+
+    limited = astar(m, n, start, goal, costs, heuristic_fn=manhattan, frontier=frontier, max_frontier=10)
+    assert limited["status"] == "cutoff" and limited["cutoff_reason"] == "max_frontier"
+
+    unlimited = astar(m, n, start, goal, costs, heuristic_fn=manhattan, frontier=frontier, deadline_ms=60_000)
+    assert unlimited["status"] == "success"
+
+
+@pytest.mark.parametrize("frontier", ["heapq", "indexed", "buckets"])
+def test_profiler_counts_phases_and_calls_back_on_every_event(frontier):
+    m, n = 20, 20
+    costs = buildCosts(m, n, 1, 9, 3)
+    expanded, generated = [], []
+    profiler = Profiler(on_expand=lambda state, g: expanded.append(state),
+                        on_generate=lambda state, g: generated.append(state))
+
+    result = astar(m, n, (0, 0), (m - 1, n - 1), costs, heuristic_fn=manhattan, frontier=frontier,
+                   profiler=profiler)
+    plain = astar(m, n, (0, 0), (m - 1, n - 1), costs, heuristic_fn=manhattan, frontier=frontier)
+
+    assert result["states"] == plain["states"]
+    assert result["expanded_states"] == plain["expanded_states"]
+    for phase in PHASES:
+        assert result[f"{phase}_ns"] >= 0
+        assert f"{phase}_ns" not in plain
+    assert result["frontier_ns"] > 0 and result["heuristic_ns"] > 0 and result["successors_ns"] > 0
+
+    assert len(expanded) == result["expanded_states"]
+    assert len(generated) == result["generated_nodes"]
+    assert generated[0] == (0, 0)
@@ -1,14 +1,33 @@
 import random
 
+import pytest
+
 from tsp.tsp import (
     generate_cities,
     random_tour,
     tour_cost,
     iter_two_opt_moves,
     two_opt_delta,
+    euclidean,
+    apply_two_opt,
+    two_opt_in_place,
+    reverse_segment,
+    NEIGHBORHOODS,
 )
+from array import array
+
+from tsp.distance import DistanceMatrix, LazyDistanceMatrix, distance_matrix
+from tsp.neighbors import neighbor_lists
 
-from tsp.hill_climbing import hill_climb_best_improvement
+from tsp.hill_climbing import (
+    hill_climb_best_improvement,
+    hill_climb_two_opt_nl,
+    hill_climb_neighborhood,
+    best_neighborhood_move,
+    best_segment_move,
+    random_restart_hill_climbing,
+    OPERATORS,
+)
 
 
 def test_tour_is_valid_permutation_each_city_once():
@@ -47,3 +66,183 @@ def test_hill_climbing_terminates_no_improving_neighbor_exists():
     # i.e., for all moves, delta >= 0
     for (i, k) in iter_two_opt_moves(final_tour):
         assert two_opt_delta(final_tour, cities, i, k) >= 0.0
+
+
+def test_distance_matrices_match_euclidean_and_tour_cost():
+    n = 150
+    rng = random.Random(3)
+    cities = generate_cities(n, rng)
+    tour = random_tour(n, rng)
+
+    full = DistanceMatrix(cities)
+    lazy = LazyDistanceMatrix(cities, max_rows=4)
+    for a in range(n):
+        # bit for bit, so deltas and tie-breaks match the euclidean() code
+        assert list(full.row(a)) == [euclidean(cities[a], city) for city in cities]
+        assert list(lazy.row(a)) == list(full.row(a))
+        assert lazy.dist(a, n - 1 - a) == full.dist(a, n - 1 - a)
+    # only the most recently used rows are kept
+    assert lazy.nbytes() == 4 * n * 8
+
+    assert tour_cost(tour, full) == tour_cost(tour, cities)
+    for (i, k) in iter_two_opt_moves(tour):
+        assert two_opt_delta(tour, full, i, k) == two_opt_delta(tour, cities, i, k)
+
+    small = DistanceMatrix(cities, typecode="f")
+    assert small.nbytes() == full.nbytes() // 2
+    assert abs(tour_cost(tour, small) - tour_cost(tour, cities)) < 1e-3
+    assert isinstance(distance_matrix(cities, max_bytes=100), LazyDistanceMatrix)
+
+
+def test_hill_climbing_on_a_distance_matrix_matches_city_list():
+    rng = random.Random(11)
+    cities = generate_cities(25, rng)
+    start_tour = random_tour(25, rng)
+
+    assert (hill_climb_best_improvement(start_tour, DistanceMatrix(cities))
+            == hill_climb_best_improvement(start_tour, cities))
+    assert (hill_climb_best_improvement(start_tour, LazyDistanceMatrix(cities, max_rows=3))
+            == hill_climb_best_improvement(start_tour, cities))
+
+
+def test_numpy_engine_makes_the_same_moves_as_the_scalar_scan():
+    for n, seed in ((5, 1), (30, 2), (140, 3)):
+        rng = random.Random(seed)
+        dm = DistanceMatrix(generate_cities(n, rng))
+        start_tour = random_tour(n, rng)
+
+        assert (hill_climb_best_improvement(start_tour, dm, engine="numpy")
+                == hill_climb_best_improvement(start_tour, dm))
+
+
+def test_in_place_two_opt_gives_the_same_tour():
+    rng = random.Random(9)
+    cities = generate_cities(12, rng)
+    tour = random_tour(12, rng)
+
+    for (i, k) in iter_two_opt_moves(tour):
+        moved = list(tour)
+        two_opt_in_place(moved, i, k)
+        assert moved == apply_two_opt(tour, i, k)
+
+        # reverse_segment may reverse the other side instead; it is the same
+        # cycle, so the cost and the position lookup must agree
+        for t in (list(tour), array("i", tour)):
+            pos = [0] * len(t)
+            for p, city in enumerate(t):
+                pos[city] = p
+            reverse_segment(t, pos, i, k)
+            assert tour_cost(list(t), cities) == pytest.approx(tour_cost(moved, cities))
+            assert all(pos[city] == p for p, city in enumerate(t))
+
+    # a run that wraps around the end of the tour
+    t = [0, 1, 2, 3, 4, 5, 6, 7]
+    pos = list(range(8))
+    reverse_segment(t, pos, 6, 1)       # 6 7 0 1 -> 1 0 7 6
+    assert t == [7, 6, 2, 3, 4, 5, 1, 0]
+
+
+def test_neighbor_lists_are_the_k_nearest_cities():
+    rng = random.Random(4)
+    cities = generate_cities(60, rng) + [(50.0, 50.0), (50.0, 50.0)]  # a duplicate city
+    lists = neighbor_lists(cities, k=6)
+
+    for a in range(len(cities)):
+        nearest = sorted((euclidean(cities[a], cities[b]), b) for b in range(len(cities)) if b != a)
+        assert lists[a] == [b for _, b in nearest[:6]]
+    assert neighbor_lists(cities[:3], k=6)[0] == [b for _, b in sorted(
+        (euclidean(cities[0], cities[b]), b) for b in (1, 2))]
+
+
+def test_two_opt_nl_ends_with_no_improving_neighbor_list_move():
+    n = 120
+    rng = random.Random(8)
+    cities = generate_cities(n, rng)
+    dm = DistanceMatrix(cities)
+    lists = neighbor_lists(cities, k=5)
+    start_tour = random_tour(n, rng)
+
+    tour, cost, iterations, evaluations = hill_climb_two_opt_nl(start_tour, dm, lists)
+
+    assert sorted(tour) == list(range(n))
+    assert iterations > 0 and evaluations >= iterations
+    assert abs(cost - tour_cost(tour, cities)) < 1e-6
+    assert cost < tour_cost(start_tour, cities)
+
+    # every move the operator considers (c a listed neighbor of a closer
+    # than b, in both directions) is non-improving
+    pos = {city: p for p, city in enumerate(tour)}
+    for a in range(n):
+        for step in (1, -1):
+            b = tour[(pos[a] + step) % n]
+            for c in lists[a]:
+                d = tour[(pos[c] + step) % n]
+                if c == b or d == a or dm.dist(a, c) >= dm.dist(a, b):
+                    continue
+                delta = dm.dist(a, c) + dm.dist(b, d) - dm.dist(a, b) - dm.dist(c, d)
+                assert delta >= -1e-9
+
+
+def test_restart_records_report_evaluations_per_operator():
+    cities = generate_cities(20, random.Random(6))
+
+    by_operator = {}
+    for operator in ("two_opt", "two_opt_nl"):
+        best_tour, best_cost, records = random_restart_hill_climbing(
+            20, cities, restarts=3, seed=6, operator=operator, rng=random.Random(6))
+
+        assert [r["operator"] for r in records] == [operator] * 3
+        assert best_cost == min(r["best_cost"] for r in records)
+        by_operator[operator] = records
+
+    # the same initial tours; best-improvement scans all 171 moves once per
+    # move taken plus a final scan, the neighbor lists far fewer
+    for full, nl in zip(by_operator["two_opt"], by_operator["two_opt_nl"]):
+        assert full["initial_tour"] == nl["initial_tour"]
+        assert full["evaluations"] == 171 * (full["iterations"] + 1)
+        assert nl["iterations"] <= nl["evaluations"] < full["evaluations"]
+
+
+def test_every_neighborhood_delta_matches_the_applied_tour():
+    for n in (4, 5, 9):
+        rng = random.Random(n)
+        cities = generate_cities(n, rng)
+        tour = random_tour(n, rng)
+
+        for operator, (moves, delta, apply) in NEIGHBORHOODS.items():
+            for move in moves(tour):
+                moved = apply(tour, *move)
+                assert sorted(moved) == list(range(n))
+                assert (tour_cost(moved, cities) - tour_cost(tour, cities)
+                        == pytest.approx(delta(tour, cities, *move), abs=1e-9))
+
+
+def test_segment_scan_matches_the_generic_scan():
+    for n, seed in ((5, 1), (12, 2), (40, 3)):
+        rng = random.Random(seed)
+        dm = DistanceMatrix(generate_cities(n, rng))
+        tour = random_tour(n, rng)
+
+        assert best_segment_move(tour, dm) == best_neighborhood_move(tour, dm, "or_opt")
+        assert best_segment_move(tour, dm, reverse=True) == best_neighborhood_move(tour, dm, "three_opt")
+
+
+def test_neighborhood_climbs_end_in_a_local_optimum_for_every_operator():
+    n = 25
+    rng = random.Random(12)
+    cities = generate_cities(n, rng)
+    dm = DistanceMatrix(cities)
+    start_tour = random_tour(n, rng)
+
+    for operator, (moves, delta, _) in NEIGHBORHOODS.items():
+        tour, cost, iterations, evaluations = hill_climb_neighborhood(start_tour, dm, operator)
+
+        assert sorted(tour) == list(range(n))
+        assert cost == pytest.approx(tour_cost(tour, cities))
+        assert all(delta(tour, dm, *move) >= -1e-9 for move in moves(tour))
+        assert evaluations == (iterations + 1) * len(list(moves(start_tour)))
+
+    # two_opt through the registry is the same climb as the dedicated one
+    tour, cost, iterations, _ = hill_climb_neighborhood(start_tour, dm, "two_opt")
+    assert (tour, iterations) == hill_climb_best_improvement(start_tour, dm)[::2]
+    assert set(OPERATORS) == set(NEIGHBORHOODS) | {"two_opt_nl"}
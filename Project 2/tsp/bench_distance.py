@@ -0,0 +1,80 @@
+# tsp/bench_distance.py
+# Run: python -m tsp.bench_distance
+#
+# Distance lookups for 2-opt at n = 50, 500 and 2000 random cities:
+#   build_ms: time to build the distances (0 for plain euclidean() calls)
+#   MB:       memory held by the distances
+#   delta ns: ns per two_opt_delta(tour, cities, i, k) call
+#   scan_ms:  one full best-improvement neighborhood scan (n^2/2 moves); the
+#             euclidean row is the old iter_two_opt_moves + two_opt_delta loop,
+#             the others hill_climbing.best_two_opt_move
+
+import random
+import time
+
+from .tsp import generate_cities, iter_two_opt_moves, random_tour, two_opt_delta
+from .distance import DistanceMatrix, LazyDistanceMatrix
+from .hill_climbing import best_two_opt_move
+
+SIZES = (50, 500, 2000)
+SEED = 1
+DELTA_CALLS = 200_000
+
+
+def old_scan(tour, cities):
+    best_delta, best_move = 0.0, None
+    for i, k in iter_two_opt_moves(tour):
+        delta = two_opt_delta(tour, cities, i, k)
+        if delta < best_delta:
+            best_delta, best_move = delta, (i, k)
+    return best_delta, best_move
+
+
+def main():
+    # keep the numpy import out of the timings
+    DistanceMatrix([(0.0, 0.0), (1.0, 1.0)])
+
+    print("    n source        | build_ms |     MB | delta ns |  scan_ms | move")
+
+    for n in SIZES:
+        rng = random.Random(SEED)
+        cities = generate_cities(n, rng)
+        tour = random_tour(n, rng)
+        moves = [(rng.randrange(1, n - 1), 0) for _ in range(DELTA_CALLS)]
+        moves = [(i, rng.randrange(i + 1, n)) for i, _ in moves]
+
+        sources = [
+            ("euclidean", lambda: cities),
+            ("matrix d", lambda: DistanceMatrix(cities)),
+            ("matrix f", lambda: DistanceMatrix(cities, typecode="f")),
+            ("lazy d", lambda: LazyDistanceMatrix(cities)),
+        ]
+        base_move = None
+        for name, build in sources:
+            t0 = time.perf_counter()
+            dist = build()
+            build_ms = (time.perf_counter() - t0) * 1000.0
+            mb = dist.nbytes() / 2**20 if hasattr(dist, "nbytes") else 0.0
+
+            t0 = time.perf_counter()
+            for i, k in moves:
+                two_opt_delta(tour, dist, i, k)
+            delta_ns = (time.perf_counter() - t0) * 1e9 / DELTA_CALLS
+
+            t0 = time.perf_counter()
+            if dist is cities:
+                _, move = old_scan(tour, cities)
+            else:
+                _, move = best_two_opt_move(tour, dist)
+            scan_ms = (time.perf_counter() - t0) * 1000.0
+            if base_move is None:
+                base_move = move
+            if hasattr(dist, "nbytes"):
+                mb = dist.nbytes() / 2**20   # lazy rows are only built by the scan
+
+            same = "same" if move == base_move else "DIFFERENT"
+            print(f"{n:>5} {name:<13} | {build_ms:>8.1f} | {mb:>6.1f} | {delta_ns:>8.1f} | {scan_ms:>8.1f} | {same}")
+
+
+if __name__ == "__main__":
+    main()
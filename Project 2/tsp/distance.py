@@ -0,0 +1,162 @@
+# tsp/distance.py
+
+import math
+from array import array
+from collections import OrderedDict
+
+# Pairwise city distances, computed once per instance instead of one
+# euclidean() call per lookup. Both classes give
+#     dist(a, b)   distance between cities a and b (indices into cities)
+#     row(a)       every distance from a, as an array indexed by city
+# with the same values as tsp.euclidean (same formula, so 2-opt deltas and
+# tour costs match the old code bit for bit with typecode "d").
+#
+# DistanceMatrix holds all n^2 distances (8 bytes each, 4 with typecode "f").
+# LazyDistanceMatrix computes rows on demand and keeps the max_rows most
+# recently used ones, for instances too large for a full matrix.
+# distance_matrix() picks one of them by size.
+
+FULL_MAX_BYTES = 256 << 20      # largest full matrix distance_matrix() builds
+LAZY_ROWS = 1024                # rows a LazyDistanceMatrix keeps by default
+
+
+def _numpy():
+    # numpy if it is installed (it makes building rows much faster), else None
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _python_row(cities, a, typecode):
+    xa, ya = cities[a]
+    sqrt = math.sqrt
+    return array(typecode, [sqrt((xa - xb)**2 + (ya - yb)**2) for xb, yb in cities])
+
+
+class DistanceMatrix:
+    """
+    All pairwise distances of one instance: rows[a][b] = d(a, b).
+
+        dm = DistanceMatrix(cities)
+        tour_cost(tour, dm)
+        hill_climb_best_improvement(tour, dm)
+
+    typecode "d" stores float64, "f" float32 (half the memory, distances
+    rounded to about 7 digits).
+    """
+
+    def __init__(self, cities, typecode="d"):
+        self.cities = cities
+        self.n = len(cities)
+        self.typecode = typecode
+
+        np = _numpy()
+        if np is not None and self.n:
+            # one vectorized pass, the same float64 formula as euclidean().
+            # float_power calls the C pow() like Python's ** does; numpy's **2
+            # is x * x, which can differ from it in the last bit
+            xy = np.asarray(cities, dtype=np.float64)
+            dx = xy[:, 0, None] - xy[None, :, 0]
+            dy = xy[:, 1, None] - xy[None, :, 1]
+            full = np.sqrt(np.float_power(dx, 2) + np.float_power(dy, 2)).astype(typecode, copy=False)
+            self.rows = [array(typecode, full[a].tobytes()) for a in range(self.n)]
+        else:
+            self.rows = [_python_row(cities, a, typecode) for a in range(self.n)]
+
+    def __len__(self):
+        return self.n
+
+    def dist(self, a, b):
+        return self.rows[a][b]
+
+    def row(self, a):
+        return self.rows[a]
+
+    def nbytes(self):
+        return self.n * self.n * array(self.typecode).itemsize
+
+    def to_numpy(self):
+        # (n, n) float64 numpy array of the distances (needs numpy)
+        import numpy as np
+        full = np.frombuffer(b"".join(self.rows), dtype=self.typecode).reshape(self.n, self.n)
+        return full.astype(np.float64)
+
+
+class LazyDistanceMatrix:
+    """
+    Distances computed on demand. row(a) builds a's row the first time and
+    keeps the max_rows most recently used rows; dist(a, b) reads a cached row
+    of a or b, or computes the one distance directly.
+    """
+
+    def __init__(self, cities, typecode="d", max_rows=LAZY_ROWS):
+        self.cities = cities
+        self.n = len(cities)
+        self.typecode = typecode
+        self.max_rows = max_rows
+        self._rows = OrderedDict()
+
+        np = _numpy() if self.n else None
+        self._np = np
+        if np is not None:
+            xy = np.asarray(cities, dtype=np.float64)
+            self._x, self._y = xy[:, 0].copy(), xy[:, 1].copy()
+
+    def __len__(self):
+        return self.n
+
+    def row(self, a):
+        rows = self._rows
+        r = rows.get(a)
+        if r is not None:
+            rows.move_to_end(a)
+            return r
+
+        np = self._np
+        if np is not None:
+            x, y = self._x, self._y
+            # float_power for the same values as euclidean() (see DistanceMatrix)
+            full = np.sqrt(np.float_power(x[a] - x, 2) + np.float_power(y[a] - y, 2))
+            r = array(self.typecode, full.astype(self.typecode, copy=False).tobytes())
+        else:
+            r = _python_row(self.cities, a, self.typecode)
+
+        rows[a] = r
+        if len(rows) > self.max_rows:
+            rows.popitem(last=False)
+        return r
+
+    def dist(self, a, b):
+        rows = self._rows
+        r = rows.get(a)
+        if r is not None:
+            return r[b]
+        r = rows.get(b)
+        if r is not None:
+            return r[a]
+
+        (xa, ya), (xb, yb) = self.cities[a], self.cities[b]
+        d = math.sqrt((xa - xb)**2 + (ya - yb)**2)
+        # round like a stored row would
+        return d if self.typecode == "d" else array(self.typecode, [d])[0]
+
+    def nbytes(self):
+        return len(self._rows) * self.n * array(self.typecode).itemsize
+
+
+def distance_matrix(cities, typecode="d", max_bytes=FULL_MAX_BYTES):
+    # a full DistanceMatrix when it fits in max_bytes, else a LazyDistanceMatrix
+    n = len(cities)
+    if n * n * array(typecode).itemsize <= max_bytes:
+        return DistanceMatrix(cities, typecode)
+    return LazyDistanceMatrix(cities, typecode)
+
+
+def as_distances(cities):
+    # cities as a distance matrix: a DistanceMatrix / LazyDistanceMatrix is
+    # used as is, a list of (x, y) gets one built
+    if hasattr(cities, "row"):
+        return cities
+    return distance_matrix(cities)
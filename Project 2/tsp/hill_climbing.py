@@ -1,42 +1,379 @@
 # tsp/hill_climbing.py
 
 import time
-from tsp.tsp import tour_cost, random_tour, iter_two_opt_moves, two_opt_delta, apply_two_opt
+from collections import deque
+from tsp.tsp import tour_cost, random_tour, two_opt_in_place, reverse_segment, NEIGHBORHOODS, OR_OPT_MAX
+from tsp.distance import DistanceMatrix, as_distances
+from tsp.neighbors import NEIGHBORS, neighbor_lists
 
+# "two_opt": best-improvement 2-opt over all O(n^2) moves
+#            (hill_climb_best_improvement)
+# "or_opt", "three_opt": best-improvement over the tsp.NEIGHBORHOODS moves
+#            (hill_climb_neighborhood), O(n^2) segment insertions
+# "two_opt_nl": first-improvement 2-opt over neighbor lists with don't-look
+#               bits (hill_climb_two_opt_nl), O(n k) moves per pass
+OPERATORS = tuple(NEIGHBORHOODS) + ("two_opt_nl",)
 
-def hill_climb_best_improvement(initial_tour, cities):
+# "python": scan moves one by one (best_two_opt_move)
+# "numpy": compute every move's delta in one array expression and take the
+#          argmin; needs numpy and a full DistanceMatrix, accepts the same moves
+ENGINES = ("python", "numpy")
+NUMPY_BLOCK_ROWS = 128  # rows of the delta matrix the numpy scan computes at once
+IMPROVEMENT_EPS = 1e-9  # two_opt_nl and hill_climb_neighborhood only take moves with delta < -IMPROVEMENT_EPS
+
+
+def two_opt_move_count(n):
+    # moves iter_two_opt_moves yields for n cities, i.e. deltas per full scan
+    return (n - 1) * (n - 2) // 2 if n > 2 else 0
+
+
+def best_two_opt_move(tour, dm):
+    """
+    (best_delta, (i, k)) of the best improving 2-opt move on tour, or
+    (0.0, None) if none improves. dm is a distance matrix (see
+    tsp/distance.py). The moves scanned (iter_two_opt_moves order, the first
+    strictly best delta wins) and their deltas are the same as two_opt_delta's.
+    """
+    row = dm.row
+    n = len(tour)
+
+    best_move = None
+    best_delta = 0.0  # best improvement (most negative). 0 means no improvement found.
+
+    # succ[j] = tour[j + 1] (cyclic) and edge[j] = d(tour[j], succ[j]),
+    # so a move (i, k) needs only the rows of tour[i - 1] and tour[i]
+    succ = tour[1:] + tour[:1]
+    edge = [dm.dist(a, b) for a, b in zip(tour, succ)]
+
+    for i in range(1, n - 1):
+        row_a, row_b = row(tour[i - 1]), row(tour[i])
+        before_ab = edge[i - 1]
+
+        for k, c, d, before_cd in zip(range(i + 1, n), tour[i + 1:], succ[i + 1:], edge[i + 1:]):
+            # same terms and order as two_opt_delta
+            delta = (row_a[c] + row_b[d]) - (before_ab + before_cd)
+            if delta < best_delta:
+                best_delta = delta
+                best_move = (i, k)
+
+    return best_delta, best_move
+
+
+def hill_climb_best_improvement(initial_tour, cities, engine="python"):
     """
     Algorithm 1 Hill Climbing with 2-opt (Best-Improvement)
     Optimized using O(1) 2-opt delta evaluation.
+
+    cities is a list of (x, y) or a distance matrix (see tsp/distance.py);
+    a list gets a matrix built for this call, so pass one when climbing the
+    same instance more than once. engine is one of ENGINES.
     """
+    dm = as_distances(cities)
+    if engine == "numpy":
+        return hill_climb_best_improvement_numpy(initial_tour, dm)
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine} (expected one of {ENGINES})")
+
     current = list(initial_tour)
-    current_cost = tour_cost(current, cities)
+    current_cost = tour_cost(current, dm)
     iterations = 0
 
     while True:
-        best_move = None
-        best_delta = 0.0  # best improvement (most negative). 0 means no improvement found.
-
-        for (i, k) in iter_two_opt_moves(current):
-            delta = two_opt_delta(current, cities, i, k)
-            if delta < best_delta:
-                best_delta = delta
-                best_move = (i, k)
+        best_delta, best_move = best_two_opt_move(current, dm)
 
         if best_move is None:
             return current, current_cost, iterations
         else:
             i, k = best_move
-            current = apply_two_opt(current, i, k)
+            # always tour[i:k + 1] (not the shorter side), so the tours
+            # match the numpy engine's
+            two_opt_in_place(current, i, k)
             current_cost = current_cost + best_delta
             iterations += 1
 
 
+def hill_climb_best_improvement_numpy(initial_tour, dm):
+    """
+    hill_climb_best_improvement with every 2-opt delta of an iteration
+    computed at once. P[x, y] = d(tour[x], tour[y]) is the distance matrix in
+    tour position order, with column n repeating column 0, so for move (i, k)
+
+        d(a, c) = P[i - 1, k]     d(b, d) = P[i, k + 1]
+        d(a, b) = P[i - 1, i]     d(c, d) = P[k, k + 1]
+
+    The deltas are two views of P plus the diagonal above the main one,
+    added in the same order as the scalar scan (the same floats). Only the
+    valid moves (k > i) are computed, in blocks of rows; the first minimum
+    in row-major order is the move the scalar scan picks. A move reverses
+    rows and columns i..k of P in place instead of rebuilding it.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("engine='numpy' needs numpy installed") from None
+    if not isinstance(dm, DistanceMatrix):
+        raise ValueError("engine='numpy' needs a full DistanceMatrix")
+
+    tour = np.array(initial_tour, dtype=np.intp)
+    n = len(tour)
+    current_cost = tour_cost(list(initial_tour), dm)
+    iterations = 0
+    if n < 4:
+        # no move changes a tour of 3 cities or less
+        return list(initial_tour), current_cost, iterations
+
+    full = dm.to_numpy()
+    P = np.empty((n, n + 1))
+    P[:, :n] = full[np.ix_(tour, tour)]
+    P[:, n] = P[:, 0]
+
+    d_ac = P[:n - 2, :n]            # row r = i - 1: d(tour[i - 1], tour[k])
+    d_bd = P[1:n - 1, 1:]           # row r = i - 1: d(tour[i], tour[k + 1])
+
+    # a block covers rows r0..r0+B-1 and columns k >= r0 + 2; in block
+    # coordinates move (r, k) is valid when column >= row
+    B = NUMPY_BLOCK_ROWS
+    invalid = np.tril(np.ones((B, B), dtype=bool), k=-1)
+
+    while True:
+        edge = np.diagonal(P, 1)    # edge[j] = d(tour[j], tour[j + 1])
+        best_delta, r, k = 0.0, -1, -1
+
+        for r0 in range(0, n - 2, B):
+            r1, c0 = min(r0 + B, n - 2), r0 + 2
+            delta = d_ac[r0:r1, c0:] + d_bd[r0:r1, c0:]
+            delta -= edge[r0:r1, None] + edge[None, c0:]
+            np.putmask(delta[:, :B], invalid[:r1 - r0, :n - c0], np.inf)
+
+            j = int(delta.argmin())
+            if delta.flat[j] < best_delta:
+                best_delta = float(delta.flat[j])
+                r, k = r0 + j // (n - c0), c0 + j % (n - c0)
+
+        if r < 0:
+            return tour.tolist(), current_cost, iterations
+
+        i = r + 1
+        tour[i:k + 1] = tour[i:k + 1][::-1].copy()
+        P[i:k + 1] = P[i:k + 1][::-1].copy()
+        P[:, i:k + 1] = P[:, i:k + 1][:, ::-1].copy()
+        current_cost = current_cost + best_delta
+        iterations += 1
+
+
+def hill_climb_two_opt_nl(initial_tour, cities, neighbors=None, k=NEIGHBORS):
+    """
+    First-improvement 2-opt restricted to neighbor lists, with don't-look bits.
+
+    Each active city a tries the moves that add an edge (a, c) for c in
+    neighbors[a], nearest first, removing a's edge to its successor b (and
+    c's to its successor d) or to its predecessor (and c's to its
+    predecessor). A move can only improve when d(a, c) < d(a, b), so the scan
+    of a's list stops at the first c that is not closer. The first move with
+    delta < -IMPROVEMENT_EPS is applied and its four endpoints are made
+    active again; a city with no improving move goes inactive. When no city
+    is active, every city is checked once more, and the climb ends after a
+    pass that applies no move.
+
+    cities is a list of (x, y) or a distance matrix (see tsp/distance.py);
+    neighbors is neighbor_lists(cities, k) (built here when None).
+    Returns (tour, cost, iterations, evaluations), evaluations being the
+    number of move deltas computed.
+    """
+    dm = as_distances(cities)
+    dist = dm.dist
+    if neighbors is None:
+        neighbors = neighbor_lists(dm.cities, k, dm)
+
+    # the tour and its position lookup, updated in place by reverse_segment,
+    # so applying a move allocates nothing. Lists rather than array("i"):
+    # swapping list items moves references, while every array read boxes a
+    # new int, which makes the swaps about twice as slow
+    tour = list(initial_tour)
+    n = len(tour)
+    pos = [0] * n
+    for p, city in enumerate(tour):
+        pos[city] = p
+
+    current_cost = tour_cost(tour, dm)
+    iterations = 0
+    evaluations = 0
+
+    queue = deque()
+    active = bytearray(n)           # active[a] == 0: a's don't-look bit is set
+    checked = -1                    # iterations when every city was last queued
+
+    while True:
+        if not queue:
+            # a reversal also flips the successor / predecessor of the cities
+            # inside the segment, which can open moves for inactive cities, so
+            # stop only after a pass over every city takes no move
+            if checked == iterations:
+                break
+            checked = iterations
+            queue.extend(tour)
+            active = bytearray([1]) * n
+
+        a = queue.popleft()
+        active[a] = 0
+
+        improved = False
+        for forward in (True, False):
+            pa = pos[a]
+            b = tour[pa + 1 if pa + 1 < n else 0] if forward else tour[pa - 1]
+            d_ab = dist(a, b)
+
+            for c in neighbors[a]:
+                d_ac = dist(a, c)
+                if d_ac >= d_ab:
+                    break
+                pc = pos[c]
+                d = tour[pc + 1 if pc + 1 < n else 0] if forward else tour[pc - 1]
+                if c == b or d == a:
+                    continue
+
+                evaluations += 1
+                delta = (d_ac + dist(b, d)) - (d_ab + dist(c, d))
+                if delta < -IMPROVEMENT_EPS:
+                    # a b ... c d -> a c ... b d, or d c ... b a -> d b ... c a
+                    if forward:
+                        reverse_segment(tour, pos, pos[b], pc)
+                    else:
+                        reverse_segment(tour, pos, pc, pos[b])
+                    current_cost = current_cost + delta
+                    iterations += 1
+
+                    for city in (a, b, c, d):
+                        if not active[city]:
+                            active[city] = 1
+                            queue.append(city)
+                    improved = True
+                    break
+            if improved:
+                break
+
+    return tour, current_cost, iterations, evaluations
+
+
+def best_neighborhood_move(tour, dm, operator):
+    """
+    (best_delta, move, evaluations) of the best move of a tsp.NEIGHBORHOODS
+    operator that improves by more than IMPROVEMENT_EPS, or
+    (-IMPROVEMENT_EPS, None, evaluations). Scans its moves one by one with
+    its delta function; the first strictly best move wins.
+    """
+    moves, delta_of, _ = NEIGHBORHOODS[operator]
+    best = None
+    best_delta = -IMPROVEMENT_EPS
+    evaluations = 0
+
+    for move in moves(tour):
+        delta = delta_of(tour, dm, *move)
+        evaluations += 1
+        if delta < best_delta:
+            best_delta = delta
+            best = move
+
+    return best_delta, best, evaluations
+
+
+def best_segment_move(tour, dm, reverse=False, max_length=OR_OPT_MAX):
+    """
+    best_neighborhood_move for "or_opt" (reverse=False) or "three_opt"
+    (reverse=True), scanning with distance rows instead of one
+    segment_insertion_delta call per move: the same moves in the same order,
+    with the same deltas.
+    """
+    row, dist = dm.row, dm.dist
+    n = len(tour)
+
+    best = None
+    best_delta = -IMPROVEMENT_EPS
+    evaluations = 0
+
+    # tour2 / edge2 repeat the tour so a cyclic run of positions is a slice;
+    # edge2[j] = d(tour2[j], tour2[j + 1])
+    tour2 = tour + tour
+    edge2 = [dist(a, b) for a, b in zip(tour, tour2[1:n + 1])] * 2
+
+    for length in range(1, max_length + 1):
+        if n < length + 3:
+            break
+        both = reverse and length > 1
+        evaluations += n * (n - length - 1) * (2 if both else 1)
+
+        for i in range(n):
+            p, first, last, q = tour2[i - 1 + n], tour[i], tour2[i + length - 1], tour2[i + length]
+            row_f, row_l = row(first), row(last)
+            d_pq = dist(p, q)
+            before_seg = dist(p, first) + dist(last, q)
+
+            lo, hi = i + length, i + n - 1    # insert after positions lo..hi-1
+            for j, x, y, d_xy in zip(range(lo, hi), tour2[lo:hi], tour2[lo + 1:hi + 1], edge2[lo:hi]):
+                # same terms and order as segment_insertion_delta
+                delta = (d_pq + row_f[x] + row_l[y]) - (before_seg + d_xy)
+                if delta < best_delta:
+                    best_delta = delta
+                    best = (i, length, j % n, False) if reverse else (i, length, j % n)
+                if both:
+                    delta = (d_pq + row_l[x] + row_f[y]) - (before_seg + d_xy)
+                    if delta < best_delta:
+                        best_delta = delta
+                        best = (i, length, j % n, True)
+
+    return best_delta, best, evaluations
+
+
+def hill_climb_neighborhood(initial_tour, cities, operator):
+    """
+    Algorithm 1 Hill Climbing (Best-Improvement) over any of the
+    tsp.NEIGHBORHOODS, using their O(1) delta evaluation. Improvements of
+    IMPROVEMENT_EPS or less are not taken, so rounding cannot make a move and
+    its undo both look improving.
+
+    Returns (tour, cost, iterations, evaluations), evaluations being the
+    number of move deltas computed.
+    """
+    if operator not in NEIGHBORHOODS:
+        raise ValueError(f"Unknown operator: {operator} (expected one of {tuple(NEIGHBORHOODS)})")
+    apply = NEIGHBORHOODS[operator][2]
+    dm = as_distances(cities)
+
+    current = list(initial_tour)
+    current_cost = tour_cost(current, dm)
+    iterations = 0
+    evaluations = 0
+
+    while True:
+        if operator in ("or_opt", "three_opt"):
+            delta, move, scanned = best_segment_move(current, dm, reverse=operator == "three_opt")
+        else:
+            delta, move, scanned = best_neighborhood_move(current, dm, operator)
+        evaluations += scanned
+
+        if move is None:
+            return current, current_cost, iterations, evaluations
 
-def random_restart_hill_climbing(n_cities, cities, restarts, seed, operator, rng):
+        current = apply(current, *move)
+        current_cost = current_cost + delta
+        iterations += 1
+
+
+def random_restart_hill_climbing(n_cities, cities, restarts, seed, operator, rng, engine="python"):
     """
     Algorithm 2 Random Restart Hill Climbing
+
+    operator picks the local search (see OPERATORS). engine picks the
+    two_opt scan (see ENGINES); the tours are the same.
     """
+    if operator not in OPERATORS:
+        raise ValueError(f"Unknown operator: {operator} (expected one of {OPERATORS})")
+    if operator != "two_opt" and engine != "python":
+        raise ValueError(f"engine={engine!r} is only available for operator 'two_opt'")
+
+    # pairwise distances (and neighbor lists), built once and shared by every restart
+    dm = as_distances(cities)
+    neighbors = neighbor_lists(dm.cities, NEIGHBORS, dm) if operator == "two_opt_nl" else None
 
     # 1: bestOverall ← None
     best_overall = None
@@ -54,7 +391,14 @@ def random_restart_hill_climbing(n_cities, cities, restarts, seed, operator, rng
         start_time = time.perf_counter()
 
         # 4: localBest ← HillClimbing(current)
-        local_best, local_best_cost, iterations = hill_climb_best_improvement(initial, cities)
+        if operator == "two_opt":
+            local_best, local_best_cost, iterations = hill_climb_best_improvement(initial, dm, engine)
+            # one full scan per move taken, plus the one that found none
+            evaluations = (iterations + 1) * two_opt_move_count(n_cities)
+        elif operator == "two_opt_nl":
+            local_best, local_best_cost, iterations, evaluations = hill_climb_two_opt_nl(initial, dm, neighbors)
+        else:
+            local_best, local_best_cost, iterations, evaluations = hill_climb_neighborhood(initial, dm, operator)
 
         runtime_ms = int((time.perf_counter() - start_time) * 1000)
 
@@ -65,12 +409,14 @@ def random_restart_hill_climbing(n_cities, cities, restarts, seed, operator, rng
             "seed": seed,
             "restarts": restarts,
             "operator": operator,
+            "engine": engine,
             "restart_index": i,
             "initial_tour": initial,
             "initial_cost": initial_cost,
             "best_tour": local_best,
             "best_cost": local_best_cost,
             "iterations": iterations,
+            "evaluations": evaluations,
             "runtime_ms": runtime_ms
         })
 
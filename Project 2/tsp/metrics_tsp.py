@@ -5,11 +5,13 @@ import math
 from collections import defaultdict
 from pathlib import Path
 
+from results_io import read_results
+
 RESULTS_FILE = "results/results_tsp.json"
 OUT_JSON = "metrics/tsp_metrics_report.json"
 OUT_CSV  = "metrics/tsp_metrics_report.csv"
 
-METRICS = ["initial_cost", "best_cost", "iterations", "runtime_ms"]
+METRICS = ["initial_cost", "best_cost", "iterations", "evaluations", "runtime_ms"]
 
 
 def mean(xs):
@@ -32,19 +34,18 @@ def main():
     if not path.exists():
         raise FileNotFoundError(f"Missing {RESULTS_FILE}")
 
-    data = json.loads(path.read_text())
-    runs = data.get("runs", [])
-    if not isinstance(runs, list):
-        raise ValueError("results_tsp.json must contain a top-level {'runs': [...]} list")
-
     # Ensure output dir exists
     Path("metrics").mkdir(parents=True, exist_ok=True)
 
     # Group by (n_cities, algorithm, operator)  ✅ like A* grouping
+    # and by (n_cities, operator, seed) for the per-seed bests, in one pass
+    # over the streamed runs, keeping only the metric fields (not the tours)
     groups = defaultdict(list)
-    for r in runs:
-        key = (r.get("n_cities"), r.get("algorithm"), r.get("operator"))
-        groups[key].append(r)
+    seed_groups = defaultdict(list)
+    for r in read_results(path):
+        slim = {k: r.get(k) for k in METRICS}
+        groups[(r.get("n_cities"), r.get("algorithm"), r.get("operator"))].append(slim)
+        seed_groups[(r.get("n_cities"), r.get("operator"), r.get("seed"))].append(slim)
 
     report = {"by_group": [], "by_seed": [], "overall": {}, "notes": {}}
 
@@ -96,26 +97,26 @@ def main():
     # --------
     # For each (n_cities, operator, seed), take min(best_cost) across its restarts.
     per_seed = defaultdict(list)  # key: (n_cities, operator) -> list of best_per_seed
+    per_seed_ms = defaultdict(list)  # key: (n_cities, operator) -> list of restart runtime totals
     per_seed_rows = []
 
-    # Group by seed first
-    seed_groups = defaultdict(list)
-    for r in runs:
-        key = (r.get("n_cities"), r.get("operator"), r.get("seed"))
-        seed_groups[key].append(r)
-
+    # seed_groups was filled while streaming the runs above
     for (n_cities, op, seed), rs in sorted(seed_groups.items(), key=lambda x: (x[0][0], x[0][1], x[0][2])):
         best_costs = [safe_num(r.get("best_cost")) for r in rs if safe_num(r.get("best_cost")) is not None]
         if not best_costs:
             continue
         best_per_seed = min(best_costs)
 
+        runtime_ms = sum(safe_num(r.get("runtime_ms")) or 0.0 for r in rs)
+
         per_seed[(n_cities, op)].append(best_per_seed)
+        per_seed_ms[(n_cities, op)].append(runtime_ms)
         per_seed_rows.append({
             "n_cities": n_cities,
             "operator": op,
             "seed": seed,
-            "best_cost_across_restarts": best_per_seed
+            "best_cost_across_restarts": best_per_seed,
+            "runtime_ms_across_restarts": runtime_ms
         })
 
     report["by_seed"] = per_seed_rows
@@ -134,16 +135,20 @@ def main():
                 "stdev": stdev(bests) if bests else None,
             },
             "overall_best_cost": min(bests) if bests else None,
+            # CPU time behind each per-seed best, to compare operators by
+            # tour quality per CPU-second
+            "runtime_ms_across_restarts_per_seed": mean(per_seed_ms[(n_cities, op)]),
         })
 
     report["overall"] = {"by_size_operator": overall_rows}
 
     report["notes"] = {
         "runs_definition": "Each run in results_tsp.json is ONE restart (one hill-climb to convergence).",
-        "grouping": "Grouped by (n_cities, algorithm, operator) for summary stats; per-seed best is computed as min(best_cost) across restarts for each seed.",
+        "grouping": "Grouped by (n_cities, algorithm, operator) for summary stats; per-seed best is computed as min(best_cost) across restarts for each seed, next to the total runtime_ms of those restarts.",
         "required_metrics": [
             "initial_cost vs best_cost (improvement)",
             "iterations to converge",
+            "evaluations (2-opt move deltas computed) to converge",
             "best tour cost across restarts (per seed and overall)",
             "runtime_ms",
         ],
@@ -158,8 +163,9 @@ def main():
     header = [
         "n_cities", "algorithm", "operator", "num_runs",
         "initial_cost_mean", "best_cost_mean", "improvement_mean",
-        "iterations_mean", "runtime_ms_mean",
-        "overall_best_cost", "best_cost_across_restarts_per_seed_mean"
+        "iterations_mean", "evaluations_mean", "runtime_ms_mean",
+        "overall_best_cost", "best_cost_across_restarts_per_seed_mean",
+        "runtime_ms_across_restarts_per_seed_mean"
     ]
     csv_lines.append(",".join(header))
 
@@ -177,8 +183,10 @@ def main():
         overall = overall_lookup.get((n_cities, op), {})
 
         best_per_seed_mean = None
+        seed_ms_mean = None
         if overall:
             best_per_seed_mean = overall["best_cost_across_restarts_per_seed"]["mean"]
+            seed_ms_mean = overall["runtime_ms_across_restarts_per_seed"]
 
         line = [
             str(n_cities),
@@ -189,9 +197,11 @@ def main():
             fmt(row["best_cost"]["mean"]),
             fmt(row["improvement"]["mean"]),
             fmt(row["iterations"]["mean"]),
+            fmt(row["evaluations"]["mean"]),
             fmt(row["runtime_ms"]["mean"]),
             fmt(overall.get("overall_best_cost")),
             fmt(best_per_seed_mean),
+            fmt(seed_ms_mean),
         ]
         csv_lines.append(",".join(line))
 
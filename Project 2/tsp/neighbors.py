@@ -0,0 +1,72 @@
+# tsp/neighbors.py
+
+import math
+
+# Candidate neighbor lists for 2-opt: the k nearest cities of every city,
+# nearest first. Cities are bucketed in a square grid with about
+# CITIES_PER_CELL cities per cell, and each city's search grows ring by ring
+# around its cell until no unvisited cell can hold a closer city than the
+# k-th found so far, so a list costs about O(k) distance computations
+# instead of O(n).
+
+NEIGHBORS = 8
+CITIES_PER_CELL = 2
+
+
+def neighbor_lists(cities, k=NEIGHBORS, dm=None):
+    """
+    lists[a] = the min(k, n - 1) cities nearest to a, sorted by distance
+    (then index). dm, a distance matrix (see tsp/distance.py), supplies the
+    distances when given, so they are the ones the search compares.
+    """
+    n = len(cities)
+    k = min(k, n - 1)
+    if k <= 0:
+        return [[] for _ in range(n)]
+
+    if dm is not None:
+        dist = dm.dist
+    else:
+        dist = lambda a, b: math.dist(cities[a], cities[b])
+
+    xs = [x for x, _ in cities]
+    ys = [y for _, y in cities]
+    x0, y0 = min(xs), min(ys)
+    span = max(max(xs) - x0, max(ys) - y0) or 1.0
+    side = max(1, int(math.sqrt(n / CITIES_PER_CELL)))
+    cell = span / side
+
+    def cell_of(x, y):
+        return min(int((x - x0) / cell), side - 1), min(int((y - y0) / cell), side - 1)
+
+    grid = {}
+    for c, (x, y) in enumerate(cities):
+        grid.setdefault(cell_of(x, y), []).append(c)
+
+    lists = []
+    for a, (x, y) in enumerate(cities):
+        cx, cy = cell_of(x, y)
+        found = []      # (distance, city)
+        ring = 0
+        while True:
+            for gx in range(cx - ring, cx + ring + 1):
+                for gy in range(cy - ring, cy + ring + 1):
+                    if max(abs(gx - cx), abs(gy - cy)) != ring:
+                        continue    # inner rings are done
+                    for b in grid.get((gx, gy), ()):
+                        if b != a:
+                            found.append((dist(a, b), b))
+
+            # every city outside the rings searched so far is at least
+            # ring * cell away from a
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= ring * cell or ring >= side:
+                    break
+            elif ring >= side:
+                break
+            ring += 1
+
+        found.sort()
+        lists.append([b for _, b in found[:k]])
+    return lists
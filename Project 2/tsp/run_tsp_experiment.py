@@ -1,44 +1,23 @@
 # tsp/run_tsp_experiment.py
+# Run: python -m tsp.run_tsp_experiment [operator ...] [--engine python|numpy]
+#      (default: two_opt, python)
 
-import json
+import argparse
 import time
 import random
-from pathlib import Path
 
 from .tsp import generate_cities
-from .hill_climbing import random_restart_hill_climbing
+from .hill_climbing import ENGINES, OPERATORS, random_restart_hill_climbing
+from results_io import ResultsWriter
 
 RESULTS_FILE = "results/results_tsp.json"
 
 
-def append_result(result, filename=RESULTS_FILE):
-    path = Path(filename)
-
-    if path.exists():
-        try:
-            with open(path, "r") as f:
-                data = json.load(f)
-            if "runs" not in data or not isinstance(data["runs"], list):
-                data = {"runs": []}
-        except (json.JSONDecodeError, OSError):
-            data = {"runs": []}
-    else:
-        data = {"runs": []}
-
-    data["runs"].append(result)
-
-    # Ensure output folder exists
-    path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
-        f.write("\n")
-
-
-def run_one(n_cities, coord_min, coord_max, restarts, seed, operator):
+def run_one(n_cities, coord_min, coord_max, restarts, seed, operator, engine="python"):
     """
     Runs ONE seed worth of TSP work, producing ONE JSON record per restart
-    (so 10 restarts == 10 runs in the JSON log).
+    (so 10 restarts == 10 runs in the JSON log). engine picks the 2-opt scan
+    (see hill_climbing.ENGINES).
     """
     rng = random.Random(seed)
 
@@ -55,13 +34,22 @@ def run_one(n_cities, coord_min, coord_max, restarts, seed, operator):
         restarts=restarts,
         seed=seed,
         operator=operator,
-        rng=rng
+        rng=rng,
+        engine=engine
     )
 
     return best_tour, best_cost, restart_records
 
 
-def main():
+def main(operators=("two_opt",), engine="python"):
+    for operator in operators:
+        if operator not in OPERATORS:
+            raise ValueError(f"Unknown operator: {operator} (expected one of {OPERATORS})")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine} (expected one of {ENGINES})")
+    if engine != "python" and any(op != "two_opt" for op in operators):
+        raise ValueError(f"engine={engine!r} is only available for operator 'two_opt'")
+
     # Required problem sizes
     problem_sizes = [20, 30, 50]
 
@@ -75,41 +63,50 @@ def main():
     # Required restarts per seed
     restarts = 10
 
-    # Chosen operator (must match your implementation)
-    operator = "two_opt"
-
     total_runs = 0
     t0 = time.perf_counter()
 
-    for n_cities in problem_sizes:
-        for seed in seeds:
-            best_tour, best_cost, restart_records = run_one(
-                n_cities=n_cities,
-                coord_min=coord_min,
-                coord_max=coord_max,
-                restarts=restarts,
-                seed=seed,
-                operator=operator
-            )
-
-            # Each restart counts as one run in the logs
-            for r in restart_records:
-                append_result(r, RESULTS_FILE)
-                total_runs += 1
-
-                print(
-                    f"[{total_runs:03d}] n={n_cities} seed={seed} "
-                    f"restart={r['restart_index']:02d}/{restarts} op={operator} "
-                    f"init={r['initial_cost']:.3f} best={r['best_cost']:.3f} "
-                    f"iters={r['iterations']} runtime_ms={r['runtime_ms']}"
-                )
-
-            # Optional per-seed summary line (keeps output readable)
-            print(f"  -> seed summary: n={n_cities} seed={seed} best_overall={best_cost:.3f}")
+    # one append-only writer for the whole batch
+    with ResultsWriter(RESULTS_FILE) as writer:
+        for operator in operators:
+            for n_cities in problem_sizes:
+                for seed in seeds:
+                    # same seed, same cities and initial tours for every operator
+                    best_tour, best_cost, restart_records = run_one(
+                        n_cities=n_cities,
+                        coord_min=coord_min,
+                        coord_max=coord_max,
+                        restarts=restarts,
+                        seed=seed,
+                        operator=operator,
+                        engine=engine
+                    )
+
+                    # Each restart counts as one run in the logs
+                    for r in restart_records:
+                        writer.write(r)
+                        total_runs += 1
+
+                        print(
+                            f"[{total_runs:03d}] n={n_cities} seed={seed} "
+                            f"restart={r['restart_index']:02d}/{restarts} op={operator} "
+                            f"init={r['initial_cost']:.3f} best={r['best_cost']:.3f} "
+                            f"iters={r['iterations']} evals={r['evaluations']} "
+                            f"runtime_ms={r['runtime_ms']}"
+                        )
+
+                    # Optional per-seed summary line (keeps output readable)
+                    print(f"  -> seed summary: n={n_cities} seed={seed} op={operator} best_overall={best_cost:.3f}")
 
     elapsed_ms = (time.perf_counter() - t0) * 1000.0
     print(f"\nDone. Wrote {total_runs} runs to {RESULTS_FILE}. Total runtime: {elapsed_ms:.2f} ms")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Run the TSP restart experiments")
+    parser.add_argument("operators", nargs="*", default=["two_opt"],
+                        help=f"local search operators to run, from {', '.join(OPERATORS)} (default: two_opt)")
+    parser.add_argument("--engine", default="python", choices=ENGINES,
+                        help="2-opt scan for operator two_opt (see hill_climbing.ENGINES)")
+    opts = parser.parse_args()
+    main(opts.operators, opts.engine)
@@ -2,6 +2,8 @@
 
 import math
 
+OR_OPT_MAX = 3  # longest segment or_opt / three_opt move
+
 
 def generate_cities(n, rng, coord_min=0, coord_max=100):
     cities = []
@@ -23,19 +25,25 @@ def euclidean(a, b):
 
 
 def tour_cost(tour, cities):
+    # cities is a list of (x, y) or a distance matrix (see tsp/distance.py)
+    dist = getattr(cities, "dist", None)
+    if dist is None:
+        dist = lambda a, b: euclidean(cities[a], cities[b])
+
     total = 0
     n = len(tour)
 
     for i in range(n - 1):
-        total += euclidean(cities[tour[i]], cities[tour[i + 1]])
+        total += dist(tour[i], tour[i + 1])
 
-    total += euclidean(cities[tour[-1]], cities[tour[0]])
+    total += dist(tour[-1], tour[0])
     return total
 
 def two_opt_delta(tour, cities, i, k):
     """
     O(1) change in tour cost if we reverse tour[i:k+1] (2-opt).
     Returns: (new_cost - old_cost). Negative means improvement.
+    cities is a list of (x, y) or a distance matrix (see tsp/distance.py).
     """
     n = len(tour)
 
@@ -44,8 +52,13 @@ def two_opt_delta(tour, cities, i, k):
     c = tour[k]
     d = tour[(k + 1) % n]
 
-    before = euclidean(cities[a], cities[b]) + euclidean(cities[c], cities[d])
-    after  = euclidean(cities[a], cities[c]) + euclidean(cities[b], cities[d])
+    dist = getattr(cities, "dist", None)
+    if dist is not None:
+        before = dist(a, b) + dist(c, d)
+        after  = dist(a, c) + dist(b, d)
+    else:
+        before = euclidean(cities[a], cities[b]) + euclidean(cities[c], cities[d])
+        after  = euclidean(cities[a], cities[c]) + euclidean(cities[b], cities[d])
 
     return after - before
 
@@ -65,4 +78,128 @@ def apply_two_opt(tour, i, k):
     """
     Apply 2-opt by reversing segment [i:k] and return a NEW tour.
     """
-    return tour[:i] + list(reversed(tour[i:k+1])) + tour[k+1:]
\ No newline at end of file
+    return tour[:i] + list(reversed(tour[i:k+1])) + tour[k+1:]
+
+
+def two_opt_in_place(tour, i, k):
+    """
+    apply_two_opt without the new tour: reverse tour[i:k+1] in place by
+    swapping its ends inward. Gives the same list apply_two_opt returns.
+    """
+    while i < k:
+        tour[i], tour[k] = tour[k], tour[i]
+        i += 1
+        k -= 1
+
+
+def reverse_segment(tour, pos, i, j):
+    """
+    2-opt on a cyclic tour, in place: reverse the run of positions
+    i, i + 1, ..., j (mod n), or the rest of the tour instead when that is
+    shorter -- both give the same cycle, one traversed the other way round.
+    pos[city] (the position of city in tour) is kept in sync. tour and pos
+    can be lists, array('i') or numpy arrays; nothing is allocated, and at
+    most n // 4 pairs are swapped.
+    """
+    n = len(tour)
+    length = (j - i) % n + 1
+    if 2 * length > n:
+        i, j = j + 1 if j + 1 < n else 0, i - 1 if i > 0 else n - 1
+        length = n - length
+
+    for _ in range(length // 2):
+        a = tour[i]
+        b = tour[j]
+        tour[i] = b
+        tour[j] = a
+        pos[a] = j
+        pos[b] = i
+        i += 1
+        if i == n:
+            i = 0
+        j -= 1
+        if j < 0:
+            j = n - 1
+
+
+def segment_insertion_delta(tour, cities, i, length, j, reverse=False):
+    """
+    O(1) change in tour cost if we move the segment of `length` cities
+    starting at position i to between positions j and j + 1 (cyclic; j is
+    not i - 1 or inside the segment), reversed if `reverse`.
+    Returns: (new_cost - old_cost). Negative means improvement.
+    cities is a list of (x, y) or a distance matrix (see tsp/distance.py).
+    """
+    n = len(tour)
+
+    p = tour[i - 1]                      # before the segment
+    first = tour[i]
+    last = tour[(i + length - 1) % n]
+    q = tour[(i + length) % n]           # after the segment
+    x = tour[j]
+    y = tour[(j + 1) % n]
+    if reverse:
+        first, last = last, first
+
+    dist = getattr(cities, "dist", None)
+    if dist is None:
+        dist = lambda a, b: euclidean(cities[a], cities[b])
+
+    if reverse:
+        before = dist(p, last) + dist(first, q) + dist(x, y)
+    else:
+        before = dist(p, first) + dist(last, q) + dist(x, y)
+    after = dist(p, q) + dist(x, first) + dist(last, y)
+
+    return after - before
+
+
+def iter_or_opt_moves(tour, max_length=OR_OPT_MAX):
+    """
+    Generate (i, length, j) Or-opt moves: segments of 1..max_length cities,
+    each inserted after every position j outside it, keeping its orientation.
+    """
+    n = len(tour)
+    for length in range(1, max_length + 1):
+        if n < length + 3:
+            break       # no other edge to insert the segment into
+        for i in range(n):
+            for t in range(n - length - 1):
+                yield i, length, (i + length + t) % n
+
+
+def iter_three_opt_moves(tour, max_length=OR_OPT_MAX):
+    """
+    Generate (i, length, j, reverse) 3-opt segment insertion moves: the
+    Or-opt moves, plus each segment of 2 or more cities inserted reversed.
+    """
+    for i, length, j in iter_or_opt_moves(tour, max_length):
+        yield i, length, j, False
+        if length > 1:
+            yield i, length, j, True
+
+
+def apply_segment_insertion(tour, i, length, j, reverse=False):
+    """
+    Apply a segment insertion move and return a NEW tour (starting at the
+    city after the segment's old place, so rotated from `tour`).
+    """
+    n = len(tour)
+    segment = [tour[(i + t) % n] for t in range(length)]
+    if reverse:
+        segment.reverse()
+
+    rest = [tour[(i + length + t) % n] for t in range(n - length)]
+    at = (j - i - length) % n + 1       # rest[at - 1] == tour[j]
+    return rest[:at] + segment + rest[at:]
+
+
+# Neighborhoods of the local search, by operator name:
+#   (moves, delta, apply) with moves(tour) yielding move tuples,
+#   delta(tour, cities, *move) its O(1) change in tour cost and
+#   apply(tour, *move) the new tour.
+NEIGHBORHOODS = {
+    "two_opt": (iter_two_opt_moves, two_opt_delta, apply_two_opt),
+    "or_opt": (iter_or_opt_moves, segment_insertion_delta, apply_segment_insertion),
+    "three_opt": (iter_three_opt_moves, segment_insertion_delta, apply_segment_insertion),
+}